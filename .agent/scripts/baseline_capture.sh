@@ -4,6 +4,9 @@ set -euo pipefail
 # Captures a safe, non-secret baseline snapshot into docs/closure/.
 # - Never prints secret values (only secret NAMES).
 # - Intended for session start / evidence trails.
+# - Serialized with other captures through an advisory lock
+#   (${P0_CACHE_DIR:-.agent/cache}/locks/baseline.lock, needs `flock`); callers that
+#   already hold it (extract_reports.py) set P0_BASELINE_LOCK_HELD=1.
 
 ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
 cd "$ROOT_DIR"
@@ -12,7 +15,21 @@ PROJECT_REF="${SUPABASE_PROJECT_REF:-dqaygmjpzoqjjrywdsxi}"
 OUT_DIR="docs/closure"
 TS_DATE="$(date +%Y-%m-%d)"
 TS_TIME="$(date +%H%M%S)"
+LOCK_FILE="${P0_CACHE_DIR:-.agent/cache}/locks/baseline.lock"
+
+if [ "${P0_BASELINE_LOCK_HELD:-0}" != "1" ] && command -v flock >/dev/null 2>&1; then
+  mkdir -p "$(dirname "$LOCK_FILE")"
+  exec 9>"$LOCK_FILE"
+  flock 9
+  TS_DATE="$(date +%Y-%m-%d)"
+  TS_TIME="$(date +%H%M%S)"
+fi
+
 OUT_FILE="${OUT_DIR}/BASELINE_LOG_${TS_DATE}_${TS_TIME}.md"
+if [ -e "$OUT_FILE" ]; then
+  # Another capture finished within the same second: never overwrite it.
+  OUT_FILE="${OUT_DIR}/BASELINE_LOG_${TS_DATE}_${TS_TIME}_$$.md"
+fi
 
 mkdir -p "$OUT_DIR"
 
@@ -94,4 +111,7 @@ mkdir -p "$OUT_DIR"
   fi
 } > "$OUT_FILE"
 
+# Keep the closure index current (best-effort; lookups rebuild it if needed).
+.agent/scripts/closure_index.py record baseline "$OUT_FILE" >/dev/null 2>&1 || true
+
 echo "Wrote: $OUT_FILE"
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark for env_audit's env var extraction (names only).
+
+Builds a deterministic synthetic TS/JS corpus, checks that the single-pass
+engine (`env_audit._extract_text`) returns exactly what the previous
+per-pattern implementation (kept below as `_legacy_extract`) returns, and
+reports the throughput of both in MB/s of source scanned.
+
+Exits 1 if the two implementations disagree on any corpus file.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import time
+from collections import defaultdict
+
+
+# Frozen copy of the per-pattern extractor that predates the combined regex.
+_LEGACY_PATTERNS: list[tuple[str, re.Pattern[str]]] = [
+    ("deno", re.compile(r"Deno\.env\.get\(\s*['\"]([A-Z0-9_]+)['\"]\s*\)")),
+    ("process_dot", re.compile(r"process\.env\.([A-Z0-9_]+)")),
+    ("process_bracket", re.compile(r"process\.env\[\s*['\"]([A-Z0-9_]+)['\"]\s*\]")),
+    ("vite_dot", re.compile(r"import\.meta\.env\.([A-Z0-9_]+)")),
+    ("vite_bracket", re.compile(r"import\.meta\.env\[\s*['\"]([A-Z0-9_]+)['\"]\s*\]")),
+]
+_LEGACY_ALIAS_ASSIGN_PATTERNS: list[re.Pattern[str]] = [
+    re.compile(r"\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*(?::[^=\n]+)?=\s*import\.meta\.env\b"),
+    re.compile(r"\b([A-Za-z_$][\w$]*)\s*(?::[^=\n]+)?=\s*import\.meta\.env\b"),
+]
+_LEGACY_DESTRUCTURE_PATTERN = re.compile(r"\{([^}]+)\}\s*(?::[^=\n]+)?=\s*import\.meta\.env\b")
+
+
+def _legacy_extract(text: str) -> dict[str, set[str]]:
+    found: dict[str, set[str]] = defaultdict(set)
+
+    for label, rx in _LEGACY_PATTERNS:
+        for match in rx.findall(text):
+            if isinstance(match, str) and match:
+                found[match].add(label)
+
+    alias_names: set[str] = set()
+    for rx in _LEGACY_ALIAS_ASSIGN_PATTERNS:
+        for alias in rx.findall(text):
+            if isinstance(alias, str) and alias:
+                alias_names.add(alias)
+
+    for alias in alias_names:
+        dot_rx = re.compile(rf"\b{re.escape(alias)}\.([A-Z0-9_]+)\b")
+        bracket_rx = re.compile(rf"\b{re.escape(alias)}\[\s*['\"]([A-Z0-9_]+)['\"]\s*\]")
+        for match in dot_rx.findall(text):
+            if isinstance(match, str) and match:
+                found[match].add("vite_alias_dot")
+        for match in bracket_rx.findall(text):
+            if isinstance(match, str) and match:
+                found[match].add("vite_alias_bracket")
+
+    for raw_vars in _LEGACY_DESTRUCTURE_PATTERN.findall(text):
+        for token in raw_vars.split(","):
+            candidate = token.strip()
+            if not candidate or candidate.startswith("..."):
+                continue
+            key = candidate.split(":", 1)[0].split("=", 1)[0].strip()
+            if re.fullmatch(r"[A-Z0-9_]+", key):
+                found[key].add("vite_destructure")
+
+    return found
+
+
+_FILLER = [
+    "import {{ useState, useEffect }} from 'react';",
+    "export function handler{i}(req: Request): Promise<Response> {{",
+    "  const payload = await req.json();",
+    "  if (!payload || typeof payload.id !== 'string') return new Response('bad', {{ status: 400 }});",
+    "  const rows = items.filter((x) => x.qty > {i}).map((x) => ({{ ...x, total: x.qty * x.price }}));",
+    "  // TODO: paginate results ({i})",
+    "  console.log(`processed ${{rows.length}} rows`);",
+    "}}",
+    "const styles = {{ padding: {i}, margin: 0, display: 'flex' }};",
+    "type Props = {{ id: string; count: number; label?: string }};",
+]
+_REFS = [
+    "const url = Deno.env.get('SUPABASE_URL_{i}');",
+    "const key = Deno.env.get( \"SERVICE_ROLE_{i}\" ) ?? '';",
+    "const port = Number(process.env.PORT_{i} ?? 3000);",
+    "const token = process.env['API_TOKEN_{i}'];",
+    "const api = import.meta.env.VITE_API_URL_{i};",
+    "const flag = import.meta.env[\"VITE_FLAG_{i}\"] === 'true';",
+    "const env{i} = import.meta.env;",
+    "const base = env{i}.VITE_BASE_{i} || env{i}['VITE_ALT_{i}'];",
+    "function cfg(env: ImportMetaEnv = import.meta.env) {{ return env.VITE_CFG_{i}; }}",
+    "const {{ VITE_A_{i}, VITE_B_{i}: renamed, VITE_C_{i} = 'x', ...rest }} = import.meta.env;",
+    "const {{ VITE_TYPED_{i} }}: Env = import.meta.env as Env;",
+    "const $env = import.meta.env; const v = $env.VITE_DOLLAR_{i};",
+    "const typed: {{ VITE_INLINE_{i}: string }} = import.meta.env;",
+    "let ENV = import.meta.env; ENV.ENV.VITE_NESTED_{i};",
+    "if (import.meta.env.DEV) console.debug(import.meta.env.MODE);",
+]
+
+
+def _corpus(files: int, lines_per_file: int) -> list[str]:
+    out: list[str] = []
+    for f in range(files):
+        lines: list[str] = []
+        for n in range(lines_per_file):
+            i = f * lines_per_file + n
+            # Roughly one env reference per 12 lines, as in the real tree.
+            pool = _REFS if i % 12 == 0 else _FILLER
+            lines.append(pool[(i // 12 + f) % len(pool)].format(i=i))
+        out.append("\n".join(lines) + "\n")
+    return out
+
+
+def _throughput(fn, texts: list[str], total_mb: float, runs: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, runs)):
+        t0 = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return total_mb / best if best > 0 else float("inf")
+
+
+def main(argv: list[str]) -> int:
+    import argparse
+
+    import env_audit
+
+    parser = argparse.ArgumentParser(description="Benchmark env var extraction (legacy vs single-pass)")
+    parser.add_argument("--files", type=int, default=200, help="Synthetic files to generate (default: 200).")
+    parser.add_argument("--lines", type=int, default=400, help="Lines per synthetic file (default: 400).")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per implementation; the fastest counts.")
+    args = parser.parse_args(argv)
+
+    texts = _corpus(args.files, args.lines)
+    total_mb = sum(len(t.encode("utf-8")) for t in texts) / (1024 * 1024)
+
+    mismatches = 0
+    for idx, text in enumerate(texts):
+        if env_audit._extract_text(text) != _legacy_extract(text):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"Error: results differ for synthetic file #{idx}", file=sys.stderr)
+    if mismatches:
+        print(f"Error: {mismatches}/{len(texts)} synthetic files differ", file=sys.stderr)
+        return 1
+
+    legacy = _throughput(_legacy_extract, texts, total_mb, args.runs)
+    combined = _throughput(env_audit._extract_text, texts, total_mb, args.runs)
+    print(f"Corpus: {len(texts)} files, {total_mb:.2f} MB (results identical)")
+    print(f"legacy      {legacy:8.2f} MB/s")
+    print(f"single-pass {combined:8.2f} MB/s  ({combined / legacy:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Manifest index of closure artifacts, kept under the P0 cache dir (see p0_fs).
+
+Maps an artifact kind (see KINDS) to its paths, oldest first, ordered like the
+timestamped file names sort. Writers call `record()` (or `closure_index.py record
+<kind> <path>` from shell) right after creating an artifact, so "latest X"
+lookups read one small JSON file instead of globbing and sorting ever-growing
+directories.
+
+The index is derived state. Next to the entries it stores the mtimes of the
+directories artifacts land in (WATCH_DIRS plus the newest run directory);
+creating, deleting or renaming a file changes its directory's mtime, so
+artifacts added without `record()` (copied in, pulled from git) invalidate the
+index. `latest()` trusts it only while those mtimes match and the newest entry
+exists (a handful of stats); otherwise it rebuilds from KINDS' globs.
+`record()` refreshes the stamps of the directories it writes to; an unrecorded
+file landing in the same directory at the same moment is picked up by the next
+rebuild.
+
+Usage:
+  .agent/scripts/closure_index.py latest <kind>
+  .agent/scripts/closure_index.py record <kind> <path>
+  .agent/scripts/closure_index.py rebuild
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+import p0_fs
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+INDEX_VERSION = 2
+# Entries kept per kind (oldest dropped); lookups only ever need the newest.
+MAX_ENTRIES = 200
+
+# kind -> repo-relative globs of the artifacts it covers.
+KINDS: dict[str, tuple[str, ...]] = {
+    "baseline": ("docs/closure/BASELINE_LOG_*.md",),
+    "technical": ("docs/closure/TECHNICAL_ANALYSIS_*.md", "docs/closure/runs/*/TECHNICAL_ANALYSIS_*.md"),
+    "inventory": ("docs/closure/INVENTORY_REPORT_*.md", "docs/closure/runs/*/INVENTORY_REPORT_*.md"),
+    "extraction": ("docs/closure/EXTRACTION_*.json", "docs/closure/runs/*/EXTRACTION_*.json"),
+    "mega_plan": ("docs/closure/MEGA_PLAN_*.md", "docs/closure/runs/*/MEGA_PLAN_*.md"),
+    "quality_log": ("test-reports/quality-gates_*.log",),
+    "perf_log": ("test-reports/perf-baseline_*.log",),
+}
+# Every directory KINDS' globs list, except the per-run ones (see _stamps()).
+RUNS_REL = "docs/closure/runs"
+WATCH_DIRS = ("docs/closure", RUNS_REL, "test-reports")
+
+
+def _rel(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _sort_key(rel: str) -> tuple[str, str]:
+    # File names carry the timestamp; the run directory breaks same-name ties.
+    parent, _, name = rel.rpartition("/")
+    return (name, parent.rpartition("/")[2])
+
+
+def _entry(rel: str) -> dict[str, Any]:
+    try:
+        mtime = (REPO_ROOT / rel).stat().st_mtime
+    except OSError:
+        mtime = None
+    return {"path": rel, "mtime": mtime}
+
+
+def _mtime_ns(rel: str) -> int | None:
+    try:
+        return (REPO_ROOT / rel).stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _is_run_dir(rel: str) -> bool:
+    return PurePosixPath(rel).parent.as_posix() == RUNS_REL
+
+
+def _stamps() -> dict[str, int | None]:
+    """mtimes of WATCH_DIRS and of the newest run directory (where new run files land)."""
+    stamps = {rel: _mtime_ns(rel) for rel in WATCH_DIRS}
+    runs = [p.name for p in (REPO_ROOT / RUNS_REL).glob("*/") if p.is_dir()]
+    if runs:
+        newest_run = f"{RUNS_REL}/{max(runs)}"
+        stamps[newest_run] = _mtime_ns(newest_run)
+    return stamps
+
+
+def _fresh(data: dict[str, Any]) -> bool:
+    stamps = data.get("stamps")
+    return isinstance(stamps, dict) and all(_mtime_ns(rel) == mtime for rel, mtime in stamps.items())
+
+
+def _refresh_stamps(data: dict[str, Any], rel: str) -> None:
+    """Account for `record()` having written `rel` (and possibly its run directory)."""
+    stamps = data.get("stamps")
+    if not isinstance(stamps, dict):
+        return
+    parent = PurePosixPath(rel).parent.as_posix()
+    if _is_run_dir(parent) and parent not in stamps:
+        newest_run = next((k for k in stamps if _is_run_dir(k)), None)
+        if newest_run is not None and PurePosixPath(parent).name < PurePosixPath(newest_run).name:
+            return  # An older run directory; not watched.
+        stamps.pop(newest_run, None)
+        stamps[RUNS_REL] = _mtime_ns(RUNS_REL)
+        stamps[parent] = None
+    if parent in stamps:
+        stamps[parent] = _mtime_ns(parent)
+
+
+def _index_path() -> Path:
+    # Outside docs/closure, so writing the index never touches a watched directory.
+    import hashlib
+
+    tag = hashlib.sha1(os.fspath(REPO_ROOT).encode("utf-8")).hexdigest()[:12]
+    return p0_fs.cache_dir() / f"closure_index.{tag}.json"
+
+
+def _load() -> dict[str, Any] | None:
+    if p0_fs.cache_disabled():
+        return None
+    try:
+        data = json.loads(_index_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != INDEX_VERSION
+        or not isinstance(data.get("kinds"), dict)
+        or not isinstance(data.get("stamps"), dict)
+    ):
+        return None
+    return data
+
+
+def _save(data: dict[str, Any]) -> None:
+    if p0_fs.cache_disabled():
+        return
+    try:
+        p0_fs.atomic_write_text(_index_path(), json.dumps(data, ensure_ascii=False, indent=2) + "\n")
+    except OSError:
+        pass  # Read-only checkout: lookups fall back to scanning.
+
+
+def _scan(kind: str) -> list[dict[str, Any]]:
+    rels = {_rel(p) for pattern in KINDS[kind] for p in REPO_ROOT.glob(pattern) if p.is_file()}
+    return [_entry(rel) for rel in sorted(rels, key=_sort_key)[-MAX_ENTRIES:]]
+
+
+def rebuild() -> dict[str, Any]:
+    """Rescan every kind and rewrite the index."""
+    with p0_fs.file_lock(p0_fs.lock_path("closure_index")):
+        # Stamps first: a file created during the scan then fails the next check.
+        stamps = _stamps()
+        data = {"version": INDEX_VERSION, "stamps": stamps, "kinds": {kind: _scan(kind) for kind in KINDS}}
+        _save(data)
+    return data
+
+
+def _covers(kind: str, rel: str) -> bool:
+    parts = PurePosixPath(rel)
+    return any(len(parts.parts) == len(PurePosixPath(g).parts) and parts.match(g) for g in KINDS[kind])
+
+
+def record(kind: str, path: Path | str) -> bool:
+    """
+    Add (or refresh) `path` (absolute or repo-relative) as an artifact of
+    `kind`. Paths outside the kind's globs are ignored (returns False), so the
+    index always agrees with what `rebuild()` would find.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown artifact kind: {kind!r} (expected one of: {', '.join(KINDS)})")
+    rel = _rel(REPO_ROOT / path)
+    if not _covers(kind, rel):
+        return False
+    with p0_fs.file_lock(p0_fs.lock_path("closure_index")):
+        data = _load()
+        if data is None:
+            stamps = _stamps()
+            data = {"version": INDEX_VERSION, "stamps": stamps, "kinds": {k: _scan(k) for k in KINDS}}
+        entries = [e for e in data["kinds"].get(kind) or _scan(kind) if e.get("path") != rel]
+        entries.append(_entry(rel))
+        entries.sort(key=lambda e: _sort_key(e["path"]))
+        data["kinds"][kind] = entries[-MAX_ENTRIES:]
+        _refresh_stamps(data, rel)
+        _save(data)
+    return True
+
+
+def latest(kind: str) -> Path | None:
+    """
+    Newest existing artifact of `kind`, or None. Answered from the index while
+    its directory stamps match and the newest entry exists; otherwise the index
+    is rebuilt from the globs first.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown artifact kind: {kind!r} (expected one of: {', '.join(KINDS)})")
+    data = _load()
+    if data is not None and _fresh(data) and kind in data["kinds"]:
+        entries = data["kinds"][kind]
+        if not entries:
+            return None
+        newest = REPO_ROOT / entries[-1]["path"]
+        if newest.is_file():
+            return newest
+    entries = rebuild()["kinds"][kind]
+    return REPO_ROOT / entries[-1]["path"] if entries else None
+
+
+def main(argv: list[str]) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Index of docs/closure + test-reports artifacts")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_latest = sub.add_parser("latest", help="Print the newest artifact of a kind (exit 1 if none).")
+    p_latest.add_argument("kind", choices=sorted(KINDS))
+    p_record = sub.add_parser("record", help="Record a newly written artifact.")
+    p_record.add_argument("kind", choices=sorted(KINDS))
+    p_record.add_argument("path")
+    sub.add_parser("rebuild", help="Rescan all artifact globs and rewrite the index.")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "latest":
+        found = latest(args.kind)
+        if found is None:
+            return 1
+        print(_rel(found))
+        return 0
+    if args.cmd == "record":
+        if not (REPO_ROOT / args.path).is_file():
+            print(f"Error: not a file: {args.path}", file=sys.stderr)
+            return 2
+        if not record(args.kind, args.path):
+            print(f"WARNING: {args.path} does not match any {args.kind} pattern; not indexed.", file=sys.stderr)
+        return 0
+    data = rebuild()
+    for kind, entries in data["kinds"].items():
+        print(f"{kind}: {len(entries)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,195 @@
+"""
+Snapshot-cached loader for `.agent/skills/project_config.yaml`.
+
+Parsing the config with pure-Python PyYAML is the bulk of a route's latency, and
+every bootstrap (lint, routing) pays it again. `load_snapshot()` stores the
+parsed config together with the pre-normalized routing data (keywords, skill
+aliases, deduped chains) as a pickle under the P0 cache dir, keyed by the YAML's
+size, mtime and SHA-256. Warm runs never import yaml; any change to the YAML (or
+to SNAPSHOT_VERSION) rebuilds the snapshot.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import unicodedata
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import p0_fs
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CONFIG_PATH = REPO_ROOT / ".agent" / "skills" / "project_config.yaml"
+# Bump whenever the normalization below or the routing layout changes.
+SNAPSHOT_VERSION = 1
+DEFAULT_SKILL_FALLBACK = "RealityCheck"
+
+
+def normalize(text: str) -> str:
+    # Lowercase + strip accents for robust ES/EN keyword matching.
+    text = text.strip().lower()
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.split())
+
+
+def normalize_phrase(text: str) -> str:
+    # Normalize punctuation to spaces for robust token-boundary matching.
+    base = normalize(text)
+    base = "".join(ch if ch.isalnum() else " " for ch in base)
+    return " ".join(base.split())
+
+
+def split_skill_name_tokens(skill_name: str) -> list[str]:
+    import re
+
+    # Convert "CodeCraft" -> ["code", "craft"], "APISync" -> ["api", "sync"].
+    token_pattern = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+    tokens: list[str] = []
+    for chunk in re.split(r"[^A-Za-z0-9]+", skill_name):
+        if not chunk:
+            continue
+        parts = token_pattern.findall(chunk)
+        if parts:
+            tokens.extend(p.lower() for p in parts if p)
+        else:
+            tokens.append(chunk.lower())
+    return [t for t in tokens if t]
+
+
+def skill_aliases(skill_name: str) -> list[str]:
+    aliases: set[str] = set()
+    norm_skill = normalize_phrase(skill_name)
+    if norm_skill:
+        aliases.add(norm_skill)
+        aliases.add(norm_skill.replace(" ", ""))
+
+    tokens = split_skill_name_tokens(skill_name)
+    if len(tokens) > 1:
+        aliases.add(" ".join(tokens))
+        aliases.add("".join(tokens))
+        aliases.add("-".join(tokens))
+        aliases.add("_".join(tokens))
+
+    # Keep only meaningful aliases to avoid accidental matches.
+    clean = []
+    for alias in aliases:
+        a = normalize_phrase(alias)
+        if len(a) >= 3:
+            clean.append(a)
+    return sorted(set(clean), key=lambda x: (-len(x), x))
+
+
+def dedupe_keep_order(items: list[str]) -> list[str]:
+    seen: set[str] = set()
+    out: list[str] = []
+    for item in items:
+        if item in seen:
+            continue
+        seen.add(item)
+        out.append(item)
+    return out
+
+
+def routing_data(config: dict[str, Any]) -> dict[str, Any]:
+    """
+    Pre-normalized routing view of a config (plain builtins only, picklable).
+
+    - `triggers`: `[(skill, [(keyword, normalized_keyword)], intent, aliases)]`
+      in config order, skipping malformed specs exactly like the router does.
+    - `chains`: `{skill: (pre_check, on_complete)}` with both lists deduped.
+    """
+    orchestrator = config.get("skill_orchestrator") or {}
+    trigger_patterns = orchestrator.get("trigger_patterns") or {}
+    triggers: list[tuple[str, list[tuple[str, str]], str | None, list[str]]] = []
+    for skill_name, spec in (trigger_patterns.items() if isinstance(trigger_patterns, dict) else []):
+        if not isinstance(spec, dict):
+            continue
+        keywords = spec.get("keywords") or []
+        if not isinstance(keywords, list):
+            continue
+        normalized: list[tuple[str, str]] = []
+        for kw in keywords:
+            if not isinstance(kw, str) or not kw.strip():
+                continue
+            n_kw = normalize(kw)
+            if n_kw:
+                normalized.append((kw, n_kw))
+        intent = spec.get("intent") if isinstance(spec.get("intent"), str) else None
+        triggers.append((skill_name, normalized, intent, skill_aliases(skill_name)))
+
+    graph = config.get("skill_graph") or {}
+    chains_spec = graph.get("chains") or {}
+    chains: dict[str, tuple[list[str], list[str]]] = {}
+    for skill_name, chain_spec in (chains_spec.items() if isinstance(chains_spec, dict) else []):
+        if not isinstance(chain_spec, dict):
+            continue
+        pre = chain_spec.get("pre_check") or []
+        on = chain_spec.get("on_complete") or []
+        chains[skill_name] = (
+            dedupe_keep_order([x for x in pre if isinstance(x, str)]) if isinstance(pre, list) else [],
+            dedupe_keep_order([x for x in on if isinstance(x, str)]) if isinstance(on, list) else [],
+        )
+
+    return {
+        "default_skill": orchestrator.get("default_skill") or DEFAULT_SKILL_FALLBACK,
+        "triggers": triggers,
+        "chains": chains,
+    }
+
+
+class ConfigSnapshot(NamedTuple):
+    config: dict[str, Any]
+    routing: dict[str, Any]
+
+
+def _parse_yaml(raw: bytes, path: Path) -> dict[str, Any]:
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    data = yaml.load(raw.decode("utf-8"), Loader=loader)
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid YAML root object in {path}")
+    return data
+
+
+def _snapshot_path(path: Path) -> Path:
+    tag = hashlib.sha1(os.fspath(path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return p0_fs.cache_dir() / f"{path.stem}.{tag}.snapshot.pickle"
+
+
+def load_snapshot(path: Path = CONFIG_PATH, *, use_cache: bool = True) -> ConfigSnapshot:
+    """
+    Load a config + routing snapshot, reusing the cached pickle when the YAML's
+    (size, mtime_ns, sha256) still match. Raises like a plain YAML load would.
+    """
+    raw = path.read_bytes()
+    st = path.stat()
+    key = (SNAPSHOT_VERSION, st.st_size, st.st_mtime_ns, hashlib.sha256(raw).hexdigest())
+    use_cache = use_cache and not p0_fs.cache_disabled()
+    snap_path = _snapshot_path(path)
+
+    if use_cache:
+        try:
+            cached = pickle.loads(snap_path.read_bytes())
+            if isinstance(cached, dict) and cached.get("key") == key:
+                return ConfigSnapshot(config=cached["config"], routing=cached["routing"])
+        except Exception:
+            pass  # Missing/corrupt/foreign snapshot: rebuild below.
+
+    config = _parse_yaml(raw, path)
+    snapshot = ConfigSnapshot(config=config, routing=routing_data(config))
+    if use_cache:
+        try:
+            payload = {"key": key, "config": snapshot.config, "routing": snapshot.routing}
+            p0_fs.atomic_write_bytes(snap_path, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            pass  # Read-only checkout or unpicklable YAML types: stay uncached.
+    return snapshot
+
+
+def load_config(path: Path = CONFIG_PATH, *, use_cache: bool = True) -> dict[str, Any]:
+    return load_snapshot(path, use_cache=use_cache).config
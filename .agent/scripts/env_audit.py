@@ -5,23 +5,29 @@ Environment variable audit (names only).
 Finds env var references across backend/frontend, compares with `.env.example`,
 and (optionally) compares with Supabase secrets (names only).
 
+Per-file extraction results are cached in `.agent/cache/env_audit.db` keyed by
+(size, mtime_ns, sha256); only new/changed files are rescanned (`--no-cache` to
+bypass).
+
+Other scripts can import it: `run_audit(parse_args(argv))` returns the structured
+result and `render_markdown()` renders it exactly like the CLI.
+
 Never prints secret values.
 """
 
 from __future__ import annotations
 
-import argparse
-import json
 import os
 import re
-import subprocess
 import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
+# Bump when extraction semantics change; cached per-file results are dropped.
+SCANNER_VERSION = 1
 DEFAULT_CONTRACT_PATH = Path("docs/ENV_SECRET_CONTRACT.json")
 ENV_ALIASES = {
     "dev": "dev",
@@ -33,24 +39,59 @@ ENV_ALIASES = {
 }
 
 
-PATTERNS: list[tuple[str, re.Pattern[str]]] = [
-    ("deno", re.compile(r"Deno\.env\.get\(\s*['\"]([A-Z0-9_]+)['\"]\s*\)")),
-    ("process_dot", re.compile(r"process\.env\.([A-Z0-9_]+)")),
-    ("process_bracket", re.compile(r"process\.env\[\s*['\"]([A-Z0-9_]+)['\"]\s*\]")),
-    ("vite_dot", re.compile(r"import\.meta\.env\.([A-Z0-9_]+)")),
-    ("vite_bracket", re.compile(r"import\.meta\.env\[\s*['\"]([A-Z0-9_]+)['\"]\s*\]")),
-]
-
-VITE_ALIAS_ASSIGN_PATTERNS: list[re.Pattern[str]] = [
+# One alternation finds every direct reference and alias/destructure declaration
+# in a single scan. Each branch consumes only a short anchor (the rest sits in a
+# lookahead) so matches of other kinds starting inside it are not swallowed;
+# the `*_end` groups mark where a standalone match would have ended, which
+# `_extract_vars` uses to keep per-kind matches non-overlapping.
+_IDENT = r"[A-Za-z_$][\w$]*"
+_ASSIGN_META_ENV = r"\s*(?::[^=\n]+)?=\s*import\.meta\.env\b"
+_DIRECT_REFS = (
+    r"Deno\.env\.get\(\s*['\"](?P<deno>[A-Z0-9_]+)['\"]\s*\)"
+    r"|process\.env(?:\.(?=(?P<process_dot>[A-Z0-9_]+))"
+    r"|\[(?=\s*['\"](?P<process_bracket>[A-Z0-9_]+)['\"]\s*\]))"
+    r"|import\.meta\.env(?:\.(?=(?P<vite_dot>[A-Z0-9_]+))"
+    r"|\[(?=\s*['\"](?P<vite_bracket>[A-Z0-9_]+)['\"]\s*\]))"
+)
+COMBINED_PATTERN = re.compile(
+    _DIRECT_REFS
     # const env = import.meta.env
-    re.compile(r"\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*(?::[^=\n]+)?=\s*import\.meta\.env\b"),
+    + rf"|\b(?:const|let|var)\s+(?=(?P<decl>{_IDENT})(?P<decl_end>{_ASSIGN_META_ENV}))"
     # env: SomeType = import.meta.env (function/default params)
-    re.compile(r"\b([A-Za-z_$][\w$]*)\s*(?::[^=\n]+)?=\s*import\.meta\.env\b"),
-]
-
-VITE_DESTRUCTURE_PATTERN = re.compile(
-    r"\{([^}]+)\}\s*(?::[^=\n]+)?=\s*import\.meta\.env\b"
+    + rf"|\b(?P<param>{_IDENT})(?=(?P<param_end>{_ASSIGN_META_ENV}))"
+    # const {{ VITE_A, VITE_B: b }} = import.meta.env
+    + rf"|\{{(?=(?P<destructure>[^}}]+)(?P<destructure_end>\}}{_ASSIGN_META_ENV}))"
 )
+# Declarations all end in `import.meta.env`; files without it only need this.
+DIRECT_PATTERN = re.compile(_DIRECT_REFS)
+# Files at least this big are mmap'ed in `--scan-mode auto`.
+MMAP_MIN_BYTES = 1 << 20
+SCAN_MODES = ("auto", "text", "mmap")
+_BYTES_PATTERNS: tuple[re.Pattern[bytes], re.Pattern[bytes]] | None = None
+_DIRECT_LABELS = ("deno", "process_dot", "process_bracket", "vite_dot", "vite_bracket")
+_DESTRUCTURE_KEY = re.compile(r"[A-Z0-9_]+")
+
+
+def _alias_access_pattern(aliases: set[str], *, binary: bool = False) -> re.Pattern[Any]:
+    # Longest first so an alias never shadows a longer one sharing its prefix.
+    names = "|".join(re.escape(a) for a in sorted(aliases, key=lambda a: (-len(a), a)))
+    pattern = (
+        rf"\b(?P<alias>{names})"
+        r"(?:\.(?=(?P<vite_alias_dot>[A-Z0-9_]+)\b)"
+        r"|\[(?=\s*['\"](?P<vite_alias_bracket>[A-Z0-9_]+)['\"]\s*\]))"
+    )
+    return re.compile(pattern.encode("utf-8") if binary else pattern)
+
+
+def _bytes_patterns() -> tuple[re.Pattern[bytes], re.Pattern[bytes]]:
+    # Byte twins of COMBINED_PATTERN/DIRECT_PATTERN for mmap scanning (ASCII \s, \w, \b).
+    global _BYTES_PATTERNS
+    if _BYTES_PATTERNS is None:
+        _BYTES_PATTERNS = (
+            re.compile(COMBINED_PATTERN.pattern.encode("ascii")),
+            re.compile(DIRECT_PATTERN.pattern.encode("ascii")),
+        )
+    return _BYTES_PATTERNS
 
 
 DEFAULT_SCAN_DIRS = [
@@ -71,62 +112,244 @@ IGNORE_BUILTINS_DEFAULT = {
 }
 
 
-def _iter_files(scan_dirs: list[Path]) -> list[Path]:
-    exts = {".ts", ".tsx", ".js", ".mjs"}
-    out: list[Path] = []
-    for base in scan_dirs:
-        if not base.exists():
-            continue
-        for p in base.rglob("*"):
-            if not p.is_file():
-                continue
-            if p.suffix.lower() not in exts:
-                continue
-            # Avoid huge/vendor folders.
-            parts = set(p.parts)
-            if "node_modules" in parts or "dist" in parts or ".git" in parts:
-                continue
-            out.append(p)
-    return out
+def _iter_files(scan_dirs: list[Path], *, untracked: bool = True) -> list[Path]:
+    # git index (or a pruning walk outside git) so node_modules/dist are never walked.
+    from repo_files import list_files
 
+    roots = [base for base in scan_dirs if base.exists()]
+    if not roots:
+        return []
+    names = list_files(roots, exts={".ts", ".tsx", ".js", ".mjs"}, untracked=untracked)
+    return [REPO_ROOT / name for name in names]
 
-def _extract_vars(path: Path) -> dict[str, set[str]]:
-    text = path.read_text(encoding="utf-8", errors="replace")
-    found: dict[str, set[str]] = defaultdict(set)
 
-    for label, rx in PATTERNS:
-        for match in rx.findall(text):
-            if isinstance(match, str) and match:
-                found[match].add(label)
+def _extract_vars(path: Path, mode: str = "auto") -> dict[str, set[str]]:
+    if mode != "text":
+        size = path.stat().st_size
+        # mmap can't map empty files; small ones are cheaper to just read.
+        if size and (mode == "mmap" or size >= MMAP_MIN_BYTES):
+            import mmap
+
+            with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _extract_text(mm)
+    return _extract_text(path.read_text(encoding="utf-8", errors="replace"))
+
+
+def _extract_text(text: Any) -> dict[str, set[str]]:
+    """
+    Extract `{var: labels}` from a str, or from bytes/an mmap without decoding
+    the whole buffer (only the captured names are decoded).
+    """
+    binary = not isinstance(text, str)
+    if binary:
+        combined, direct = _bytes_patterns()
+        needle, close = b"import.meta.env", b"]"
+    else:
+        combined, direct = COMBINED_PATTERN, DIRECT_PATTERN
+        needle, close = "import.meta.env", "]"
+
+    def name(raw: Any) -> str:
+        return raw.decode("utf-8", errors="replace") if binary else raw
+
+    found: dict[str, set[str]] = defaultdict(set)
 
     alias_names: set[str] = set()
-    for rx in VITE_ALIAS_ASSIGN_PATTERNS:
-        for alias in rx.findall(text):
-            if isinstance(alias, str) and alias:
-                alias_names.add(alias)
-
-    for alias in alias_names:
-        dot_rx = re.compile(rf"\b{re.escape(alias)}\.([A-Z0-9_]+)\b")
-        bracket_rx = re.compile(rf"\b{re.escape(alias)}\[\s*['\"]([A-Z0-9_]+)['\"]\s*\]")
-        for match in dot_rx.findall(text):
-            if isinstance(match, str) and match:
-                found[match].add("vite_alias_dot")
-        for match in bracket_rx.findall(text):
-            if isinstance(match, str) and match:
-                found[match].add("vite_alias_bracket")
-
-    for raw_vars in VITE_DESTRUCTURE_PATTERN.findall(text):
+    raw_destructures: list[str] = []
+    # End of the last accepted declaration per kind (standalone findall semantics).
+    decl_end = param_end = destructure_end = 0
+    rx = combined if text.find(needle) != -1 else direct
+    for m in rx.finditer(text):
+        kind = m.lastgroup
+        if kind in _DIRECT_LABELS:
+            found[name(m.group(kind))].add(kind)
+        elif kind == "decl_end":
+            if m.start() >= decl_end:
+                alias_names.add(name(m.group("decl")))
+                decl_end = m.end(kind)
+        elif kind == "param_end":
+            if m.start() >= param_end:
+                alias_names.add(name(m.group("param")))
+                param_end = m.end(kind)
+        elif kind == "destructure_end":
+            if m.start() >= destructure_end:
+                raw_destructures.append(name(m.group("destructure")))
+                destructure_end = m.end(kind)
+
+    if alias_names:
+        access_end: dict[tuple[str, str], int] = {}
+        for m in _alias_access_pattern(alias_names, binary=binary).finditer(text):
+            label = m.lastgroup
+            key = (name(m.group("alias")), label)
+            if m.start() < access_end.get(key, 0):
+                continue
+            found[name(m.group(label))].add(label)
+            # Standalone match end: past the name (dot) or the closing bracket.
+            access_end[key] = m.end(label) if label == "vite_alias_dot" else text.find(close, m.end(label)) + 1
+
+    for raw_vars in raw_destructures:
         for token in raw_vars.split(","):
             candidate = token.strip()
             if not candidate or candidate.startswith("..."):
                 continue
             key = candidate.split(":", 1)[0].split("=", 1)[0].strip()
-            if re.fullmatch(r"[A-Z0-9_]+", key):
+            if _DESTRUCTURE_KEY.fullmatch(key):
                 found[key].add("vite_destructure")
 
     return found
 
 
+def _extract_chunk(paths: list[Path], mode: str = "auto") -> list[dict[str, set[str]]]:
+    return [_extract_vars(p, mode) for p in paths]
+
+
+def _scan_files(files: list[Path], *, jobs: int = 1, mode: str = "auto") -> list[dict[str, set[str]]]:
+    """
+    Run `_extract_vars` over `files`, returning results in the same order.
+
+    With `jobs > 1` the files are split into chunks and scanned on a process
+    pool; merging in input order keeps the report identical to a serial run.
+    """
+    if jobs <= 1 or len(files) < 2:
+        return [_extract_vars(f, mode) for f in files]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunk_size = max(1, -(-len(files) // (jobs * 4)))
+    chunks = [files[i : i + chunk_size] for i in range(0, len(files), chunk_size)]
+    out: list[dict[str, set[str]]] = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for chunk_result in pool.map(_extract_chunk, chunks, [mode] * len(chunks)):
+            out.extend(chunk_result)
+    return out
+
+
+def _cache_fingerprint() -> str:
+    import hashlib
+
+    h = hashlib.sha256()
+    h.update(f"scanner={SCANNER_VERSION}\n".encode("utf-8"))
+    h.update(f"{COMBINED_PATTERN.pattern}\n".encode("utf-8"))
+    h.update(f"{_alias_access_pattern({'alias'}).pattern}\n".encode("utf-8"))
+    # Any edit to this script (helpers included) also invalidates the cache.
+    h.update(Path(__file__).read_bytes())
+    return h.hexdigest()
+
+
+class _ResultCache:
+    """
+    SQLite map of repo-relative file -> (size, mtime_ns, sha256, {var: labels}).
+
+    A stat match is a hit; on a stat mismatch the content hash decides. The
+    whole cache is dropped when the scanner fingerprint changes.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        import sqlite3
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = db_path
+        self.db = sqlite3.connect(os.fspath(db_path), timeout=10)
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "sha256 TEXT NOT NULL, result TEXT NOT NULL)"
+        )
+        fingerprint = _cache_fingerprint()
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != fingerprint:
+            self.db.execute("DELETE FROM files")
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)", (fingerprint,))
+            self.db.commit()
+
+    def rows(self) -> dict[str, tuple[int, int, str, str]]:
+        cur = self.db.execute("SELECT path, size, mtime_ns, sha256, result FROM files")
+        return {path: (size, mtime_ns, sha, result) for path, size, mtime_ns, sha, result in cur}
+
+    def store(self, entries: list[tuple[str, int, int, str, str]]) -> None:
+        self.db.executemany(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, result) VALUES (?, ?, ?, ?, ?)",
+            entries,
+        )
+
+    def evict(self, paths: list[str]) -> None:
+        self.db.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in paths])
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+
+def _scan_incremental(
+    files: list[Path], *, jobs: int, cache: _ResultCache | None, mode: str = "auto"
+) -> tuple[list[dict[str, set[str]]], dict[str, Any]]:
+    """
+    Like `_scan_files`, but reuses cached per-file results for unchanged files
+    and evicts entries for files that no longer exist.
+    """
+    if cache is None:
+        return _scan_files(files, jobs=jobs, mode=mode), {"enabled": False, "hits": 0, "misses": len(files), "evicted": 0}
+
+    import hashlib
+    import json
+
+    rows = cache.rows()
+    results: list[dict[str, set[str]] | None] = [None] * len(files)
+    pending: list[tuple[int, str, int, int, str]] = []
+    updates: list[tuple[str, int, int, str, str]] = []
+    hits = 0
+    for i, f in enumerate(files):
+        rel = os.fspath(f.relative_to(REPO_ROOT))
+        st = f.stat()
+        row = rows.get(rel)
+        if row is not None and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            results[i] = {k: set(v) for k, v in json.loads(row[3]).items()}
+            hits += 1
+            continue
+        with f.open("rb") as fh:
+            sha = hashlib.file_digest(fh, "sha256").hexdigest()
+        if row is not None and row[2] == sha:
+            # Touched but unchanged: refresh the stat key only.
+            results[i] = {k: set(v) for k, v in json.loads(row[3]).items()}
+            updates.append((rel, st.st_size, st.st_mtime_ns, sha, row[3]))
+            hits += 1
+            continue
+        pending.append((i, rel, st.st_size, st.st_mtime_ns, sha))
+
+    scanned = _scan_files([files[i] for i, *_ in pending], jobs=jobs, mode=mode)
+    for (i, rel, size, mtime_ns, sha), found in zip(pending, scanned):
+        results[i] = found
+        encoded = json.dumps({k: sorted(v) for k, v in sorted(found.items())}, ensure_ascii=True)
+        updates.append((rel, size, mtime_ns, sha, encoded))
+
+    current = {os.fspath(f.relative_to(REPO_ROOT)) for f in files}
+    evicted = [p for p in rows if p not in current and not (REPO_ROOT / p).is_file()]
+    cache.store(updates)
+    cache.evict(evicted)
+    stats = {
+        "enabled": True,
+        "path": os.fspath(cache.path.relative_to(REPO_ROOT)) if cache.path.is_relative_to(REPO_ROOT) else os.fspath(cache.path),
+        "hits": hits,
+        "misses": len(pending),
+        "evicted": len(evicted),
+    }
+    return [r if r is not None else {} for r in results], stats
+
+
+def _open_cache(enabled: bool, warnings: list[str]) -> _ResultCache | None:
+    if not enabled:
+        return None
+    import p0_fs
+
+    if p0_fs.cache_disabled():
+        return None
+    try:
+        return _ResultCache(p0_fs.cache_dir() / "env_audit.db")
+    except Exception as exc:
+        warnings.append(f"WARNING: env audit cache unavailable ({exc}); scanning without it.")
+        return None
+
+
 def _parse_env_example(path: Path) -> set[str]:
     if not path.is_file():
         return set()
@@ -146,6 +369,9 @@ def _parse_env_example(path: Path) -> set[str]:
 
 
 def _supabase_secret_names(project_ref: str) -> set[str]:
+    import json
+    import subprocess
+
     cmd = [
         "supabase",
         "secrets",
@@ -177,6 +403,8 @@ def _normalize_target_environment(value: str) -> str:
 def _load_contract(path: Path) -> dict[str, Any] | None:
     if not path.is_file():
         return None
+    import json
+
     raw = json.loads(path.read_text(encoding="utf-8"))
     if not isinstance(raw, dict):
         raise ValueError("env contract must be a JSON object")
@@ -223,7 +451,18 @@ def _classify_missing_supabase(
     }
 
 
-def main(argv: list[str]) -> int:
+class AuditResult(NamedTuple):
+    payload: dict[str, Any]  # The `--format json` document.
+    header: list[str]  # Markdown bullets under the title.
+    sections: list[tuple[str, list[str]]]  # (title, names) lists, in report order.
+    notes: list[str]
+    warnings: list[str]
+    exit_code: int
+
+
+def parse_args(argv: list[str]) -> Any:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Audit env var usage vs docs (names only)")
     parser.add_argument(
         "--scan-dir",
@@ -260,12 +499,49 @@ def main(argv: list[str]) -> int:
         action="store_true",
         help="Exit non-zero if required Supabase vars for the target environment are missing.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for file scanning (default: 1; 0 = one per CPU).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rescan every file and leave .agent/cache/env_audit.db untouched.",
+    )
+    parser.add_argument(
+        "--scan-mode",
+        choices=SCAN_MODES,
+        default="auto",
+        help=f"How files are read: text decodes each file, mmap runs byte regexes over a mapping "
+        f"(default: auto = mmap for files >= {MMAP_MIN_BYTES // (1024 * 1024)} MiB).",
+    )
+    parser.add_argument(
+        "--max-file-bytes",
+        type=int,
+        default=0,
+        help="Skip files larger than this many bytes (default: 0 = no limit).",
+    )
+    parser.add_argument(
+        "--tracked-only",
+        action="store_true",
+        help="Scan only files in the git index (default also scans untracked, non-ignored files).",
+    )
     parser.add_argument(
         "--include-builtins",
         action="store_true",
         help="Include framework/runtime built-ins like DEV/PROD/DENO_DEPLOYMENT_ID in results.",
     )
-    args = parser.parse_args(argv)
+    return parser.parse_args(argv)
+
+
+def run_audit(args: Any) -> AuditResult:
+    """
+    Run the audit for parsed `args` without printing anything; callers render
+    the result (see `render_markdown`) and surface `warnings` themselves.
+    """
+    warnings: list[str] = []
     target_environment = _normalize_target_environment(args.target_environment)
     contract_path = REPO_ROOT / args.contract
     contract = _load_contract(contract_path)
@@ -273,10 +549,25 @@ def main(argv: list[str]) -> int:
     scan_dirs = [REPO_ROOT / p for p in DEFAULT_SCAN_DIRS]
     scan_dirs.extend(REPO_ROOT / p for p in args.scan_dir)
 
-    files = _iter_files(scan_dirs)
+    files = _iter_files(scan_dirs, untracked=not args.tracked_only)
+    skipped_oversize: list[str] = []
+    if args.max_file_bytes > 0:
+        kept: list[Path] = []
+        for f in files:
+            if f.stat().st_size > args.max_file_bytes:
+                skipped_oversize.append(os.fspath(f.relative_to(REPO_ROOT)))
+            else:
+                kept.append(f)
+        files = kept
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    cache = _open_cache(not args.no_cache, warnings)
+    try:
+        scanned, cache_stats = _scan_incremental(files, jobs=jobs, cache=cache, mode=args.scan_mode)
+    finally:
+        if cache is not None:
+            cache.close()
     used: dict[str, dict[str, Any]] = {}
-    for f in files:
-        vars_in_file = _extract_vars(f)
+    for f, vars_in_file in zip(files, scanned):
         for var, labels in vars_in_file.items():
             if not args.include_builtins and var in IGNORE_BUILTINS_DEFAULT:
                 continue
@@ -314,93 +605,110 @@ def main(argv: list[str]) -> int:
         except Exception as exc:
             supabase_names = None
             missing_in_supabase = None
-            if args.format == "markdown":
-                print(f"WARNING: supabase compare failed: {exc}", file=sys.stderr)
+            warnings.append(f"WARNING: supabase compare failed: {exc}")
+
+    gate_failed = bool(args.check_required_supabase and missing_in_supabase_by_contract["required"])
+    payload = {
+        "used": {
+            k: {
+                "files": sorted(list(v["files"])),
+                "sources": sorted(list(v["sources"])),
+            }
+            for k, v in sorted(used.items())
+        },
+        "env_example": sorted(env_example),
+        "missing_in_env_example": missing_in_env_example,
+        "unused_in_env_example": unused_in_code,
+        "supabase_secrets": sorted(list(supabase_names)) if supabase_names is not None else None,
+        "missing_in_supabase_secrets": missing_in_supabase,
+        "supabase_scope": args.supabase_scope if args.with_supabase else None,
+        "contract": {
+            "path": os.fspath(contract_path.relative_to(REPO_ROOT)) if contract is not None else None,
+            "target_environment": target_environment,
+            "missing_required_in_supabase_secrets": missing_in_supabase_by_contract["required"],
+            "missing_optional_in_supabase_secrets": missing_in_supabase_by_contract["optional"],
+            "missing_unclassified_in_supabase_secrets": missing_in_supabase_by_contract["unclassified"],
+        },
+        "cache": cache_stats,
+        "skipped_oversize": skipped_oversize,
+    }
 
-    if args.format == "json":
-        payload = {
-            "used": {
-                k: {
-                    "files": sorted(list(v["files"])),
-                    "sources": sorted(list(v["sources"])),
-                }
-                for k, v in sorted(used.items())
-            },
-            "env_example": sorted(env_example),
-            "missing_in_env_example": missing_in_env_example,
-            "unused_in_env_example": unused_in_code,
-            "supabase_secrets": sorted(list(supabase_names)) if supabase_names is not None else None,
-            "missing_in_supabase_secrets": missing_in_supabase,
-            "supabase_scope": args.supabase_scope if args.with_supabase else None,
-            "contract": {
-                "path": os.fspath(contract_path.relative_to(REPO_ROOT)) if contract is not None else None,
-                "target_environment": target_environment,
-                "missing_required_in_supabase_secrets": missing_in_supabase_by_contract["required"],
-                "missing_optional_in_supabase_secrets": missing_in_supabase_by_contract["optional"],
-                "missing_unclassified_in_supabase_secrets": missing_in_supabase_by_contract["unclassified"],
-            },
-        }
-        print(json.dumps(payload, ensure_ascii=True, indent=2))
-        if args.check_required_supabase and missing_in_supabase_by_contract["required"]:
-            return 1
-        return 0
-
-    print("# Env Audit (names only)")
-    print("")
-    print(f"- Scan roots: {', '.join(os.fspath(p.relative_to(REPO_ROOT)) for p in scan_dirs if p.exists())}")
-    print(f"- Env example: `{args.env_example}`")
+    header = [f"- Scan roots: {', '.join(os.fspath(p.relative_to(REPO_ROOT)) for p in scan_dirs if p.exists())}"]
+    if skipped_oversize:
+        header.append(f"- Skipped (over {args.max_file_bytes} bytes): {len(skipped_oversize)} file(s)")
+    header.append(f"- Env example: `{args.env_example}`")
     if contract is not None:
-        print(f"- Env contract: `{args.contract}` (target `{target_environment}`)")
+        header.append(f"- Env contract: `{args.contract}` (target `{target_environment}`)")
     else:
-        print(f"- Env contract: missing (`{args.contract}`)")
+        header.append(f"- Env contract: missing (`{args.contract}`)")
     if args.with_supabase:
-        print(f"- Supabase secrets: enabled (project_ref `{args.project_ref}`)")
-        print(f"- Supabase compare scope: `{args.supabase_scope}`")
+        header.append(f"- Supabase secrets: enabled (project_ref `{args.project_ref}`)")
+        header.append(f"- Supabase compare scope: `{args.supabase_scope}`")
     else:
-        print("- Supabase secrets: disabled")
-    print("")
-
-    def _sec(title: str, items: list[str]) -> None:
-        print(f"## {title}")
-        print("")
-        if not items:
-            print("(none)")
-            print("")
-            return
-        for it in items:
-            print(f"- `{it}`")
-        print("")
-
-    _sec("Used In Code But Missing In .env.example", missing_in_env_example)
-    _sec("Present In .env.example But Not Used In Code", unused_in_code)
+        header.append("- Supabase secrets: disabled")
 
+    sections: list[tuple[str, list[str]]] = [
+        ("Used In Code But Missing In .env.example", missing_in_env_example),
+        ("Present In .env.example But Not Used In Code", unused_in_code),
+    ]
     if args.with_supabase and supabase_names is not None and missing_in_supabase is not None:
-        _sec("Used In Code But Missing In Supabase Secrets (raw names)", missing_in_supabase)
+        sections.append(("Used In Code But Missing In Supabase Secrets (raw names)", missing_in_supabase))
         if contract is not None:
-            _sec(
-                f"Missing Required In Supabase Secrets ({target_environment})",
-                missing_in_supabase_by_contract["required"],
-            )
-            _sec(
-                f"Missing Optional In Supabase Secrets ({target_environment})",
-                missing_in_supabase_by_contract["optional"],
-            )
-            _sec(
-                f"Missing In Supabase Secrets Without Contract Classification ({target_environment})",
-                missing_in_supabase_by_contract["unclassified"],
-            )
-
-    print("## Notes")
-    print("")
-    print("- This report never prints values. Review each missing variable and decide whether it belongs in `.env.example` or Supabase secrets.")
+            sections += [
+                (
+                    f"Missing Required In Supabase Secrets ({target_environment})",
+                    missing_in_supabase_by_contract["required"],
+                ),
+                (
+                    f"Missing Optional In Supabase Secrets ({target_environment})",
+                    missing_in_supabase_by_contract["optional"],
+                ),
+                (
+                    f"Missing In Supabase Secrets Without Contract Classification ({target_environment})",
+                    missing_in_supabase_by_contract["unclassified"],
+                ),
+            ]
+
+    notes = ["- This report never prints values. Review each missing variable and decide whether it belongs in `.env.example` or Supabase secrets."]
     if contract is not None:
-        print("- Optional contract entries cover feature-gated or fallback-backed vars; only `--check-required-supabase` should fail the gate.")
-    if args.check_required_supabase and missing_in_supabase_by_contract["required"]:
-        print(f"- Gate result: FAIL ({len(missing_in_supabase_by_contract['required'])} required Supabase vars missing for `{target_environment}`).")
-        return 1
-    if args.check_required_supabase:
-        print(f"- Gate result: PASS (no required Supabase vars missing for `{target_environment}`).")
-    return 0
+        notes.append("- Optional contract entries cover feature-gated or fallback-backed vars; only `--check-required-supabase` should fail the gate.")
+    if gate_failed:
+        notes.append(f"- Gate result: FAIL ({len(missing_in_supabase_by_contract['required'])} required Supabase vars missing for `{target_environment}`).")
+    elif args.check_required_supabase:
+        notes.append(f"- Gate result: PASS (no required Supabase vars missing for `{target_environment}`).")
+
+    return AuditResult(
+        payload=payload,
+        header=header,
+        sections=sections,
+        notes=notes,
+        warnings=warnings,
+        exit_code=1 if gate_failed else 0,
+    )
+
+
+def render_markdown(result: AuditResult) -> str:
+    lines = ["# Env Audit (names only)", "", *result.header, ""]
+    for title, items in result.sections:
+        lines += [f"## {title}", ""]
+        lines += [f"- `{it}`" for it in items] if items else ["(none)"]
+        lines.append("")
+    lines += ["## Notes", "", *result.notes]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    result = run_audit(args)
+    for warning in result.warnings:
+        print(warning, file=sys.stderr)
+    if args.format == "json":
+        import json
+
+        print(json.dumps(result.payload, ensure_ascii=True, indent=2))
+    else:
+        sys.stdout.write(render_markdown(result))
+    return result.exit_code
 
 
 if __name__ == "__main__":
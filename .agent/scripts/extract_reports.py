@@ -1,10 +1,22 @@
 #!/usr/bin/env python3
 """
-Generate production-readiness extraction reports (Markdown) for sharing with another agent.
+Generate production-readiness extraction reports for sharing with another agent.
 
-Outputs (under docs/closure/):
+Outputs (under docs/closure/runs/<YYYY-MM-DD>_<HHMMSS>_<run id>/, one directory
+per run so overlapping runs never collide):
 - TECHNICAL_ANALYSIS_<YYYY-MM-DD>_<HHMMSS>.md
 - INVENTORY_REPORT_<YYYY-MM-DD>_<HHMMSS>.md
+- EXTRACTION_<YYYY-MM-DD>_<HHMMSS>.json (`--format json|both`)
+
+The shared BASELINE_LOG_* stays in docs/closure/; it is captured under a file
+lock so concurrent runs reuse one capture instead of each starting their own.
+
+Data collection and formatting are split: `_collect_technical()` /
+`_collect_inventory()` return plain JSON-ready dicts, the Markdown reports are
+rendered from them, and `--format json` writes them as one document
+(`schema_version`, `reports` -> Markdown paths, `technical`, `inventory`) so
+other tools (e.g. mega_plan_template.py) can load the facts instead of
+scraping Markdown.
 
 Safety:
 - Never prints secret values (only names).
@@ -13,21 +25,35 @@ Safety:
 
 from __future__ import annotations
 
-import argparse
-import json
 import os
-import re
-import subprocess
 import sys
-from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, NamedTuple
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 CLOSURE_DIR = REPO_ROOT / "docs" / "closure"
+# One directory per extraction run, so overlapping runs never share file names.
+RUNS_DIR = CLOSURE_DIR / "runs"
 BASELINE_REUSE_WINDOW_SECONDS = 10 * 60
+DEFAULT_CONCURRENCY = 4
+# Perf output kept for the report: head + tail of the stream fit the rendered
+# block (PERF_RENDER_CHARS) with the omitted/timeout markers; the full log is on disk.
+PERF_HEAD_CHARS = 1500
+PERF_TAIL_CHARS = 4000
+PERF_RENDER_CHARS = 6000
+PROBE_CACHE_VERSION = 1
+# Bump on incompatible changes to the --format json document layout.
+EXTRACTION_SCHEMA_VERSION = 1
+LINE_COUNT_CACHE_VERSION = 1
+LINE_COUNT_CHUNK = 1 << 20
+# Files at least this big are mmap'ed (and sliced) instead of read().
+LINE_COUNT_MMAP_BYTES = 8 << 20
+# Inventory walk: folders sized like `du -sh`, and where assets live (must be inside one of them).
+INVENTORY_FOLDERS = (".agent", "docs", "supabase", "tests", "scripts", "minimarket-system")
+ASSET_ROOTS = ("minimarket-system/public", "minimarket-system/src/assets")
+ASSET_TOP_N = 20
 
 
 def _utc_now() -> datetime:
@@ -49,14 +75,21 @@ def _safe_rel(path: Path) -> str:
         return os.fspath(path)
 
 
-@dataclass(frozen=True)
-class CmdResult:
+class CmdResult(NamedTuple):
     cmd: str
     rc: int
     out: str
 
 
-def _run(cmd: list[str] | str, *, timeout: int = 900, cwd: Path | None = None) -> CmdResult:
+# One env audit per extraction, shared by both reports (keyed by supabase compare).
+_ENV_AUDITS: dict[bool, tuple[CmdResult, list[str]]] = {}
+
+
+def _run(
+    cmd: list[str] | str, *, timeout: int = 900, cwd: Path | None = None, env: dict[str, str] | None = None
+) -> CmdResult:
+    import subprocess
+
     if isinstance(cmd, list):
         cmd_str = " ".join(_shell_quote(x) for x in cmd)
     else:
@@ -69,26 +102,392 @@ def _run(cmd: list[str] | str, *, timeout: int = 900, cwd: Path | None = None) -
         text=True,
         timeout=timeout,
         shell=isinstance(cmd, str),
+        env={**os.environ, **env} if env else None,
     )
     return CmdResult(cmd=cmd_str, rc=proc.returncode, out=(proc.stdout or ""))
 
 
+class _Task(NamedTuple):
+    fn: Callable[[], Any]
+    deps: tuple[str, ...] = ()
+
+
+def _run_dag(tasks: dict[str, _Task], *, concurrency: int = DEFAULT_CONCURRENCY) -> dict[str, Any]:
+    """
+    Run `tasks` on a thread pool, each as soon as all of its deps have finished,
+    with at most `concurrency` running at once. Returns `{name: result}`.
+
+    The first task exception is re-raised once running tasks finish; tasks that
+    have not started yet are cancelled.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    for name, task in tasks.items():
+        unknown = [d for d in task.deps if d not in tasks]
+        if unknown:
+            raise ValueError(f"Task {name!r} depends on unknown task(s): {', '.join(unknown)}")
+
+    results: dict[str, Any] = {}
+    pending = dict(tasks)
+    running: dict[Any, str] = {}
+    pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        while pending or running:
+            for name in [n for n, t in pending.items() if all(d in results for d in t.deps)]:
+                running[pool.submit(pending.pop(name).fn)] = name
+            if not running:
+                raise ValueError(f"Task dependency cycle: {', '.join(sorted(pending))}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                results[running.pop(fut)] = fut.result()
+    except BaseException:
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
+    return results
+
+
+class _ProbePolicy(NamedTuple):
+    ttl_seconds: int
+    max_entries: int  # Distinct input keys kept per probe (most recent first).
+
+
+_DAY = 24 * 60 * 60
+PROBE_POLICIES: dict[str, _ProbePolicy] = {
+    # Tool versions only change when the binary does.
+    "node_v": _ProbePolicy(7 * _DAY, 2),
+    "npm_v": _ProbePolicy(7 * _DAY, 2),
+    "pnpm_v": _ProbePolicy(7 * _DAY, 2),
+    "supabase_v": _ProbePolicy(7 * _DAY, 2),
+    # Source scans: keyed by HEAD + dirty tree, still refreshed a few times a day.
+    "source_scan": _ProbePolicy(6 * 60 * 60, 4),
+    "top_files": _ProbePolicy(_DAY, 4),
+    "tests_count": _ProbePolicy(_DAY, 4),
+    "openapi_paths": _ProbePolicy(7 * _DAY, 4),
+    "openapi_prov_paths": _ProbePolicy(7 * _DAY, 4),
+}
+
+
+class _ProbeCache:
+    """
+    Result cache for extraction probes (`.agent/cache/extract_probes.json`).
+
+    Each probe is keyed by whatever its output depends on: the git HEAD plus a
+    hash of the dirty/untracked state of its paths (`tree_key`) and/or the
+    resolved path + mtime of the tool it runs (`tool_key`). A hit must match the
+    key and be younger than the probe's TTL; each probe keeps at most
+    `max_entries` keys. A probe with an unknown key (no git, missing tool) is
+    always run and never stored.
+    """
+
+    def __init__(self, *, enabled: bool) -> None:
+        import threading
+
+        import p0_fs
+
+        self.enabled = enabled and not p0_fs.cache_disabled()
+        self.path = p0_fs.cache_dir() / "extract_probes.json"
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._head: str | None = None
+        self._head_done = False
+        self._dirty = False
+        self._probes: dict[str, list[dict[str, Any]]] = {}
+        if self.enabled:
+            try:
+                data = _read_json(self.path)
+                if data.get("version") == PROBE_CACHE_VERSION and isinstance(data.get("probes"), dict):
+                    self._probes = data["probes"]
+            except Exception:
+                pass  # Missing/corrupt cache: start empty.
+
+    def _git_head(self) -> str | None:
+        with self._lock:
+            if not self._head_done:
+                try:
+                    res = _run(["git", "rev-parse", "HEAD"], timeout=30)
+                    self._head = res.out.strip() if res.rc == 0 else None
+                except Exception:
+                    self._head = None
+                self._head_done = True
+            return self._head
+
+    def tree_key(self, pathspecs: list[str], *, untracked: bool = True) -> str | None:
+        """HEAD + hash of `git status` (and stat of each dirty path) for `pathspecs`."""
+        if not self.enabled:
+            return None
+        head = self._git_head()
+        if head is None:
+            return None
+        import hashlib
+        import subprocess
+
+        cmd = ["git", "--no-optional-locks", "status", "--porcelain=v1", "-z"]
+        cmd.append("--untracked-files=all" if untracked else "--untracked-files=no")
+        try:
+            proc = subprocess.run(
+                [*cmd, "--", *pathspecs],
+                cwd=os.fspath(REPO_ROOT),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                timeout=60,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if proc.returncode != 0:
+            return None
+        h = hashlib.sha256(proc.stdout)
+        tokens = proc.stdout.split(b"\0")
+        i = 0
+        while i < len(tokens):
+            entry = tokens[i]
+            i += 1
+            if len(entry) < 4:
+                continue
+            if entry[:1] in (b"R", b"C"):
+                i += 1  # Rename/copy: the next token is the source path.
+            # Editing an already-dirty file doesn't change `git status`; its stat does.
+            try:
+                st = (REPO_ROOT / os.fsdecode(entry[3:])).stat()
+                h.update(f"{st.st_size}:{st.st_mtime_ns}".encode("ascii"))
+            except OSError:
+                h.update(b"-")
+        return f"{head}:{h.hexdigest()[:16]}"
+
+    def tool_key(self, exe: str) -> str | None:
+        if not self.enabled:
+            return None
+        found = shutil_which(exe)
+        if found is None:
+            return None
+        real = os.path.realpath(found)
+        try:
+            st = os.stat(real)
+        except OSError:
+            return None
+        return f"{real}:{st.st_size}:{st.st_mtime_ns}"
+
+    def get_or_run(
+        self,
+        name: str,
+        key_parts: list[str | None],
+        fn: Callable[[], Any],
+        *,
+        encode: Callable[[Any], Any] = lambda v: v,
+        decode: Callable[[Any], Any] = lambda v: v,
+    ) -> Any:
+        """Return the cached value for `name` under `key_parts`, or run `fn` and store it."""
+        import time
+
+        policy = PROBE_POLICIES[name]
+        if not self.enabled or any(part is None for part in key_parts):
+            return fn()
+        key = "|".join(str(part) for part in key_parts)
+        now = time.time()
+        with self._lock:
+            for entry in self._probes.get(name, []):
+                if entry.get("key") == key and now - float(entry.get("at", 0)) <= policy.ttl_seconds:
+                    self.hits += 1
+                    return decode(entry["value"])
+        value = fn()
+        with self._lock:
+            self.misses += 1
+            kept = [
+                e
+                for e in self._probes.get(name, [])
+                if e.get("key") != key and now - float(e.get("at", 0)) <= policy.ttl_seconds
+            ]
+            kept.insert(0, {"key": key, "at": now, "value": encode(value)})
+            self._probes[name] = kept[: policy.max_entries]
+            self._dirty = True
+        return value
+
+    def save(self) -> None:
+        if not self.enabled or not self._dirty:
+            return
+        import json
+        import time
+
+        import p0_fs
+
+        now = time.time()
+        probes = {
+            name: [e for e in entries if now - float(e.get("at", 0)) <= PROBE_POLICIES[name].ttl_seconds]
+            for name, entries in self._probes.items()
+            if name in PROBE_POLICIES
+        }
+        payload = {"version": PROBE_CACHE_VERSION, "probes": {k: v for k, v in probes.items() if v}}
+        try:
+            p0_fs.atomic_write_text(self.path, json.dumps(payload, ensure_ascii=True, indent=2) + "\n")
+        except OSError:
+            pass  # Read-only checkout: stay uncached.
+
+
+def _cmd_probe(cache: _ProbeCache, name: str, key_parts: list[str | None], fn: Callable[[], CmdResult]) -> CmdResult:
+    return cache.get_or_run(name, key_parts, fn, encode=lambda r: r._asdict(), decode=lambda v: CmdResult(**v))
+
+
+def _run_streaming(
+    cmd: list[str],
+    *,
+    timeout: int,
+    label: str,
+    log_path: Path | None = None,
+    env: dict[str, str] | None = None,
+    head_chars: int = 8000,
+    tail_chars: int = 8000,
+    heartbeat_seconds: float = 30.0,
+    progress_prefixes: tuple[str, ...] = (),
+) -> CmdResult:
+    """
+    Like `_run`, for long commands: output is read as it arrives, optionally
+    tee'd to `log_path`, and only the first `head_chars` plus a ring buffer of
+    the last `tail_chars` are kept (with a marker between them if anything was
+    dropped). Lines starting with `progress_prefixes` and a periodic heartbeat
+    go to stderr. On timeout the whole process group is killed and the captured
+    output is returned with rc 124 instead of raising.
+    """
+    import signal
+    import subprocess
+    import threading
+    import time
+    from collections import deque
+
+    cmd_str = " ".join(_shell_quote(x) for x in cmd)
+    head: list[str] = []
+    head_len = 0
+    tail: deque[str] = deque()
+    tail_len = 0
+    dropped = 0
+    n_lines = 0
+    log = None
+    if log_path is not None:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        log = log_path.open("ab")
+
+    proc = subprocess.Popen(
+        cmd,
+        cwd=os.fspath(REPO_ROOT),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env={**os.environ, **env} if env else None,
+        start_new_session=True,
+    )
+
+    def _pump() -> None:
+        nonlocal head_len, tail_len, dropped, n_lines
+        assert proc.stdout is not None
+        for raw in proc.stdout:
+            if log is not None:
+                log.write(raw)
+            line = raw.decode("utf-8", errors="replace")
+            n_lines += 1
+            if progress_prefixes and line.startswith(progress_prefixes):
+                print(f"[extract] {label}: {line.rstrip()}", file=sys.stderr, flush=True)
+            if head_len < head_chars:
+                head.append(line)
+                head_len += len(line)
+                continue
+            tail.append(line)
+            tail_len += len(line)
+            while tail_len > tail_chars and len(tail) > 1:
+                old = tail.popleft()
+                tail_len -= len(old)
+                dropped += len(old)
+
+    reader = threading.Thread(target=_pump, daemon=True)
+    reader.start()
+    started = time.monotonic()
+    timed_out = False
+    try:
+        while True:
+            remaining = timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                timed_out = True
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                proc.wait()
+                break
+            try:
+                proc.wait(timeout=min(remaining, heartbeat_seconds))
+                break
+            except subprocess.TimeoutExpired:
+                elapsed = int(time.monotonic() - started)
+                print(f"[extract] {label}: still running ({elapsed}s, {n_lines} lines)", file=sys.stderr, flush=True)
+        # Grandchildren may keep the pipe open after a kill; don't wait on them forever.
+        reader.join(timeout=5)
+    finally:
+        if log is not None:
+            log.close()
+
+    parts = head[:]
+    if dropped:
+        parts.append(f"\n... ({dropped} chars omitted{f'; full log: {_safe_rel(log_path)}' if log_path else ''})\n")
+    parts.extend(tail)
+    if timed_out:
+        parts.append(f"\n... (timed out after {timeout}s)\n")
+    return CmdResult(cmd=cmd_str, rc=124 if timed_out else proc.returncode, out="".join(parts))
+
+
 def _shell_quote(s: str) -> str:
     # Minimal POSIX-ish quoting for display only.
+    import re
+
     if re.fullmatch(r"[A-Za-z0-9_./:-]+", s):
         return s
     return "'" + s.replace("'", "'\"'\"'") + "'"
 
 
-def _truncate(text: str, *, max_chars: int = 6000) -> str:
+def _env_audit(*, include_supabase_compare: bool) -> tuple[CmdResult, list[str]]:
+    """
+    Run env_audit in-process (once per extraction) and return its markdown as a
+    CmdResult, shaped like the old `env_audit.py` subprocess capture (warnings
+    first), plus every name its sections list.
+    """
+    cached = _ENV_AUDITS.get(include_supabase_compare)
+    if cached is not None:
+        return cached
+
+    import env_audit
+
+    argv = ["--format", "markdown"]
+    if include_supabase_compare:
+        argv += ["--with-supabase", "--supabase-scope", "backend-only"]
+    cmd_str = " ".join(_shell_quote(x) for x in [".agent/scripts/env_audit.py", *argv])
+    try:
+        result = env_audit.run_audit(env_audit.parse_args(argv))
+    except Exception as exc:
+        return CmdResult(cmd=cmd_str, rc=1, out=f"Error: env audit failed: {exc}\n"), []
+    out = "".join(f"{w}\n" for w in result.warnings) + env_audit.render_markdown(result)
+    names = [name for _, items in result.sections for name in items]
+    _ENV_AUDITS[include_supabase_compare] = (CmdResult(cmd=cmd_str, rc=result.exit_code, out=out), names)
+    return _ENV_AUDITS[include_supabase_compare]
+
+
+def _truncate(text: str, *, max_chars: int = 6000, tail_chars: int = 0) -> str:
+    """
+    `text` cut to about `max_chars`. With `tail_chars`, the last lines (up to
+    that many chars) are kept after the marker and the head gets the rest, so
+    a log's ending (results, timeout/omitted markers) survives.
+    """
     t = text.rstrip()
     if len(t) <= max_chars:
         return t
-    return t[:max_chars].rstrip() + "\n... (truncated)\n"
-
-
-def _md_cmd(res: CmdResult, *, max_chars: int = 6000) -> str:
-    out = _truncate(res.out, max_chars=max_chars)
+    if tail_chars <= 0:
+        return t[:max_chars].rstrip() + "\n... (truncated)\n"
+    tail_chars = min(tail_chars, max_chars)
+    head = t[: max_chars - tail_chars].rstrip()
+    tail = t[len(t) - tail_chars :]
+    if "\n" in tail:
+        tail = tail[tail.index("\n") + 1 :]  # Start on a whole line.
+    return f"{head}\n... (truncated)\n{tail}"
+
+
+def _md_cmd(res: CmdResult, *, max_chars: int = 6000, tail_chars: int = 0) -> str:
+    out = _truncate(res.out, max_chars=max_chars, tail_chars=tail_chars)
     return "\n".join(
         [
             "```bash",
@@ -104,6 +503,8 @@ def _md_cmd(res: CmdResult, *, max_chars: int = 6000) -> str:
 
 
 def _read_json(path: Path) -> dict[str, Any]:
+    import json
+
     return json.loads(path.read_text(encoding="utf-8"))
 
 
@@ -143,40 +544,186 @@ def _count_tests() -> dict[str, int]:
     return out
 
 
-def _top_files_by_lines(*, top_n: int = 20) -> list[tuple[int, str]]:
-    # Uses git ls-files to avoid node_modules. We filter by extension ourselves
-    # to avoid git pathspec glob edge cases.
-    exts = {".ts", ".tsx", ".js", ".mjs"}
-    cmd = ["git", "ls-files"]
-    try:
-        res = _run(cmd, timeout=60)
-    except Exception:
-        return []
-    if res.rc != 0:
-        return []
-    files = []
-    for f in (x.strip() for x in res.out.splitlines()):
-        if not f:
-            continue
-        if Path(f).suffix.lower() not in exts:
-            continue
-        files.append(f)
-    files = sorted(set(files), key=str.lower)
-    scored: list[tuple[int, str]] = []
+def _source_scan_rules() -> list[Any]:
+    from source_scan import ScanRule
+
+    return [
+        ScanRule(
+            "todos",
+            r"(TODO|FIXME|HACK)",
+            ("supabase", "minimarket-system/src", "scripts", "tests", "docs"),
+            exclude=("docs/closure",),
+            literals=("TODO", "FIXME", "HACK"),
+        ),
+        # JWT-like tokens, filenames only; keep the regex tight to reduce false positives.
+        ScanRule(
+            "forbidden_jwt",
+            r"ey[A-Za-z0-9\-_=]{20,}",
+            ("supabase/functions", "minimarket-system/src", "scripts", "tests"),
+            exts=frozenset({".ts", ".tsx", ".js", ".mjs"}),
+            files_only=True,
+            literals=("ey",),
+        ),
+        ScanRule("forbidden_console", r"console\.log", ("supabase/functions",), files_only=True, literals=("console.log",)),
+    ]
+
+
+def _source_scan_fingerprint() -> str:
+    from source_scan import fingerprint
+
+    return fingerprint(_source_scan_rules())
+
+
+def _source_scan() -> dict[str, CmdResult]:
+    """
+    TODO / JWT / console.log probes in a single in-process pass (no rg needed).
+    Each result looks like the rg run it replaces: `rg -n` lines or `rg -l`
+    filenames, rc 1 when nothing matched.
+    """
+    from source_scan import scan
+
+    rules = _source_scan_rules()
+    found = scan(rules)
+    out: dict[str, CmdResult] = {}
+    for rule in rules:
+        lines = found[rule.name]
+        flag = "-l" if rule.files_only else "-n"
+        out[rule.name] = CmdResult(
+            cmd=f"(in-process) scan {flag} {_shell_quote(rule.pattern)} {' '.join(rule.roots)}",
+            rc=0 if lines else 1,
+            out="".join(f"{line}\n" for line in lines),
+        )
+    return out
+
+
+def _count_lines(path: Path) -> int:
+    """
+    Lines as text-mode iteration counts them (`\n`, `\r\n` and a lone `\r`
+    end a line; a trailing partial line counts), from raw byte chunks.
+    """
+    with path.open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size >= LINE_COUNT_MMAP_BYTES:
+            import mmap
+
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                n = _count_newlines(mm[i : i + LINE_COUNT_CHUNK] for i in range(0, size, LINE_COUNT_CHUNK))
+        else:
+            n = _count_newlines(iter(lambda: fh.read(LINE_COUNT_CHUNK), b""))
+    if n is None:
+        # Invalid UTF-8: dropped bytes can merge "\r" + "\n" or empty a last line.
+        with path.open("r", encoding="utf-8", errors="ignore") as fh:
+            return sum(1 for _ in fh)
+    return n
+
+
+def _count_newlines(chunks: Any) -> int | None:
+    """Newline-based line count, or None if the bytes are not valid UTF-8."""
+    import codecs
+
+    n = 0
+    prev_cr = False
+    last = b""
+    decoder = None
+    for chunk in chunks:
+        n += chunk.count(b"\n") + chunk.count(b"\r") - chunk.count(b"\r\n")
+        if prev_cr and chunk[:1] == b"\n":
+            n -= 1  # "\r\n" split across two chunks.
+        last = chunk[-1:]
+        prev_cr = last == b"\r"
+        if decoder is not None or not chunk.isascii():
+            decoder = decoder or codecs.getincrementaldecoder("utf-8")()
+            try:
+                decoder.decode(chunk)
+            except UnicodeDecodeError:
+                return None
+    if decoder is not None:
+        try:
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            return None
+    if last and last not in (b"\n", b"\r"):
+        n += 1
+    return n
+
+
+def _line_counts_by_blob(files: list[str]) -> dict[str, int]:
+    """
+    `{path: line count}` for `files`. Tracked files whose working copy matches
+    the index are looked up by git blob sha in `.agent/cache/line_counts.json`,
+    so unchanged files are never reopened; the rest are counted on a thread pool.
+    """
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    import p0_fs
+    from repo_files import clean_blob_ids
+
+    use_cache = not p0_fs.cache_disabled()
+    cache_path = p0_fs.cache_dir() / "line_counts.json"
+    blobs = (clean_blob_ids() or {}) if use_cache else {}
+    cached: dict[str, int] = {}
+    if use_cache:
+        try:
+            data = _read_json(cache_path)
+            if data.get("version") == LINE_COUNT_CACHE_VERSION and isinstance(data.get("counts"), dict):
+                cached = data["counts"]
+        except Exception:
+            pass  # Missing/corrupt cache: count everything.
+
+    counts: dict[str, int] = {}
+    todo: list[str] = []
     for f in files:
-        p = REPO_ROOT / f
+        sha = blobs.get(f)
+        if sha is not None and isinstance(cached.get(sha), int):
+            counts[f] = cached[sha]
+        else:
+            todo.append(f)
+
+    def _count(f: str) -> tuple[str, int | None]:
         try:
-            n = sum(1 for _ in p.open("r", encoding="utf-8", errors="ignore"))
+            return f, _count_lines(REPO_ROOT / f)
         except Exception:
-            continue
-        scored.append((n, f))
-    scored.sort(key=lambda x: (-x[0], x[1].lower()))
-    return scored[:top_n]
+            return f, None
+
+    with ThreadPoolExecutor() as pool:
+        for f, n in pool.map(_count, todo):
+            if n is not None:
+                counts[f] = n
+
+    if use_cache and blobs:
+        # Keep only blobs of the current tree so the cache never grows unbounded.
+        fresh = {blobs[f]: n for f, n in counts.items() if f in blobs}
+        if fresh != cached:
+            try:
+                p0_fs.atomic_write_text(
+                    cache_path, json.dumps({"version": LINE_COUNT_CACHE_VERSION, "counts": fresh}, sort_keys=True) + "\n"
+                )
+            except OSError:
+                pass
+    return counts
+
+
+def _top_files_by_lines(*, top_n: int = 20) -> list[tuple[int, str]]:
+    # Tracked files only (git index; pruning walk outside git) to avoid node_modules.
+    import heapq
+
+    from repo_files import list_files
+
+    files = sorted(
+        list_files(exts={".ts", ".tsx", ".js", ".mjs"}, untracked=False, prune=frozenset()),
+        key=str.lower,
+    )
+    counts = _line_counts_by_blob(files)
+    scored = ((counts[f], f) for f in files if f in counts)
+    return heapq.nsmallest(top_n, scored, key=lambda x: (-x[0], x[1].lower()))
 
 
 def _extract_openapi_paths(path: Path, *, max_paths: int = 60) -> list[str]:
     if not path.is_file():
         return []
+    import re
+
     paths: list[str] = []
     rx = re.compile(r"^\s{2}(/[^:]+):\s*$")
     for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
@@ -189,12 +736,132 @@ def _extract_openapi_paths(path: Path, *, max_paths: int = 60) -> list[str]:
     return paths
 
 
+def _human_size(n: int) -> str:
+    """`du -h` style: powers of 1024, rounded up, one decimal below 10 (e.g. 4.0K, 12K, 1.6M)."""
+    if n < 1024:
+        return str(n)
+    units = "KMGTPEZY"
+    exp, scale = 1, 1024
+    while n >= scale * 1024 and exp < len(units):
+        exp, scale = exp + 1, scale * 1024
+    tenths = -(-n * 10 // scale)
+    if tenths < 100:
+        return f"{tenths // 10}.{tenths % 10}{units[exp - 1]}"
+    whole = -(-n // scale)
+    if whole >= 1024 and exp < len(units):
+        return f"1.0{units[exp]}"
+    return f"{whole}{units[exp - 1]}"
+
+
+class _PathDesc(str):
+    # Reverse string order, so a min-heap on (size, _PathDesc) evicts the last of equal sizes first.
+    def __lt__(self, other: str) -> bool:
+        return str.__gt__(self, other)
+
+
+class _InventoryWalk(NamedTuple):
+    folder_sizes: list[dict[str, Any]]
+    asset_count: int
+    asset_bytes: int
+    top_assets: list[tuple[int, str]]
+    by_extension: dict[str, list[int]]  # ext -> [files, bytes]
+
+
+def _inventory_walk(
+    folders: tuple[str, ...] = INVENTORY_FOLDERS,
+    asset_roots: tuple[str, ...] = ASSET_ROOTS,
+    *,
+    top_n: int = ASSET_TOP_N,
+) -> _InventoryWalk:
+    """
+    One `os.scandir` pass over `folders` that replaces `du -sh` and the asset scan.
+
+    Folder sizes follow du: allocated blocks of every entry (the folder itself
+    included), symlinks not followed, hard-linked files counted once. Files
+    under `asset_roots` (symlinks resolved, like the old `rglob` + `stat`) feed
+    a bounded top-N heap and per-extension histograms, so memory does not grow
+    with the number of assets.
+    """
+    import heapq
+
+    sizes: list[dict[str, Any]] = []
+    seen_inodes: set[tuple[int, int]] = set()
+    top: list[tuple[int, _PathDesc, str]] = []
+    by_ext: dict[str, list[int]] = {}
+    asset_count = 0
+    asset_bytes = 0
+    for folder in folders:
+        try:
+            total = os.lstat(REPO_ROOT / folder).st_blocks * 512
+        except OSError:
+            continue  # du prints nothing for a missing folder.
+        stack = [(os.fspath(REPO_ROOT / folder), folder, _under_any(folder, asset_roots))]
+        while stack:
+            current, rel, in_assets = stack.pop()
+            try:
+                it = os.scandir(current)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    child = f"{rel}/{entry.name}"
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir or st.st_nlink <= 1 or (st.st_dev, st.st_ino) not in seen_inodes:
+                        if not is_dir and st.st_nlink > 1:
+                            seen_inodes.add((st.st_dev, st.st_ino))
+                        total += st.st_blocks * 512
+                    if is_dir:
+                        stack.append((entry.path, child, in_assets or child in asset_roots))
+                        continue
+                    if not in_assets:
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        size = entry.stat().st_size
+                    except OSError:
+                        continue
+                    asset_count += 1
+                    asset_bytes += size
+                    bucket = by_ext.setdefault(os.path.splitext(entry.name)[1].lower(), [0, 0])
+                    bucket[0] += 1
+                    bucket[1] += size
+                    item = (size, _PathDesc(child.lower()), child)
+                    if len(top) < top_n:
+                        heapq.heappush(top, item)
+                    elif item > top[0]:
+                        heapq.heapreplace(top, item)
+        sizes.append({"size": _human_size(total), "bytes": total, "path": folder})
+    top_assets = [(size, path) for size, _, path in sorted(top, key=lambda x: (-x[0], x[2].lower()))]
+    return _InventoryWalk(sizes, asset_count, asset_bytes, top_assets, by_ext)
+
+
+def _under_any(path: str, roots: tuple[str, ...]) -> bool:
+    return any(path == r or path.startswith(r + "/") for r in roots)
+
+
 def _find_latest_quality_log() -> str | None:
-    root = REPO_ROOT / "test-reports"
-    if not root.is_dir():
+    from closure_index import latest
+
+    found = latest("quality_log")
+    return _safe_rel(found) if found else None
+
+
+def _recent_baseline() -> str | None:
+    from closure_index import latest as latest_artifact
+
+    latest = latest_artifact("baseline")
+    if latest is None:
         return None
-    candidates = sorted(root.glob("quality-gates_*.log"), key=lambda p: p.name)
-    return _safe_rel(candidates[-1]) if candidates else None
+    try:
+        age = max(0.0, (datetime.now(timezone.utc) - datetime.fromtimestamp(latest.stat().st_mtime, timezone.utc)).total_seconds())
+    except Exception:
+        age = BASELINE_REUSE_WINDOW_SECONDS + 1
+    return _safe_rel(latest) if age <= BASELINE_REUSE_WINDOW_SECONDS else None
 
 
 def _baseline_capture() -> str | None:
@@ -202,33 +869,33 @@ def _baseline_capture() -> str | None:
     Return the latest baseline log path, reusing a recent one when possible.
 
     This avoids generating multiple BASELINE_LOG_* files during a single workflow
-    (e.g., session-start + extract).
+    (e.g., session-start + extract). The check-then-capture runs under the
+    `baseline` file lock (shared with baseline_capture.sh), so overlapping runs
+    share a single in-flight capture: late callers wait for it, then reuse it.
     """
-    if CLOSURE_DIR.is_dir():
-        files = sorted(CLOSURE_DIR.glob("BASELINE_LOG_*.md"), key=lambda p: p.name)
-        if files:
-            latest = files[-1]
-            try:
-                age = max(0.0, (datetime.now(timezone.utc) - datetime.fromtimestamp(latest.stat().st_mtime, timezone.utc)).total_seconds())
-            except Exception:
-                age = BASELINE_REUSE_WINDOW_SECONDS + 1
-            if age <= BASELINE_REUSE_WINDOW_SECONDS:
-                return _safe_rel(latest)
+    import re
 
-    # Run baseline capture and parse the created file path from stdout.
-    try:
-        res = _run([".agent/scripts/baseline_capture.sh"], timeout=300)
-    except Exception:
-        return None
-    m = re.search(r"^Wrote:\s+(docs/closure/BASELINE_LOG_[^\s]+\.md)\s*$", res.out, flags=re.M)
-    if m:
-        return m.group(1)
+    import p0_fs
+
+    with p0_fs.file_lock(p0_fs.lock_path("baseline")):
+        recent = _recent_baseline()
+        if recent is not None:
+            return recent
+
+        # Run baseline capture and parse the created file path from stdout.
+        try:
+            res = _run([".agent/scripts/baseline_capture.sh"], timeout=300, env={"P0_BASELINE_LOCK_HELD": "1"})
+        except Exception:
+            return None
+        m = re.search(r"^Wrote:\s+(docs/closure/BASELINE_LOG_[^\s]+\.md)\s*$", res.out, flags=re.M)
+        if m:
+            return m.group(1)
+
+        # Fallback: most recent baseline file (baseline_capture.sh records it in the index).
+        from closure_index import latest
 
-    # Fallback: find most recent baseline file.
-    if CLOSURE_DIR.is_dir():
-        files = sorted(CLOSURE_DIR.glob("BASELINE_LOG_*.md"), key=lambda p: p.name)
-        return _safe_rel(files[-1]) if files else None
-    return None
+        found = latest("baseline")
+        return _safe_rel(found) if found else None
 
 
 def _write(path: Path, content: str) -> None:
@@ -236,26 +903,119 @@ def _write(path: Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
 
 
-def _technical_report(
-    *, include_gates: bool, include_perf: bool, include_supabase_compare: bool, baseline_file: str | None
-) -> tuple[str, str]:
-    date = _ts_date()
-    tm = _ts_time()
-    out_path = REPO_ROOT / "docs" / "closure" / f"TECHNICAL_ANALYSIS_{date}_{tm}.md"
+def _cmd_doc(res: CmdResult) -> dict[str, Any]:
+    return {"cmd": res.cmd, "rc": res.rc, "out": res.out}
+
+
+def _doc_cmd(doc: dict[str, Any]) -> CmdResult:
+    return CmdResult(cmd=doc["cmd"], rc=doc["rc"], out=doc["out"])
 
-    # Baseline evidence (safe) and env audit (names only).
-    env_audit_cmd = [".agent/scripts/env_audit.py", "--format", "markdown"]
-    if include_supabase_compare:
-        env_audit_cmd += ["--with-supabase", "--supabase-scope", "backend-only"]
-    env_audit = _run(env_audit_cmd, timeout=300)
 
-    # Core facts.
-    git_branch = _run(["git", "rev-parse", "--abbrev-ref", "HEAD"], timeout=30)
-    git_head = _run(["git", "rev-parse", "HEAD"], timeout=30)
-    node_v = _run(["node", "-v"], timeout=30)
-    npm_v = _run(["npm", "-v"], timeout=30)
-    pnpm_v = _run(["pnpm", "-v"], timeout=30)
-    supabase_v = _run(["supabase", "--version"], timeout=30) if shutil_which("supabase") else None
+def _collect_technical(
+    *,
+    include_gates: bool,
+    include_perf: bool,
+    include_supabase_compare: bool,
+    baseline_file: str | None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    probes: _ProbeCache | None = None,
+    run_id: str = "",
+) -> dict[str, Any]:
+    """
+    Run the technical probes and return their facts as a JSON-ready dict (see
+    _render_technical). `run_id` is appended to the gates/perf log names.
+    """
+    report_stamp = f"{_ts_date()}_{_ts_time()}"
+
+    if probes is None:
+        probes = _ProbeCache(enabled=False)
+
+    # Independent probes run concurrently; only the perf baseline waits (for
+    # everything else, so it is measured on an otherwise idle machine).
+    tasks: dict[str, _Task] = {
+        # Env audit (names only), in-process and shared with the inventory report.
+        "env_audit": _Task(lambda: _env_audit(include_supabase_compare=include_supabase_compare)[0]),
+        # Core facts.
+        "git_branch": _Task(lambda: _run(["git", "rev-parse", "--abbrev-ref", "HEAD"], timeout=30)),
+        "git_head": _Task(lambda: _run(["git", "rev-parse", "HEAD"], timeout=30)),
+        # Cacheable probes (see PROBE_POLICIES); keys are computed inside the task.
+        "node_v": _Task(lambda: _cmd_probe(probes, "node_v", [probes.tool_key("node")], lambda: _run(["node", "-v"], timeout=30))),
+        "npm_v": _Task(lambda: _cmd_probe(probes, "npm_v", [probes.tool_key("npm")], lambda: _run(["npm", "-v"], timeout=30))),
+        "pnpm_v": _Task(lambda: _cmd_probe(probes, "pnpm_v", [probes.tool_key("pnpm")], lambda: _run(["pnpm", "-v"], timeout=30))),
+        # TODO/FIXME/HACK, JWT-like tokens and console.log: one in-process pass (see _source_scan_rules).
+        "source_scan": _Task(
+            lambda: probes.get_or_run(
+                "source_scan",
+                [
+                    probes.tree_key(["supabase", "minimarket-system/src", "scripts", "tests", "docs", ":(exclude)docs/closure"]),
+                    _source_scan_fingerprint(),
+                ],
+                _source_scan,
+                encode=lambda res: {k: r._asdict() for k, r in res.items()},
+                decode=lambda v: {k: CmdResult(**r) for k, r in v.items()},
+            )
+        ),
+        "top_files": _Task(
+            lambda: probes.get_or_run(
+                "top_files",
+                # Tracked sources only, so untracked reports never invalidate it.
+                [probes.tree_key([f":(glob,icase)**/*{ext}" for ext in (".ts", ".tsx", ".js", ".mjs")], untracked=False)],
+                lambda: _top_files_by_lines(top_n=20),
+                encode=lambda rows: [list(r) for r in rows],
+                decode=lambda rows: [tuple(r) for r in rows],
+            )
+        ),
+        "tests_count": _Task(
+            lambda: probes.get_or_run("tests_count", [probes.tree_key(["tests", "minimarket-system/src"])], _count_tests)
+        ),
+        "openapi_paths": _Task(
+            lambda: probes.get_or_run(
+                "openapi_paths",
+                [probes.tree_key(["docs/api-openapi-3.1.yaml"])],
+                lambda: _extract_openapi_paths(REPO_ROOT / "docs" / "api-openapi-3.1.yaml"),
+            )
+        ),
+        "openapi_prov_paths": _Task(
+            lambda: probes.get_or_run(
+                "openapi_prov_paths",
+                [probes.tree_key(["docs/api-proveedor-openapi-3.1.yaml"])],
+                lambda: _extract_openapi_paths(REPO_ROOT / "docs" / "api-proveedor-openapi-3.1.yaml"),
+            )
+        ),
+    }
+    if shutil_which("supabase"):
+        tasks["supabase_v"] = _Task(
+            lambda: _cmd_probe(
+                probes, "supabase_v", [probes.tool_key("supabase")], lambda: _run(["supabase", "--version"], timeout=30)
+            )
+        )
+    stamp = _utc_now().strftime("%Y%m%d-%H%M%S") + (f"_{run_id}" if run_id else "")
+    gates_log = REPO_ROOT / "test-reports" / f"quality-gates_{stamp}.log"
+    perf_log = REPO_ROOT / "test-reports" / f"perf-baseline_{stamp}.log"
+    if include_gates:
+        # Run full gates; quality_gates.sh tees its own log, so only keep the tail here.
+        tasks["gates"] = _Task(
+            lambda: _run_streaming(
+                [".agent/scripts/quality_gates.sh", "all"],
+                timeout=60 * 60,
+                label="gates",
+                env={"QUALITY_GATES_LOG": _safe_rel(gates_log)},
+                progress_prefixes=("==> ", "Quality gates:"),
+            )
+        )
+    if include_perf and (REPO_ROOT / "scripts" / "perf-baseline.mjs").is_file():
+        tasks["perf"] = _Task(
+            lambda: _run_streaming(
+                ["node", "scripts/perf-baseline.mjs", "5"],
+                timeout=600,
+                label="perf",
+                log_path=perf_log,
+                head_chars=PERF_HEAD_CHARS,
+                tail_chars=PERF_TAIL_CHARS,
+            ),
+            deps=tuple(tasks),
+        )
+    results = _run_dag(tasks, concurrency=concurrency)
 
     pkg = _read_json(REPO_ROOT / "package.json")
     fe_pkg = _read_json(REPO_ROOT / "minimarket-system" / "package.json") if (REPO_ROOT / "minimarket-system" / "package.json").is_file() else {}
@@ -264,88 +1024,121 @@ def _technical_report(
     # Exclude non-functions folders.
     edge_functions = [n for n in edge_functions if n not in {"_shared"}]
 
-    openapi_paths = _extract_openapi_paths(REPO_ROOT / "docs" / "api-openapi-3.1.yaml")
-    openapi_prov_paths = _extract_openapi_paths(REPO_ROOT / "docs" / "api-proveedor-openapi-3.1.yaml")
+    scan = results["source_scan"]
+    jwt_files = [f.strip() for f in scan["forbidden_jwt"].out.splitlines() if f.strip()]
+    jwt_code = [f for f in jwt_files if f.startswith(("supabase/functions/", "minimarket-system/src/", "scripts/"))]
+    jwt_tests = [f for f in jwt_files if f.startswith(("tests/",))]
+    console_files = [f for f in scan["forbidden_console"].out.splitlines() if f.strip()]
 
-    tests_count = _count_tests()
-    todos = _run(
-        [
-            "rg",
-            "-n",
-            "(TODO|FIXME|HACK)",
-            "supabase",
-            "minimarket-system/src",
-            "scripts",
-            "tests",
-            "docs",
-            "--glob",
-            "!docs/closure/**",
-        ],
-        timeout=180,
-    )
-    todos_preview = "\n".join(todos.out.splitlines()[:80])
+    gates_rc = results["gates"].rc if include_gates else None
+    latest_quality_log = _safe_rel(gates_log) if include_gates and gates_log.is_file() else _find_latest_quality_log()
+    perf_res = results.get("perf")
+    if perf_res is not None and perf_log.is_file():
+        from closure_index import record
 
-    top_files = _top_files_by_lines(top_n=20)
+        record("perf_log", perf_log)
 
-    # Detect JWT-like tokens by filename only; keep regex tight to reduce false positives.
-    forbidden_jwt = _run(
-        [
-            "rg",
-            "-l",
-            "-e",
-            r"ey[A-Za-z0-9\-_=]{20,}",
-            "--glob",
-            "*.ts",
-            "--glob",
-            "*.tsx",
-            "--glob",
-            "*.js",
-            "--glob",
-            "*.mjs",
-            "supabase/functions",
-            "minimarket-system/src",
-            "scripts",
-            "tests",
-        ],
-        timeout=180,
-    )
-    forbidden_console = _run(["rg", "-l", r"console\.log", "supabase/functions"], timeout=120)
-
-    gates_rc = None
-    if include_gates:
-        # Run full gates; quality_gates.sh writes a log file.
-        gates = _run([".agent/scripts/quality_gates.sh", "all"], timeout=60 * 60)
-        gates_rc = gates.rc
+    mig_files = sorted((REPO_ROOT / "supabase" / "migrations").glob("*.sql"), key=lambda p: p.name)
 
-    perf_res = None
-    if include_perf and (REPO_ROOT / "scripts" / "perf-baseline.mjs").is_file():
-        perf_res = _run(["node", "scripts/perf-baseline.mjs", "5"], timeout=600)
+    blockers: list[dict[str, str]] = []
+    if include_gates and gates_rc not in (None, 0):
+        blockers.append(
+            {
+                "id": "gates_failed",
+                "severity": "critical",
+                "message": f"❌ Quality gates fallan (ver `{latest_quality_log or 'test-reports/quality-gates_*.log'}`)",
+            }
+        )
+    if jwt_code:
+        blockers.append(
+            {
+                "id": "jwt_in_code",
+                "severity": "critical",
+                "message": "🔥 Posibles JWTs hardcodeados detectados en CÓDIGO (filenames list arriba) (CRÍTICO)",
+            }
+        )
+    elif jwt_tests:
+        blockers.append(
+            {
+                "id": "jwt_in_tests",
+                "severity": "warning",
+                "message": "⚠️ JWT-like strings detectados solo en tests (probable fixture). Revisar para evitar leaks accidentales.",
+            }
+        )
 
-    latest_quality_log = _find_latest_quality_log()
+    return {
+        "stamp": report_stamp,
+        "generated_at": _utc_now().strftime("%Y-%m-%d %H:%M:%S"),
+        "repo": _safe_rel(REPO_ROOT),
+        "baseline_file": baseline_file,
+        "git": {"branch": results["git_branch"].out.strip(), "commit": results["git_head"].out.strip()},
+        "stack": {
+            "package_name": pkg.get("name", "n/a"),
+            "frontend_package_name": fe_pkg.get("name", "minimarket-system"),
+            "node": results["node_v"].out.strip(),
+            "npm": results["npm_v"].out.strip(),
+            "pnpm": results["pnpm_v"].out.strip(),
+            "supabase": results["supabase_v"].out.strip() if "supabase_v" in results else None,
+        },
+        "edge_functions": edge_functions,
+        "openapi_paths": {"api_minimarket": results["openapi_paths"], "api_proveedor": results["openapi_prov_paths"]},
+        "todos": scan["todos"].out.splitlines()[:80],
+        "top_files": [{"lines": n, "path": f} for n, f in results["top_files"]],
+        "forbidden": {
+            "jwt": {
+                "status": "code" if jwt_code else ("tests" if jwt_tests else "none"),
+                "files": jwt_files,
+            },
+            "console_log": {"files": console_files},
+        },
+        "tests_count": results["tests_count"],
+        "gates": {"ran": include_gates, "rc": gates_rc, "log": latest_quality_log},
+        "perf": (
+            {**_cmd_doc(perf_res), "log": _safe_rel(perf_log) if perf_log.is_file() else None}
+            if perf_res is not None
+            else None
+        ),
+        "env_audit": _cmd_doc(results["env_audit"]),
+        "migrations": {"count": len(mig_files), "latest": _safe_rel(mig_files[-1]) if mig_files else None},
+        "blockers": blockers,
+    }
+
+
+def _render_technical(doc: dict[str, Any]) -> str:
+    stack = doc["stack"]
+    edge_functions = doc["edge_functions"]
+    openapi_paths = doc["openapi_paths"]["api_minimarket"]
+    openapi_prov_paths = doc["openapi_paths"]["api_proveedor"]
+    todos_preview = "\n".join(doc["todos"])
+    top_files = doc["top_files"]
+    jwt = doc["forbidden"]["jwt"]
+    console_files = doc["forbidden"]["console_log"]["files"]
+    tests_count = doc["tests_count"]
+    gates = doc["gates"]
 
     lines: list[str] = []
     lines.append("# MISIÓN: ANÁLISIS TÉCNICO INTEGRAL DEL PROYECTO")
     lines.append("")
-    lines.append(f"- Fecha (UTC): `{_utc_now().strftime('%Y-%m-%d %H:%M:%S')}`")
-    lines.append(f"- Repo: `{_safe_rel(REPO_ROOT)}`")
-    lines.append(f"- Branch: `{git_branch.out.strip()}`")
-    lines.append(f"- Commit: `{git_head.out.strip()}`")
-    if baseline_file:
-        lines.append(f"- Baseline log (safe): `{baseline_file}`")
+    lines.append(f"- Fecha (UTC): `{doc['generated_at']}`")
+    lines.append(f"- Repo: `{doc['repo']}`")
+    lines.append(f"- Branch: `{doc['git']['branch']}`")
+    lines.append(f"- Commit: `{doc['git']['commit']}`")
+    if doc["baseline_file"]:
+        lines.append(f"- Baseline log (safe): `{doc['baseline_file']}`")
     lines.append("")
 
     lines.append("## 1. ARQUITECTURA Y ESTRUCTURA DEL PROYECTO")
     lines.append("")
     lines.append("### A. Información General")
     lines.append("")
-    lines.append(f"- Nombre (package.json): `{pkg.get('name', 'n/a')}`")
+    lines.append(f"- Nombre (package.json): `{stack['package_name']}`")
     lines.append("- Tipo: fullstack (React/Vite frontend + Supabase Edge Functions backend + Postgres/Supabase)")
     lines.append("- Stack (alto nivel):")
-    lines.append(f"  - Node: `{node_v.out.strip()}` | npm: `{npm_v.out.strip()}` | pnpm: `{pnpm_v.out.strip()}`")
-    if supabase_v:
-        lines.append(f"  - Supabase CLI: `{supabase_v.out.strip()}`")
+    lines.append(f"  - Node: `{stack['node']}` | npm: `{stack['npm']}` | pnpm: `{stack['pnpm']}`")
+    if stack["supabase"] is not None:
+        lines.append(f"  - Supabase CLI: `{stack['supabase']}`")
     lines.append(f"- Root package deps (high-signal): `vitest`, `@supabase/supabase-js`, `@tanstack/react-query`")
-    lines.append(f"- Frontend deps (high-signal): `{fe_pkg.get('name','minimarket-system')}` (ver `minimarket-system/package.json`)")
+    lines.append(f"- Frontend deps (high-signal): `{stack['frontend_package_name']}` (ver `minimarket-system/package.json`)")
     lines.append("")
 
     lines.append("### B. Componentes Principales")
@@ -374,31 +1167,24 @@ def _technical_report(
         lines.append("")
         lines.append("| Lines | File |")
         lines.append("|---:|---|")
-        for n, f in top_files:
-            lines.append(f"| {n} | `{f}` |")
+        for row in top_files:
+            lines.append(f"| {row['lines']} | `{row['path']}` |")
         lines.append("")
 
     lines.append("### B. Patrones prohibidos (seguridad/higiene)")
     lines.append("")
-    jwt_files = [f.strip() for f in forbidden_jwt.out.splitlines() if f.strip()]
-    jwt_code = [f for f in jwt_files if f.startswith(("supabase/functions/", "minimarket-system/src/", "scripts/"))]
-    jwt_tests = [f for f in jwt_files if f.startswith(("tests/",))]
-    jwt_status = "✅ none"
-    if jwt_code:
-        jwt_status = "🔥 FOUND (code)"
-    elif jwt_tests:
-        jwt_status = "⚠️ FOUND (tests only)"
+    jwt_files = jwt["files"]
+    jwt_status = {"code": "🔥 FOUND (code)", "tests": "⚠️ FOUND (tests only)"}.get(jwt["status"], "✅ none")
     lines.append(f"- Posibles JWT hardcodeados (filenames only): {jwt_status}")
-    if forbidden_jwt.out.strip():
+    if jwt_files:
         lines.append("  - Files:")
         for f in jwt_files[:20]:
             lines.append(f"    - `{f}`")
         if len(jwt_files) > 20:
             lines.append(f"    - ... ({len(jwt_files) - 20} more)")
-    lines.append(f"- console.log en backend (filenames only): {'✅ none' if forbidden_console.rc == 1 or not forbidden_console.out.strip() else '⚠️ FOUND'}")
-    if forbidden_console.out.strip():
-        for f in forbidden_console.out.splitlines()[:20]:
-            lines.append(f"  - `{f}`")
+    lines.append(f"- console.log en backend (filenames only): {'⚠️ FOUND' if console_files else '✅ none'}")
+    for f in console_files[:20]:
+        lines.append(f"  - `{f}`")
     lines.append("")
 
     lines.append("## 3. TESTING Y CALIDAD")
@@ -413,25 +1199,29 @@ def _technical_report(
 
     lines.append("### B. Ejecución de tests / gates")
     lines.append("")
-    if include_gates:
-        status = "✅ PASS" if gates_rc == 0 else f"❌ FAIL (exit {gates_rc})"
+    if gates["ran"]:
+        status = "✅ PASS" if gates["rc"] == 0 else f"❌ FAIL (exit {gates['rc']})"
         lines.append(f"- Quality gates: {status}")
-        if latest_quality_log:
-            lines.append(f"- Log: `{latest_quality_log}`")
+        if gates["log"]:
+            lines.append(f"- Log: `{gates['log']}`")
     else:
         lines.append("- Quality gates: (skipped) re-run with `--with-gates`.")
     lines.append("")
 
-    if perf_res is not None:
+    if doc["perf"] is not None:
         lines.append("## 4. PERFORMANCE (baseline)")
         lines.append("")
-        lines.append(_md_cmd(perf_res, max_chars=6000))
+        if doc["perf"]["log"]:
+            lines.append(f"- Log: `{doc['perf']['log']}`")
+            lines.append("")
+        # Older/oversized captures still keep their ending (summary, timeout marker).
+        lines.append(_md_cmd(_doc_cmd(doc["perf"]), max_chars=PERF_RENDER_CHARS, tail_chars=PERF_TAIL_CHARS))
 
     lines.append("## 5. CONFIGURACIÓN Y ENTORNO")
     lines.append("")
     lines.append("### A. Variables de entorno (names only)")
     lines.append("")
-    lines.append(_md_cmd(env_audit, max_chars=8000))
+    lines.append(_md_cmd(_doc_cmd(doc["env_audit"]), max_chars=8000))
 
     lines.append("## 6. DOCUMENTACIÓN ACTUAL")
     lines.append("")
@@ -448,73 +1238,33 @@ def _technical_report(
 
     lines.append("## 8. BASE DE DATOS Y DATOS")
     lines.append("")
-    mig_dir = REPO_ROOT / "supabase" / "migrations"
-    mig_files = sorted(mig_dir.glob("*.sql"), key=lambda p: p.name)
-    lines.append(f"- Migrations en repo: `{len(mig_files)}` (`supabase/migrations/`)")
-    if mig_files:
-        lines.append(f"- Última migración: `{_safe_rel(mig_files[-1])}`")
+    lines.append(f"- Migrations en repo: `{doc['migrations']['count']}` (`supabase/migrations/`)")
+    if doc["migrations"]["latest"]:
+        lines.append(f"- Última migración: `{doc['migrations']['latest']}`")
     lines.append("")
 
     lines.append("## 🔥 Issues críticos que bloquean producción (autodetect)")
     lines.append("")
-    blockers: list[str] = []
-    if include_gates and gates_rc not in (None, 0):
-        blockers.append(f"- ❌ Quality gates fallan (ver `{latest_quality_log or 'test-reports/quality-gates_*.log'}`)")
-    if jwt_code:
-        blockers.append("- 🔥 Posibles JWTs hardcodeados detectados en CÓDIGO (filenames list arriba) (CRÍTICO)")
-    elif jwt_tests:
-        blockers.append("- ⚠️ JWT-like strings detectados solo en tests (probable fixture). Revisar para evitar leaks accidentales.")
-    if not blockers:
-        blockers.append("- (none detected by automation; revisar planes: SendGrid/Secret rotation/Sentry)")
-    lines.extend(blockers)
+    if doc["blockers"]:
+        lines.extend(f"- {b['message']}" for b in doc["blockers"])
+    else:
+        lines.append("- (none detected by automation; revisar planes: SendGrid/Secret rotation/Sentry)")
     lines.append("")
+    return "\n".join(lines)
 
-    _write(out_path, "\n".join(lines))
-    return (_safe_rel(out_path), latest_quality_log or "")
 
+def _collect_inventory(*, include_supabase_compare: bool, baseline_file: str | None) -> dict[str, Any]:
+    """Inventory facts as a JSON-ready dict (see _render_inventory)."""
+    stamp = f"{_ts_date()}_{_ts_time()}"
 
-def _inventory_report(*, include_supabase_compare: bool, baseline_file: str | None) -> str:
-    date = _ts_date()
-    tm = _ts_time()
-    out_path = REPO_ROOT / "docs" / "closure" / f"INVENTORY_REPORT_{date}_{tm}.md"
+    env_audit, env_audit_names = _env_audit(include_supabase_compare=include_supabase_compare)
 
-    env_audit_cmd = [".agent/scripts/env_audit.py", "--format", "markdown"]
-    if include_supabase_compare:
-        env_audit_cmd += ["--with-supabase", "--supabase-scope", "backend-only"]
-    env_audit = _run(env_audit_cmd, timeout=300)
-
-    # Project size summary (avoid node_modules explosion).
-    du_cmds = [
-        ["du", "-sh", ".agent"],
-        ["du", "-sh", "docs"],
-        ["du", "-sh", "supabase"],
-        ["du", "-sh", "tests"],
-        ["du", "-sh", "scripts"],
-        ["du", "-sh", "minimarket-system"],
-    ]
-    du_results = []
-    for c in du_cmds:
-        if shutil_which("du"):
-            du_results.append(_run(c, timeout=60))
-
-    # Assets inventory (best-effort).
-    assets = []
-    for root in [REPO_ROOT / "minimarket-system" / "public", REPO_ROOT / "minimarket-system" / "src" / "assets"]:
-        if root.is_dir():
-            for p in root.rglob("*"):
-                if p.is_file():
-                    assets.append((_safe_rel(p), p.stat().st_size))
-    assets.sort(key=lambda x: (-x[1], x[0].lower()))
-
-    # Integrations signals from env audit used-in-code missing list (names only).
-    used_missing_env_example = []
-    for line in env_audit.out.splitlines():
-        m = re.match(r"^- `([A-Z0-9_]+)`$", line.strip())
-        if m:
-            used_missing_env_example.append(m.group(1))
+    # Folder sizes (du -sh equivalent) and the asset inventory, in one walk.
+    walk = _inventory_walk()
 
+    # Integrations signals from the names listed by the env audit (names only).
     integrations = []
-    for key in used_missing_env_example:
+    for key in env_audit_names:
         if "SENDGRID" in key or "SMTP_" in key:
             integrations.append("SendGrid (SMTP)")
         if key.startswith("TWILIO_"):
@@ -523,44 +1273,66 @@ def _inventory_report(*, include_supabase_compare: bool, baseline_file: str | No
             integrations.append("Slack (webhook)")
         if key.startswith("VITE_SENTRY_") or key == "VITE_SENTRY_DSN":
             integrations.append("Sentry")
-    integrations = sorted(set(integrations))
 
+    return {
+        "stamp": stamp,
+        "generated_at": _utc_now().strftime("%Y-%m-%d %H:%M:%S"),
+        "repo": _safe_rel(REPO_ROOT),
+        "baseline_file": baseline_file,
+        "folder_sizes": walk.folder_sizes,
+        "assets": {
+            "count": walk.asset_count,
+            "bytes": walk.asset_bytes,
+            "top": [{"bytes": sz, "path": rel} for sz, rel in walk.top_assets],
+            "by_extension": [
+                {"ext": ext, "files": files, "bytes": nbytes}
+                for ext, (files, nbytes) in sorted(walk.by_extension.items(), key=lambda kv: (-kv[1][1], kv[0]))
+            ],
+        },
+        "integrations": sorted(set(integrations)),
+        "env_audit": {**_cmd_doc(env_audit), "names": env_audit_names},
+    }
+
+
+def _render_inventory(doc: dict[str, Any]) -> str:
     lines: list[str] = []
     lines.append("# MISIÓN: INVENTARIO COMPLETO DE RECURSOS DEL PROYECTO")
     lines.append("")
-    lines.append(f"- Fecha (UTC): `{_utc_now().strftime('%Y-%m-%d %H:%M:%S')}`")
-    lines.append(f"- Repo: `{_safe_rel(REPO_ROOT)}`")
-    if baseline_file:
-        lines.append(f"- Baseline log (safe): `{baseline_file}`")
+    lines.append(f"- Fecha (UTC): `{doc['generated_at']}`")
+    lines.append(f"- Repo: `{doc['repo']}`")
+    if doc["baseline_file"]:
+        lines.append(f"- Baseline log (safe): `{doc['baseline_file']}`")
     lines.append("")
 
     lines.append("## 1. RECURSOS DEL PROYECTO")
     lines.append("")
     lines.append("### A. Archivos y Assets")
     lines.append("")
-    if du_results:
+    if doc["folder_sizes"]:
         lines.append("- Tamaño por carpeta (aprox):")
         lines.append("")
         lines.append("| Size | Path |")
         lines.append("|---:|---|")
-        for r in du_results:
-            # du output: "<size>\t<path>"
-            first = r.out.strip().splitlines()[:1]
-            if first:
-                parts = first[0].split()
-                if parts:
-                    size = parts[0]
-                    path = parts[-1]
-                    lines.append(f"| {size} | `{path}` |")
+        for row in doc["folder_sizes"]:
+            lines.append(f"| {row['size']} | `{row['path']}` |")
         lines.append("")
 
-    lines.append(f"- Assets detectados (best-effort): `{len(assets)}` (top 20 por tamaño)")
-    if assets:
+    assets = doc["assets"]
+    lines.append(f"- Assets detectados (best-effort): `{assets['count']}` (top {ASSET_TOP_N} por tamaño)")
+    if assets["top"]:
         lines.append("")
         lines.append("| Bytes | Asset |")
         lines.append("|---:|---|")
-        for rel, sz in assets[:20]:
-            lines.append(f"| {sz} | `{rel}` |")
+        for row in assets["top"]:
+            lines.append(f"| {row['bytes']} | `{row['path']}` |")
+        lines.append("")
+    if assets["by_extension"]:
+        lines.append(f"- Assets por extensión (total: `{assets['bytes']}` bytes):")
+        lines.append("")
+        lines.append("| Ext | Files | Bytes |")
+        lines.append("|---|---:|---:|")
+        for row in assets["by_extension"]:
+            lines.append(f"| `{row['ext'] or '(sin extensión)'}` | {row['files']} | {row['bytes']} |")
         lines.append("")
 
     lines.append("### B. Configuraciones")
@@ -579,8 +1351,8 @@ def _inventory_report(*, include_supabase_compare: bool, baseline_file: str | No
 
     lines.append("## 3. INTEGRACIONES Y SERVICIOS EXTERNOS (signals)")
     lines.append("")
-    if integrations:
-        for it in integrations:
+    if doc["integrations"]:
+        for it in doc["integrations"]:
             lines.append(f"- {it}")
     else:
         lines.append("- (no signals detected)")
@@ -618,10 +1390,21 @@ def _inventory_report(*, include_supabase_compare: bool, baseline_file: str | No
 
     lines.append("## Appendix: Env Audit (names only)")
     lines.append("")
-    lines.append(_md_cmd(env_audit, max_chars=9000))
+    lines.append(_md_cmd(_doc_cmd(doc["env_audit"]), max_chars=9000))
+
+    return "\n".join(lines)
+
 
-    _write(out_path, "\n".join(lines))
-    return _safe_rel(out_path)
+def _extraction_document(
+    technical: dict[str, Any] | None, inventory: dict[str, Any] | None, reports: dict[str, str | None]
+) -> dict[str, Any]:
+    return {
+        "schema_version": EXTRACTION_SCHEMA_VERSION,
+        "generated_at": _utc_now().strftime("%Y-%m-%d %H:%M:%S"),
+        "reports": reports,
+        "technical": technical,
+        "inventory": inventory,
+    }
 
 
 def shutil_which(exe: str) -> str | None:
@@ -631,6 +1414,8 @@ def shutil_which(exe: str) -> str | None:
 
 
 def main(argv: list[str]) -> int:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Generate extraction reports for production hardening")
     parser.add_argument(
         "--mode",
@@ -638,6 +1423,12 @@ def main(argv: list[str]) -> int:
         default="both",
         help="Which report(s) to generate (default: both).",
     )
+    parser.add_argument(
+        "--format",
+        choices=["markdown", "json", "both"],
+        default="markdown",
+        help="markdown: TECHNICAL_ANALYSIS/INVENTORY_REPORT .md (default); json: one EXTRACTION_*.json document; both: all of them.",
+    )
     parser.add_argument("--with-gates", action="store_true", help="Run full quality gates (may take time).")
     parser.add_argument("--with-perf", action="store_true", help="Run perf baseline script if present.")
     parser.add_argument(
@@ -645,6 +1436,17 @@ def main(argv: list[str]) -> int:
         action="store_true",
         help="Compare env usage with Supabase secrets (names only). Requires supabase CLI auth.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Max commands run at once for the technical report (default: {DEFAULT_CONCURRENCY}; 1 = serial).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-run every probe and leave .agent/cache/extract_probes.json untouched.",
+    )
     args = parser.parse_args(argv)
 
     # Always ensure bootstrap is ok (idempotent, safe).
@@ -652,18 +1454,53 @@ def main(argv: list[str]) -> int:
 
     baseline_file = _baseline_capture()
 
+    import secrets
+
+    from closure_index import record as record_artifact
+
+    run_stamp = f"{_ts_date()}_{_ts_time()}"
+    run_id = secrets.token_hex(3)
+    run_dir = RUNS_DIR / f"{run_stamp}_{run_id}"
+    markdown = args.format in ("markdown", "both")
     created: list[str] = []
+    reports: dict[str, str | None] = {"technical": None, "inventory": None}
+    probes = _ProbeCache(enabled=not args.no_cache)
+    technical: dict[str, Any] | None = None
+    inventory: dict[str, Any] | None = None
     if args.mode in ("technical", "both"):
-        tech_path, _ = _technical_report(
+        technical = _collect_technical(
             include_gates=args.with_gates,
             include_perf=args.with_perf,
             include_supabase_compare=args.with_supabase,
             baseline_file=baseline_file,
+            concurrency=args.concurrency,
+            probes=probes,
+            run_id=run_id,
         )
-        created.append(tech_path)
+        probes.save()
+        if probes.enabled:
+            print(f"[extract] probe cache: {probes.hits} hit(s), {probes.misses} miss(es)", file=sys.stderr)
+        if markdown:
+            path = run_dir / f"TECHNICAL_ANALYSIS_{technical['stamp']}.md"
+            _write(path, _render_technical(technical))
+            record_artifact("technical", path)
+            reports["technical"] = _safe_rel(path)
+            created.append(reports["technical"])
     if args.mode in ("inventory", "both"):
-        inv_path = _inventory_report(include_supabase_compare=args.with_supabase, baseline_file=baseline_file)
-        created.append(inv_path)
+        inventory = _collect_inventory(include_supabase_compare=args.with_supabase, baseline_file=baseline_file)
+        if markdown:
+            path = run_dir / f"INVENTORY_REPORT_{inventory['stamp']}.md"
+            _write(path, _render_inventory(inventory))
+            record_artifact("inventory", path)
+            reports["inventory"] = _safe_rel(path)
+            created.append(reports["inventory"])
+    if args.format in ("json", "both"):
+        import json
+
+        path = run_dir / f"EXTRACTION_{run_stamp}.json"
+        _write(path, json.dumps(_extraction_document(technical, inventory, reports), ensure_ascii=False, indent=2) + "\n")
+        record_artifact("extraction", path)
+        created.append(_safe_rel(path))
 
     for p in created:
         print(p)
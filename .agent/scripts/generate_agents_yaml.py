@@ -3,35 +3,25 @@
 Generate `agents/openai.yaml` UI metadata for all Protocol Zero skills.
 
 This makes skills show up nicely in Codex UIs (display_name + default_prompt).
-Idempotent: won't overwrite unless --overwrite is provided.
+Idempotent: won't overwrite unless --overwrite is provided, and even then a file
+is only rewritten (atomically) when its content would change, so mtimes stay put.
+
+Hashes of each skill's payload and of the file written for it are kept in the
+P0 cache dir; when both still match, the YAML isn't rendered at all. `--check`
+reports the files a run with the same flags would write and exits 1 if any.
 """
 
 from __future__ import annotations
 
-import argparse
 import os
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 SKILLS_ROOT = REPO_ROOT / ".agent" / "skills"
-
-
-def _parse_frontmatter(skill_md: Path) -> dict[str, Any]:
-    raw = skill_md.read_text(encoding="utf-8")
-    lines = raw.splitlines()
-    if not lines or lines[0].strip() != "---":
-        return {}
-    try:
-        end = lines[1:].index("---") + 1
-    except ValueError:
-        return {}
-    block = "\n".join(lines[1:end])
-    meta = yaml.safe_load(block) or {}
-    return meta if isinstance(meta, dict) else {}
+# Bump whenever rendering changes (invalidates the stored hashes).
+MANIFEST_VERSION = 1
 
 
 def _shorten(text: str, n: int) -> str:
@@ -64,43 +54,137 @@ DEFAULT_PROMPTS: dict[str, str] = {
 }
 
 
+def _payload(info: Any) -> dict[str, Any]:
+    name = info.name if isinstance(info.name, str) else info.skill
+    desc = info.description if isinstance(info.description, str) else ""
+    prompt = DEFAULT_PROMPTS.get(info.skill) or f"Use the {name} skill for this repository. Follow SKILL.md and respect guardrails."
+    return {
+        "interface": {
+            "display_name": str(name),
+            "short_description": _shorten(str(desc), 90) if desc else f"Protocol Zero skill: {name}",
+            "default_prompt": str(prompt),
+        }
+    }
+
+
+def _render(payload: dict[str, Any]) -> bytes:
+    import yaml
+
+    return yaml.safe_dump(payload, sort_keys=False).encode("utf-8")
+
+
+def _sha256(data: bytes) -> str:
+    import hashlib
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def _manifest_path() -> Path:
+    import hashlib
+
+    import p0_fs
+
+    tag = hashlib.sha1(os.fspath(SKILLS_ROOT.resolve()).encode("utf-8")).hexdigest()[:12]
+    return p0_fs.cache_dir() / f"agents_yaml.{tag}.json"
+
+
+def _load_manifest() -> dict[str, Any]:
+    import json
+
+    import p0_fs
+
+    if p0_fs.cache_disabled():
+        return {}
+    try:
+        data = json.loads(_manifest_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION or not isinstance(data.get("skills"), dict):
+        return {}
+    return data["skills"]
+
+
+def _save_manifest(skills: dict[str, Any]) -> None:
+    import json
+
+    import p0_fs
+
+    if p0_fs.cache_disabled():
+        return
+    try:
+        payload = {"version": MANIFEST_VERSION, "skills": skills}
+        p0_fs.atomic_write_text(_manifest_path(), json.dumps(payload, ensure_ascii=True, sort_keys=True) + "\n")
+    except OSError:
+        pass  # Read-only checkout: stay uncached.
+
+
 def main(argv: list[str]) -> int:
+    import argparse
+    import json
+    import stat
+    import sys
+
+    import p0_fs
+    import skills_catalog
+
     parser = argparse.ArgumentParser(description="Generate agents/openai.yaml for Protocol Zero skills")
     parser.add_argument("--overwrite", action="store_true", help="Overwrite existing agents/openai.yaml")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Write nothing; list the files this run would write and exit 1 if there are any.",
+    )
     args = parser.parse_args(argv)
 
     if not SKILLS_ROOT.is_dir():
         raise SystemExit(f"Missing skills root: {SKILLS_ROOT}")
 
-    for skill_dir in sorted(SKILLS_ROOT.iterdir(), key=lambda p: p.name.lower()):
-        if not skill_dir.is_dir() or skill_dir.name.startswith("."):
+    manifest = _load_manifest()
+    fresh: dict[str, Any] = {}
+    drift: list[str] = []
+    skills = skills_catalog.load(SKILLS_ROOT)
+    for info in skills.values():
+        out_path = SKILLS_ROOT / info.skill / "agents" / "openai.yaml"
+        if not args.overwrite and out_path.exists():
             continue
-        skill_md = skill_dir / "SKILL.md"
-        if not skill_md.is_file():
+        try:
+            current: bytes | None = out_path.read_bytes()
+        except FileNotFoundError:
+            current = None
+
+        payload = _payload(info)
+        payload_sha = _sha256(json.dumps(payload, ensure_ascii=True, sort_keys=True).encode("utf-8"))
+        stored = manifest.get(info.skill) or {}
+        if current is not None and stored.get("payload") == payload_sha and stored.get("file") == _sha256(current):
+            fresh[info.skill] = stored
+            continue  # Same payload, file untouched since we wrote it.
+
+        rendered = _render(payload)
+        entry = {"payload": payload_sha, "file": _sha256(rendered)}
+        if rendered == current:
+            fresh[info.skill] = entry
             continue
-
-        meta = _parse_frontmatter(skill_md)
-        name = meta.get("name") if isinstance(meta.get("name"), str) else skill_dir.name
-        desc = meta.get("description") if isinstance(meta.get("description"), str) else ""
-
-        agents_dir = skill_dir / "agents"
-        agents_dir.mkdir(parents=True, exist_ok=True)
-        out_path = agents_dir / "openai.yaml"
-
-        if out_path.exists() and not args.overwrite:
+        rel = out_path.relative_to(REPO_ROOT).as_posix()
+        if args.check:
+            drift.append(rel)
+            print(f"DRIFT: {rel} ({'missing' if current is None else 'differs from generated'})")
             continue
-
-        prompt = DEFAULT_PROMPTS.get(skill_dir.name) or f"Use the {name} skill for this repository. Follow SKILL.md and respect guardrails."
-
-        payload = {
-            "interface": {
-                "display_name": str(name),
-                "short_description": _shorten(str(desc), 90) if desc else f"Protocol Zero skill: {name}",
-                "default_prompt": str(prompt),
-            }
-        }
-        out_path.write_text(yaml.safe_dump(payload, sort_keys=False), encoding="utf-8")
-
+        # Keep an existing file's permissions; new ones get what write_text() would (umask).
+        mode = stat.S_IMODE(out_path.stat().st_mode) if current is not None else p0_fs.new_file_mode()
+        p0_fs.atomic_write_bytes(out_path, rendered, mode=mode)
+        fresh[info.skill] = entry
+        print(f"Wrote: {rel}")
+
+    if args.check:
+        if drift:
+            print(f"FAIL: {len(drift)} agents/openai.yaml file(s) out of date", file=sys.stderr)
+            return 1
+        print("OK: agents/openai.yaml files are up to date")
+        return 0
+
+    updated = {k: v for k, v in {**manifest, **fresh}.items() if k in skills}
+    if updated != manifest:
+        _save_manifest(updated)
     return 0
 
 
@@ -5,13 +5,27 @@ Idempotently install a recommended set of curated OpenAI skills into $CODEX_HOME
 Why:
 - Skill installer script aborts if destination already exists.
 - This wrapper only installs missing skills and is safe to run repeatedly.
+
+Skills are installed from a local content-addressed mirror (`--mirror`, default
+$P0_SKILLS_MIRROR or `<P0 cache dir>/skills-mirror`):
+
+  objects/<sha256>.tar.gz         one tarball per skill, named by its content
+  refs/<sha256(repo, ref, path)>  JSON pointer: repo/ref/path -> object
+
+Only artifacts missing from the mirror are downloaded (one GitHub archive per
+repo/ref, not one per skill); `--offline` forbids that and `--refresh` forces
+it. A skill whose download failed or that the archive lacks gets a "missing" ref
+instead, and is not retried for MISS_TTL_S (bootstrap.sh runs this before most
+`p0.sh` commands, which must not each wait on the network); `--refresh` retries
+at once. `--populate-from DIR` fills the mirror from a local checkout laid out like
+the skills repo (`DIR/skills/.curated/<name>`), e.g. a fixture in tests.
+Each skill is unpacked on a thread pool into a hidden temp dir next to its
+destination and renamed into place, so a failure never leaves a partial install.
 """
 
 from __future__ import annotations
 
-import argparse
 import os
-import subprocess
 import sys
 from pathlib import Path
 
@@ -40,6 +54,12 @@ TIERS: dict[str, list[str]] = {
     "full": CORE + OPTIONAL,
 }
 
+CURATED_PREFIX = "skills/.curated"
+ARCHIVE_URL = "https://codeload.github.com/{repo}/tar.gz/{ref}"
+FETCH_TIMEOUT_S = 60
+# How long a failed/absent skill is remembered per repo/ref before downloading again.
+MISS_TTL_S = 60 * 60
+
 
 def _codex_home() -> Path:
     return Path(os.environ.get("CODEX_HOME", os.path.expanduser("~/.codex"))).resolve()
@@ -49,8 +69,11 @@ def _skills_root() -> Path:
     return _codex_home() / "skills"
 
 
-def _installer_script() -> Path:
-    return _skills_root() / ".system" / "skill-installer" / "scripts" / "install-skill-from-github.py"
+def _default_mirror() -> Path:
+    import p0_fs
+
+    override = os.environ.get("P0_SKILLS_MIRROR")
+    return Path(override) if override else p0_fs.cache_dir() / "skills-mirror"
 
 
 def _installed() -> set[str]:
@@ -65,13 +88,212 @@ def _installed() -> set[str]:
     return out
 
 
-def _run(cmd: list[str]) -> None:
-    proc = subprocess.run(cmd, text=True)
-    if proc.returncode != 0:
-        raise RuntimeError(f"Command failed: {' '.join(cmd)}")
+def _sha256(data: bytes) -> str:
+    import hashlib
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def _ref_path(mirror: Path, repo: str, ref: str, path: str) -> Path:
+    key = "\0".join((repo, ref, path)).encode("utf-8")
+    return mirror / "refs" / f"{_sha256(key)}.json"
+
+
+def _lookup(mirror: Path, repo: str, ref: str, path: str) -> Path | None:
+    """Mirror object for repo/ref/path, or None (missing, or its content doesn't match its name)."""
+    import json
+
+    try:
+        pointer = json.loads(_ref_path(mirror, repo, ref, path).read_text(encoding="utf-8"))
+        digest = pointer["object"]
+        obj = mirror / "objects" / f"{digest}.tar.gz"
+        if _sha256(obj.read_bytes()) == digest:
+            return obj
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _store(mirror: Path, repo: str, ref: str, path: str, data: bytes) -> Path:
+    import json
+
+    import p0_fs
+
+    digest = _sha256(data)
+    obj = mirror / "objects" / f"{digest}.tar.gz"
+    if not obj.is_file():
+        p0_fs.atomic_write_bytes(obj, data, mode=0o644)
+    pointer = {"repo": repo, "ref": ref, "path": path, "object": digest}
+    p0_fs.atomic_write_text(_ref_path(mirror, repo, ref, path), json.dumps(pointer, sort_keys=True) + "\n", mode=0o644)
+    return obj
+
+
+def _store_miss(mirror: Path, repo: str, ref: str, path: str, reason: str) -> None:
+    """Remember that repo/ref/path could not be fetched (never replaces a mirrored object)."""
+    import json
+    import time
+
+    import p0_fs
+
+    if _lookup(mirror, repo, ref, path) is not None:
+        return
+    pointer = {"repo": repo, "ref": ref, "path": path, "missing": reason, "at": int(time.time())}
+    try:
+        p0_fs.atomic_write_text(_ref_path(mirror, repo, ref, path), json.dumps(pointer, sort_keys=True) + "\n", mode=0o644)
+    except OSError:
+        pass  # Read-only mirror: just retry next time.
+
+
+def _recent_miss(mirror: Path, repo: str, ref: str, path: str) -> str | None:
+    """Reason recorded by _store_miss() less than MISS_TTL_S ago, else None."""
+    import json
+    import time
+
+    try:
+        pointer = json.loads(_ref_path(mirror, repo, ref, path).read_text(encoding="utf-8"))
+        reason, at = pointer["missing"], pointer["at"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if isinstance(reason, str) and isinstance(at, (int, float)) and 0 <= time.time() - at < MISS_TTL_S:
+        return reason
+    return None
+
+
+class _Packer:
+    """Deterministic `<name>/...` tar.gz built in memory (same content -> same bytes -> same object)."""
+
+    def __init__(self, name: str) -> None:
+        import io
+        import tarfile
+
+        self.name = name
+        self._buf = io.BytesIO()
+        self._members: list[tuple[tarfile.TarInfo, bytes | None]] = []
+
+    def add(self, rel: str, data: bytes | None, mode: int) -> None:
+        import tarfile
+
+        info = tarfile.TarInfo(f"{self.name}/{rel}" if rel else self.name)
+        info.mode = mode & 0o755
+        info.mtime = 0
+        if data is None:
+            info.type = tarfile.DIRTYPE
+        else:
+            info.size = len(data)
+        self._members.append((info, data))
+
+    def finish(self) -> bytes:
+        import gzip
+        import io
+        import tarfile
+
+        with gzip.GzipFile(fileobj=self._buf, mode="wb", mtime=0) as gz:
+            with tarfile.open(fileobj=gz, mode="w", format=tarfile.PAX_FORMAT) as tar:
+                for info, data in sorted(self._members, key=lambda m: m[0].name):
+                    tar.addfile(info, io.BytesIO(data) if data is not None else None)
+        return self._buf.getvalue()
+
+
+def _pack_dir(src: Path, name: str) -> bytes:
+    packer = _Packer(name)
+    packer.add("", None, 0o755)
+    for dirpath, dirnames, filenames in os.walk(src):
+        dirnames.sort()
+        for d in dirnames:
+            full = os.path.join(dirpath, d)
+            packer.add(Path(os.path.relpath(full, src)).as_posix(), None, os.stat(full).st_mode)
+        for f in sorted(filenames):
+            full = os.path.join(dirpath, f)
+            with open(full, "rb") as fh:
+                packer.add(Path(os.path.relpath(full, src)).as_posix(), fh.read(), os.stat(full).st_mode)
+    return packer.finish()
+
+
+def _populate(mirror: Path, local_root: Path, repo: str, ref: str, names: list[str]) -> list[str]:
+    """Pack `local_root/skills/.curated/<name>` into the mirror; returns names not found locally."""
+    missing: list[str] = []
+    for name in names:
+        src = local_root / CURATED_PREFIX / name
+        if not src.is_dir():
+            missing.append(name)
+            continue
+        _store(mirror, repo, ref, f"{CURATED_PREFIX}/{name}", _pack_dir(src, name))
+    return missing
+
+
+def _fetch(repo: str, ref: str, names: list[str]) -> dict[str, bytes]:
+    """
+    Download the repo archive once and repack each `skills/.curated/<name>`
+    into its own tarball. Names absent from the archive are left out.
+    """
+    import tarfile
+    import urllib.request
+
+    request = urllib.request.Request(ARCHIVE_URL.format(repo=repo, ref=ref))
+    token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    packers = {name: _Packer(name) for name in names}
+    found: set[str] = set()
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT_S) as resp:
+        # Streamed: the archive is read once and never stored whole.
+        with tarfile.open(fileobj=resp, mode="r|gz") as tar:
+            for member in tar:
+                # "<repo>-<sha>/skills/.curated/<name>/<rel>"
+                parts = member.name.split("/", 1)
+                if len(parts) != 2 or not parts[1].startswith(CURATED_PREFIX + "/"):
+                    continue
+                name, _, rel = parts[1][len(CURATED_PREFIX) + 1 :].partition("/")
+                packer = packers.get(name)
+                if packer is None or not (member.isfile() or member.isdir()):
+                    continue
+                found.add(name)
+                if member.isdir():
+                    packer.add(rel.rstrip("/"), None, member.mode)
+                else:
+                    fh = tar.extractfile(member)
+                    packer.add(rel, fh.read() if fh is not None else b"", member.mode)
+    return {name: packers[name].finish() for name in names if name in found}
+
+
+def _install(root: Path, name: str, obj: Path) -> str:
+    """Unpack `obj` into root/<name> via a temp dir + rename; returns a status."""
+    import shutil
+    import tarfile
+    import tempfile
+
+    dest = root / name
+    if dest.exists():
+        return "present"
+    tmp = Path(tempfile.mkdtemp(prefix=f".p0-install-{name}-", dir=os.fspath(root)))
+    try:
+        with tarfile.open(obj, mode="r:gz") as tar:
+            members = tar.getmembers()
+            for member in members:
+                parts = member.name.split("/")
+                if parts[0] != name or ".." in parts or not (member.isfile() or member.isdir()):
+                    raise ValueError(f"unexpected member in {obj.name}: {member.name}")
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(tmp, members=members, filter="data")
+            else:
+                tar.extractall(tmp, members=members)
+        staged = tmp / name
+        if not (staged / "SKILL.md").is_file():
+            raise ValueError(f"{obj.name} has no {name}/SKILL.md")
+        try:
+            os.rename(staged, dest)
+        except OSError:
+            if dest.exists():
+                return "present"  # Another run won the race.
+            raise
+        return "installed"
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
 
 
 def main(argv: list[str]) -> int:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Install recommended curated Codex skills (idempotent)")
     parser.add_argument(
         "--tier",
@@ -87,37 +309,100 @@ def main(argv: list[str]) -> int:
     )
     parser.add_argument("--repo", default="openai/skills", help="GitHub repo (default: openai/skills)")
     parser.add_argument("--ref", default="main", help="Git ref (default: main)")
+    parser.add_argument(
+        "--mirror",
+        type=Path,
+        default=None,
+        help="Skill tarball mirror (default: $P0_SKILLS_MIRROR or <P0 cache dir>/skills-mirror).",
+    )
+    parser.add_argument(
+        "--populate-from",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Fill the mirror from a local checkout of the skills repo (DIR/skills/.curated/<name>).",
+    )
+    net = parser.add_mutually_exclusive_group()
+    net.add_argument("--offline", action="store_true", help="Never download; fail for skills missing from the mirror.")
+    net.add_argument("--refresh", action="store_true", help="Re-download wanted skills even if mirrored (e.g. a moving ref).")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel installs (default: auto).")
     args = parser.parse_args(argv)
 
     root = _skills_root()
     root.mkdir(parents=True, exist_ok=True)
+    mirror = args.mirror or _default_mirror()
 
-    installer = _installer_script()
-    if not installer.is_file():
-        print(f"Error: installer not found at {installer}", file=sys.stderr)
-        return 2
-
-    installed = _installed()
     base = args.skills if args.skills is not None else TIERS.get(args.tier, CORE)
     wanted = [s for s in base if isinstance(s, str) and s.strip()]
-    missing = [s for s in wanted if s not in installed]
 
+    if args.populate_from is not None:
+        absent = _populate(mirror, args.populate_from, args.repo, args.ref, wanted)
+        for name in absent:
+            print(f"WARNING: {name} not found under {args.populate_from / CURATED_PREFIX}", file=sys.stderr)
+
+    installed = _installed()
+    missing = [s for s in wanted if s not in installed]
     if not missing:
         print("OK: curated skills already installed")
         return 0
 
-    paths = [f"skills/.curated/{name}" for name in missing]
-    cmd = [
-        sys.executable,
-        os.fspath(installer),
-        "--repo",
-        args.repo,
-        "--ref",
-        args.ref,
-        "--path",
-        *paths,
-    ]
-    _run(cmd)
+    objects: dict[str, Path] = {}
+    for name in missing:
+        obj = None if args.refresh else _lookup(mirror, args.repo, args.ref, f"{CURATED_PREFIX}/{name}")
+        if obj is not None:
+            objects[name] = obj
+    to_fetch = [name for name in missing if name not in objects]
+    failed: list[str] = []
+    if not args.refresh:
+        for name in list(to_fetch):
+            reason = _recent_miss(mirror, args.repo, args.ref, f"{CURATED_PREFIX}/{name}")
+            if reason is not None:
+                print(f"Error: {name}: {reason} (cached; retry with --refresh)", file=sys.stderr)
+                failed.append(name)
+                to_fetch.remove(name)
+    if to_fetch and args.offline:
+        for name in to_fetch:
+            print(f"Error: {name}: not in mirror {mirror} (--offline)", file=sys.stderr)
+        failed.extend(to_fetch)
+    elif to_fetch:
+        fetch_error: str | None = None
+        try:
+            fetched = _fetch(args.repo, args.ref, to_fetch)
+        except Exception as exc:
+            fetch_error = f"download of {args.repo}@{args.ref} failed: {exc}"
+            print(f"Error: {fetch_error}", file=sys.stderr)
+            fetched = {}
+        for name in to_fetch:
+            path = f"{CURATED_PREFIX}/{name}"
+            if name in fetched:
+                objects[name] = _store(mirror, args.repo, args.ref, path, fetched[name])
+                continue
+            reason = fetch_error or f"not found in {args.repo}@{args.ref}"
+            if fetch_error is None:
+                print(f"Error: {name}: {reason}", file=sys.stderr)
+            _store_miss(mirror, args.repo, args.ref, path, reason)
+            failed.append(name)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def one(name: str) -> tuple[str, str]:
+        try:
+            return name, _install(root, name, objects[name])
+        except Exception as exc:
+            return name, f"error: {exc}"
+
+    installable = [name for name in missing if name in objects]
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        for name, status in pool.map(one, installable):
+            if status.startswith("error"):
+                print(f"Error: {name}: {status[len('error: '):]}", file=sys.stderr)
+                failed.append(name)
+            else:
+                print(f"{name}: {status}")
+
+    if failed:
+        print(f"Error: {len(failed)} curated skill(s) not installed: {', '.join(failed)}", file=sys.stderr)
+        return 1
     return 0
 
 
@@ -9,6 +9,8 @@ set -euo pipefail
 # Defaults:
 # - If no extract args are provided, runs with `--with-supabase` (names-only compare).
 # - To run full gates/perf: pass `--with-gates --with-perf --with-supabase`.
+# - Unless `--format` is given, runs with `--format both` so the MEGA_PLAN reads
+#   blockers from the EXTRACTION_*.json document instead of the markdown.
 
 ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
 cd "$ROOT_DIR"
@@ -38,21 +40,39 @@ echo "[kickoff] session-start..."
 if [ "${#EXTRACT_ARGS[@]}" -eq 0 ]; then
   EXTRACT_ARGS=(--with-supabase)
 fi
+HAS_FORMAT="false"
+for arg in "${EXTRACT_ARGS[@]}"; do
+  case "$arg" in
+    --format|--format=*) HAS_FORMAT="true" ;;
+  esac
+done
+if [ "$HAS_FORMAT" = "false" ]; then
+  EXTRACT_ARGS+=(--format both)
+fi
 
 echo "[kickoff] extract reports..."
 mapfile -t CREATED < <(.agent/scripts/extract_reports.py "${EXTRACT_ARGS[@]}")
 
 TECH=""
 INV=""
+EXTRACTION=""
+RUN_DIR=""
 for p in "${CREATED[@]}"; do
   case "$p" in
-    docs/closure/TECHNICAL_ANALYSIS_*) TECH="$p" ;;
-    docs/closure/INVENTORY_REPORT_*) INV="$p" ;;
+    docs/closure/runs/*/TECHNICAL_ANALYSIS_*|docs/closure/TECHNICAL_ANALYSIS_*) TECH="$p" ;;
+    docs/closure/runs/*/INVENTORY_REPORT_*|docs/closure/INVENTORY_REPORT_*) INV="$p" ;;
+    docs/closure/runs/*/EXTRACTION_*|docs/closure/EXTRACTION_*) EXTRACTION="$p" ;;
+  esac
+  case "$p" in
+    docs/closure/runs/*) RUN_DIR="$(dirname "$p")" ;;
   esac
 done
 
 echo "[kickoff] mega plan template..."
 MP_ARGS=(--objective "$OBJ")
+if [ -n "$EXTRACTION" ]; then
+  MP_ARGS+=(--from-extraction "$EXTRACTION")
+fi
 if [ -n "$TECH" ]; then
   MP_ARGS+=(--from-tech "$TECH")
 fi
@@ -60,5 +80,10 @@ if [ -n "$INV" ]; then
   MP_ARGS+=(--from-inventory "$INV")
 fi
 
+if [ -n "$RUN_DIR" ]; then
+  # Keep the plan with the evidence of this run (unique per run, unlike a docs/closure timestamp).
+  MP_ARGS+=(--out "$RUN_DIR/MEGA_PLAN_$(date -u +%Y-%m-%d_%H%M%S).md")
+fi
+
 MEGA_PATH="$(.agent/scripts/mega_plan_template.py "${MP_ARGS[@]}")"
 echo "Wrote: $MEGA_PATH"
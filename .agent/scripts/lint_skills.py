@@ -7,16 +7,19 @@ Checks:
 - Frontmatter `name` matches directory name.
 - `project_config.yaml` only references skills that exist.
 - Trigger patterns / chains cover installed skills (warn on gaps).
+
+Results are cached under the P0 cache dir: per skill by the SKILL.md content
+hash (plus the presence of references/ and agents/openai.yaml), and for the
+config cross-checks by the config's content hash plus the installed skill
+names. A warm run re-lints only what changed. `--format json|sarif` emits
+machine-readable findings (SARIF 2.1.0 for code-scanning tools).
 """
 
 from __future__ import annotations
 
 import sys
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
-
-import yaml
+from typing import Any, NamedTuple
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -24,111 +27,115 @@ SKILLS_ROOT = REPO_ROOT / ".agent" / "skills"
 CONFIG_PATH = SKILLS_ROOT / "project_config.yaml"
 SKILL_SOFT_MAX_LINES = 300
 SKILL_HARD_MAX_LINES = 500
+# Bump whenever a check or message changes (invalidates cached results).
+LINT_VERSION = 1
+
+# rule id -> short description (SARIF `tool.driver.rules`).
+RULES: dict[str, str] = {
+    "config-missing": "project_config.yaml is missing",
+    "frontmatter-invalid": "SKILL.md has no valid YAML frontmatter",
+    "frontmatter-name": "Frontmatter name is missing",
+    "frontmatter-description": "Frontmatter description is missing",
+    "frontmatter-name-mismatch": "Frontmatter name differs from the skill directory",
+    "frontmatter-field": "Expected frontmatter field is missing",
+    "section-missing": "Expected SKILL.md section is missing",
+    "skill-too-long": "SKILL.md is too long for progressive disclosure",
+    "agents-yaml-missing": "agents/openai.yaml is missing",
+    "config-default-skill": "default_skill is missing or unknown",
+    "config-unknown-skill": "Config references a skill that is not installed",
+    "config-structure": "Config section has the wrong shape",
+    "config-keywords": "Trigger keywords are missing or empty",
+    "config-drift": "Installed skill is not referenced by the config",
+}
+
+
+class Finding(NamedTuple):
+    level: str  # "error" | "warning"
+    rule: str  # key of RULES
+    path: str  # repo-relative file the finding is about
+    message: str
+
+
+class LintResult(NamedTuple):
+    errors: list[str]
+    warnings: list[str]
+    findings: list[Finding]
 
 
-def _load_yaml(path: Path) -> dict[str, Any]:
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
-    if not isinstance(data, dict):
-        raise ValueError(f"Invalid YAML root object: {path}")
-    return data
+def _rel(path: Path) -> str:
+    return path.relative_to(REPO_ROOT).as_posix() if path.is_relative_to(REPO_ROOT) else path.as_posix()
 
 
-def _parse_frontmatter(skill_md: Path) -> dict[str, Any]:
-    raw = skill_md.read_text(encoding="utf-8")
-    lines = raw.splitlines()
-    if not lines or lines[0].strip() != "---":
-        return {}
-    try:
-        end = lines[1:].index("---") + 1
-    except ValueError:
-        return {}
-    block = "\n".join(lines[1:end])
-    try:
-        meta = yaml.safe_load(block) or {}
-    except Exception:
-        return {}
-    return meta if isinstance(meta, dict) else {}
+def _skill_key(info: Any) -> list[Any]:
+    d = SKILLS_ROOT / info.skill
+    return [info.sha256, (d / "references").is_dir(), (d / "agents" / "openai.yaml").is_file()]
 
 
-def _read_body(skill_md: Path) -> str:
-    return skill_md.read_text(encoding="utf-8", errors="replace")
+def _lint_skill(info: Any) -> list[Finding]:
+    from skills_catalog import SECTION_MARKERS
 
+    out: list[Finding] = []
+    d = SKILLS_ROOT / info.skill
+    md = info.path
 
-def _skill_dirs() -> list[Path]:
-    if not SKILLS_ROOT.is_dir():
-        return []
-    out: list[Path] = []
-    for child in SKILLS_ROOT.iterdir():
-        if not child.is_dir():
-            continue
-        if child.name.startswith("."):
-            continue
-        if (child / "SKILL.md").is_file():
-            out.append(child)
-    return sorted(out, key=lambda p: p.name.lower())
+    def error(rule: str, message: str, path: str = md) -> None:
+        out.append(Finding("error", rule, path, message))
 
+    def warning(rule: str, message: str, path: str = md) -> None:
+        out.append(Finding("warning", rule, path, message))
 
-@dataclass(frozen=True)
-class LintResult:
-    errors: list[str]
-    warnings: list[str]
+    if not info.frontmatter:
+        error("frontmatter-invalid", f"{d}: invalid or missing YAML frontmatter")
+        return out
+    name = info.name
+    desc = info.description
+    if not isinstance(name, str) or not name.strip():
+        error("frontmatter-name", f"{d}/SKILL.md: missing frontmatter name")
+    if not isinstance(desc, str) or not desc.strip():
+        error("frontmatter-description", f"{d}/SKILL.md: missing frontmatter description")
+    if isinstance(name, str) and name != d.name:
+        warning("frontmatter-name-mismatch", f"{d}/SKILL.md: frontmatter name '{name}' != dir '{d.name}'")
 
+    # Optional-but-expected metadata fields (Protocol Zero conventions).
+    for field in ("role", "impact"):
+        if field not in info.keys:
+            warning("frontmatter-field", f"{d}/SKILL.md: missing frontmatter '{field}'")
 
-def lint() -> LintResult:
-    errors: list[str] = []
-    warnings: list[str] = []
+    # Basic structure sanity checks (keep skills consistent and skimmable).
+    body_lines = info.lines
+    for header in SECTION_MARKERS:
+        if header not in info.sections:
+            warning("section-missing", f"{d}/SKILL.md: missing section '{header}'")
+    if body_lines > SKILL_HARD_MAX_LINES:
+        warning(
+            "skill-too-long",
+            f"{d}/SKILL.md: {body_lines} lines (> {SKILL_HARD_MAX_LINES}); move detailed procedures to references/ to reduce context load",
+        )
+    elif body_lines > SKILL_SOFT_MAX_LINES and not (d / "references").is_dir():
+        warning(
+            "skill-too-long",
+            f"{d}/SKILL.md: {body_lines} lines and no references/ folder; consider progressive disclosure for better Codex efficiency",
+        )
 
-    if not CONFIG_PATH.is_file():
-        errors.append(f"Missing config: {CONFIG_PATH}")
-        return LintResult(errors=errors, warnings=warnings)
+    ui_yaml = d / "agents" / "openai.yaml"
+    if not ui_yaml.is_file():
+        warning("agents-yaml-missing", f"{d}: missing agents/openai.yaml (run .agent/scripts/generate_agents_yaml.py)", _rel(ui_yaml))
+    return out
+
+
+def _lint_config(config: dict[str, Any], skill_names: set[str]) -> list[Finding]:
+    out: list[Finding] = []
+    cfg = _rel(CONFIG_PATH)
+
+    def error(rule: str, message: str) -> None:
+        out.append(Finding("error", rule, cfg, message))
+
+    def warning(rule: str, message: str) -> None:
+        out.append(Finding("warning", rule, cfg, message))
 
-    config = _load_yaml(CONFIG_PATH)
     orchestrator = config.get("skill_orchestrator") or {}
     graph = config.get("skill_graph") or {}
 
-    skills = _skill_dirs()
-    skill_names = {p.name for p in skills}
-
-    # Validate skill frontmatters.
-    for d in skills:
-        skill_md = d / "SKILL.md"
-        meta = _parse_frontmatter(skill_md)
-        if not meta:
-            errors.append(f"{d}: invalid or missing YAML frontmatter")
-            continue
-        name = meta.get("name")
-        desc = meta.get("description")
-        if not isinstance(name, str) or not name.strip():
-            errors.append(f"{d}/SKILL.md: missing frontmatter name")
-        if not isinstance(desc, str) or not desc.strip():
-            errors.append(f"{d}/SKILL.md: missing frontmatter description")
-        if isinstance(name, str) and name != d.name:
-            warnings.append(f"{d}/SKILL.md: frontmatter name '{name}' != dir '{d.name}'")
-
-        # Optional-but-expected metadata fields (Protocol Zero conventions).
-        for field in ("role", "impact"):
-            if field not in meta:
-                warnings.append(f"{d}/SKILL.md: missing frontmatter '{field}'")
-
-        # Basic structure sanity checks (keep skills consistent and skimmable).
-        body = _read_body(skill_md)
-        body_lines = len(body.splitlines())
-        for header in ("## Guardrails", "## Activacion"):
-            if header not in body:
-                warnings.append(f"{d}/SKILL.md: missing section '{header}'")
-        if body_lines > SKILL_HARD_MAX_LINES:
-            warnings.append(
-                f"{d}/SKILL.md: {body_lines} lines (> {SKILL_HARD_MAX_LINES}); move detailed procedures to references/ to reduce context load"
-            )
-        elif body_lines > SKILL_SOFT_MAX_LINES and not (d / "references").is_dir():
-            warnings.append(
-                f"{d}/SKILL.md: {body_lines} lines and no references/ folder; consider progressive disclosure for better Codex efficiency"
-            )
-
-        ui_yaml = d / "agents" / "openai.yaml"
-        if not ui_yaml.is_file():
-            warnings.append(f"{d}: missing agents/openai.yaml (run .agent/scripts/generate_agents_yaml.py)")
-
     # Collect config references.
     referenced: set[str] = set()
 
@@ -136,33 +143,33 @@ def lint() -> LintResult:
     if isinstance(default_skill, str) and default_skill:
         referenced.add(default_skill)
         if default_skill not in skill_names:
-            errors.append(f"skill_orchestrator.default_skill '{default_skill}' missing in .agent/skills/")
+            error("config-default-skill", f"skill_orchestrator.default_skill '{default_skill}' missing in .agent/skills/")
     else:
-        warnings.append("skill_orchestrator.default_skill missing/invalid")
+        warning("config-default-skill", "skill_orchestrator.default_skill missing/invalid")
 
     triggers = orchestrator.get("trigger_patterns") or {}
     if isinstance(triggers, dict):
         for skill, spec in triggers.items():
             referenced.add(skill)
             if skill not in skill_names:
-                errors.append(f"trigger_patterns references missing skill: {skill}")
+                error("config-unknown-skill", f"trigger_patterns references missing skill: {skill}")
             if not isinstance(spec, dict):
-                errors.append(f"trigger_patterns.{skill} is not a mapping")
+                error("config-structure", f"trigger_patterns.{skill} is not a mapping")
                 continue
             kw = spec.get("keywords")
             if not isinstance(kw, list) or not any(isinstance(x, str) and x.strip() for x in kw):
-                warnings.append(f"trigger_patterns.{skill}.keywords missing/empty")
+                warning("config-keywords", f"trigger_patterns.{skill}.keywords missing/empty")
     else:
-        errors.append("skill_orchestrator.trigger_patterns is not a mapping")
+        error("config-structure", "skill_orchestrator.trigger_patterns is not a mapping")
 
     chains = (graph.get("chains") or {}) if isinstance(graph, dict) else {}
     if isinstance(chains, dict):
         for skill, spec in chains.items():
             referenced.add(skill)
             if skill not in skill_names:
-                errors.append(f"skill_graph.chains references missing skill: {skill}")
+                error("config-unknown-skill", f"skill_graph.chains references missing skill: {skill}")
             if not isinstance(spec, dict):
-                errors.append(f"skill_graph.chains.{skill} is not a mapping")
+                error("config-structure", f"skill_graph.chains.{skill} is not a mapping")
                 continue
             for field in ("pre_check", "on_complete"):
                 val = spec.get(field)
@@ -171,18 +178,18 @@ def lint() -> LintResult:
                         if isinstance(dep, str) and dep:
                             referenced.add(dep)
                 elif val is not None:
-                    errors.append(f"skill_graph.chains.{skill}.{field} must be a list")
+                    error("config-structure", f"skill_graph.chains.{skill}.{field} must be a list")
     else:
-        errors.append("skill_graph.chains is not a mapping")
+        error("config-structure", "skill_graph.chains is not a mapping")
 
     deps = (graph.get("dependencies") or {}) if isinstance(graph, dict) else {}
     if isinstance(deps, dict):
         for skill, spec in deps.items():
             referenced.add(skill)
             if skill not in skill_names:
-                errors.append(f"skill_graph.dependencies references missing skill: {skill}")
+                error("config-unknown-skill", f"skill_graph.dependencies references missing skill: {skill}")
             if not isinstance(spec, dict):
-                errors.append(f"skill_graph.dependencies.{skill} is not a mapping")
+                error("config-structure", f"skill_graph.dependencies.{skill} is not a mapping")
                 continue
             reqs = spec.get("requires") or []
             if isinstance(reqs, list):
@@ -190,25 +197,170 @@ def lint() -> LintResult:
                     if isinstance(req, dict) and isinstance(req.get("skill"), str):
                         referenced.add(req["skill"])
             else:
-                errors.append(f"skill_graph.dependencies.{skill}.requires must be a list")
+                error("config-structure", f"skill_graph.dependencies.{skill}.requires must be a list")
     elif deps is not None:
-        errors.append("skill_graph.dependencies is not a mapping")
+        error("config-structure", "skill_graph.dependencies is not a mapping")
 
     # Final cross-check.
     missing = sorted([s for s in referenced if s not in skill_names])
     if missing:
-        errors.append(f"Config references unknown skill(s): {', '.join(missing)}")
+        error("config-unknown-skill", f"Config references unknown skill(s): {', '.join(missing)}")
 
     # Warn on skills not present in config (usually drift).
     unmanaged = sorted([s for s in skill_names if s not in referenced and s not in triggers and s not in chains])
     if unmanaged:
-        warnings.append(f"Skills not referenced by config (possible drift): {', '.join(unmanaged)}")
+        warning("config-drift", f"Skills not referenced by config (possible drift): {', '.join(unmanaged)}")
+
+    return out
+
+
+def _cache_path() -> Path:
+    import hashlib
+
+    import p0_fs
 
-    return LintResult(errors=errors, warnings=warnings)
+    tag = hashlib.sha1(str(SKILLS_ROOT.resolve()).encode("utf-8")).hexdigest()[:12]
+    return p0_fs.cache_dir() / f"lint_skills.{tag}.json"
 
 
-def main() -> int:
-    res = lint()
+def _load_cache() -> dict[str, Any]:
+    import json
+
+    import p0_fs
+
+    if p0_fs.cache_disabled():
+        return {}
+    try:
+        data = json.loads(_cache_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != LINT_VERSION:
+        return {}
+    return data
+
+
+def _save_cache(data: dict[str, Any]) -> None:
+    import json
+
+    import p0_fs
+
+    if p0_fs.cache_disabled():
+        return
+    try:
+        p0_fs.atomic_write_text(_cache_path(), json.dumps({"version": LINT_VERSION, **data}, ensure_ascii=True) + "\n")
+    except OSError:
+        pass  # Read-only checkout: stay uncached.
+
+
+def _cached_findings(entry: Any, key: list[Any]) -> list[Finding] | None:
+    if not isinstance(entry, dict) or entry.get("key") != key:
+        return None
+    try:
+        return [Finding(*f) for f in entry["findings"]]
+    except (KeyError, TypeError):
+        return None
+
+
+def lint(*, jobs: int | None = None) -> LintResult:
+    import hashlib
+
+    import skills_catalog
+
+    if not CONFIG_PATH.is_file():
+        finding = Finding("error", "config-missing", _rel(CONFIG_PATH), f"Missing config: {CONFIG_PATH}")
+        return LintResult(errors=[finding.message], warnings=[], findings=[finding])
+
+    cache = _load_cache()
+    cached_skills = cache.get("skills") if isinstance(cache.get("skills"), dict) else {}
+    changed = False
+
+    findings: list[Finding] = []
+    skills = skills_catalog.load(SKILLS_ROOT, jobs=jobs)
+    skill_entries: dict[str, Any] = {}
+    for name, info in skills.items():
+        key = _skill_key(info)
+        found = _cached_findings(cached_skills.get(name), key)
+        if found is None:
+            found = _lint_skill(info)
+            changed = True
+        skill_entries[name] = {"key": key, "findings": [list(f) for f in found]}
+        findings.extend(found)
+    changed = changed or set(skill_entries) != set(cached_skills)
+
+    raw = CONFIG_PATH.read_bytes()
+    config_key = [hashlib.sha256(raw).hexdigest(), sorted(skills)]
+    config_findings = _cached_findings(cache.get("config"), config_key)
+    if config_findings is None:
+        from config_snapshot import load_config
+
+        config_findings = _lint_config(load_config(CONFIG_PATH), set(skills))
+        changed = True
+    findings.extend(config_findings)
+
+    if changed:
+        _save_cache(
+            {"skills": skill_entries, "config": {"key": config_key, "findings": [list(f) for f in config_findings]}}
+        )
+
+    return LintResult(
+        errors=[f.message for f in findings if f.level == "error"],
+        warnings=[f.message for f in findings if f.level == "warning"],
+        findings=findings,
+    )
+
+
+def _sarif(findings: list[Finding]) -> dict[str, Any]:
+    used = sorted({f.rule for f in findings})
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {
+                    "driver": {
+                        "name": "lint_skills",
+                        "rules": [{"id": rule, "shortDescription": {"text": RULES.get(rule, rule)}} for rule in used],
+                    }
+                },
+                "results": [
+                    {
+                        "ruleId": f.rule,
+                        "ruleIndex": used.index(f.rule),
+                        "level": f.level,
+                        "message": {"text": f.message},
+                        "locations": [{"physicalLocation": {"artifactLocation": {"uri": f.path}}}],
+                    }
+                    for f in findings
+                ],
+            }
+        ],
+    }
+
+
+def main(argv: list[str]) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Lint Protocol Zero skills + orchestrator config")
+    parser.add_argument("--format", choices=["text", "json", "sarif"], default="text")
+    parser.add_argument("--jobs", type=int, default=None, help="Threads for re-reading changed skills (default: auto).")
+    args = parser.parse_args(argv)
+
+    res = lint(jobs=args.jobs)
+    if args.format != "text":
+        import json
+
+        if args.format == "sarif":
+            payload = _sarif(res.findings)
+        else:
+            payload = {
+                "ok": not res.errors,
+                "errors": len(res.errors),
+                "warnings": len(res.warnings),
+                "findings": [f._asdict() for f in res.findings],
+            }
+        print(json.dumps(payload, ensure_ascii=True, indent=2))
+        return 1 if res.errors else 0
+
     for w in res.warnings:
         print(f"WARNING: {w}", file=sys.stderr)
     for e in res.errors:
@@ -220,4 +372,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(main(sys.argv[1:]))
@@ -5,15 +5,17 @@ Generate a MEGA_PLAN template under docs/closure/ for non-technical, guided exec
 This is intentionally a TEMPLATE generator:
 - It never prints secret values.
 - It references existing evidence reports (technical/inventory/baseline) when available.
+- Blockers come from the EXTRACTION_*.json document (`extract_reports.py --format json|both`)
+  when there is one; otherwise they are scraped from the TECHNICAL_ANALYSIS markdown.
 """
 
 from __future__ import annotations
 
-import argparse
 import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -39,11 +41,39 @@ def _safe_rel(path: Path) -> str:
         return os.fspath(path)
 
 
-def _latest(pattern: str) -> Path | None:
-    if not CLOSURE_DIR.is_dir():
+def _latest(kind: str) -> Path | None:
+    # Newest artifact of `kind` from the closure index (P0 cache); a few stats, no directory scan while it is fresh.
+    from closure_index import latest
+
+    return latest(kind)
+
+
+def _load_extraction(path: Path) -> dict[str, Any] | None:
+    """The extract_reports JSON document at `path`, or None if missing/unreadable."""
+    import json
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _extraction_blockers(doc: dict[str, Any]) -> list[str] | None:
+    """Blocker bullets from `technical.blockers`; None if the document has no technical section."""
+    tech = doc.get("technical")
+    if not isinstance(tech, dict) or not isinstance(tech.get("blockers"), list):
         return None
-    files = sorted(CLOSURE_DIR.glob(pattern), key=lambda p: p.name)
-    return files[-1] if files else None
+    return [f"- {b['message']}" for b in tech["blockers"] if isinstance(b, dict) and b.get("message")][:20]
+
+
+def _newer_or_same(doc: dict[str, Any], tech_md: Path | None) -> bool:
+    # Default pick: only trust the latest JSON if it is not older than the latest markdown report.
+    if tech_md is None:
+        return True
+    tech = doc.get("technical")
+    stamp = tech.get("stamp") if isinstance(tech, dict) else None
+    return isinstance(stamp, str) and stamp >= tech_md.stem.removeprefix("TECHNICAL_ANALYSIS_")
 
 
 def _extract_blockers(tech_path: Path) -> list[str]:
@@ -81,8 +111,15 @@ def _write(path: Path, content: str) -> None:
 
 
 def main(argv: list[str]) -> int:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Generate MEGA_PLAN template (docs/closure)")
     parser.add_argument("--objective", default="", help="One-sentence objective for this plan.")
+    parser.add_argument(
+        "--from-extraction",
+        default="",
+        help="Path to EXTRACTION_*.json (optional; default: latest, if not older than the latest technical report).",
+    )
     parser.add_argument("--from-tech", default="", help="Path to TECHNICAL_ANALYSIS_*.md (optional).")
     parser.add_argument("--from-inventory", default="", help="Path to INVENTORY_REPORT_*.md (optional).")
     parser.add_argument("--from-baseline", default="", help="Path to BASELINE_LOG_*.md (optional).")
@@ -104,15 +141,38 @@ def main(argv: list[str]) -> int:
     tm = _ts_time()
     out_path = Path(args.out) if args.out else (CLOSURE_DIR / f"MEGA_PLAN_{date}_{tm}.md")
 
-    tech = Path(args.from_tech) if args.from_tech else (_latest("TECHNICAL_ANALYSIS_*.md") or Path())
-    inv = Path(args.from_inventory) if args.from_inventory else (_latest("INVENTORY_REPORT_*.md") or Path())
-    base = Path(args.from_baseline) if args.from_baseline else (_latest("BASELINE_LOG_*.md") or Path())
+    extraction_path: Path | None = None
+    extraction: dict[str, Any] | None = None
+    if args.from_extraction:
+        extraction_path = Path(args.from_extraction)
+        extraction = _load_extraction(extraction_path)
+    elif not args.from_tech:
+        latest_json = _latest("extraction")
+        doc = _load_extraction(latest_json) if latest_json else None
+        if doc is not None and _newer_or_same(doc, _latest("technical")):
+            extraction_path, extraction = latest_json, doc
+    reports = (extraction or {}).get("reports") or {}
+
+    def _report(arg: str, key: str) -> Path | None:
+        if arg:
+            return Path(arg)
+        if extraction is not None:
+            # The markdown rendered with this document, if any.
+            return REPO_ROOT / reports[key] if isinstance(reports.get(key), str) else None
+        return _latest(key)
+
+    tech = _report(args.from_tech, "technical")
+    inv = _report(args.from_inventory, "inventory")
+    base = Path(args.from_baseline) if args.from_baseline else _latest("baseline")
 
     tech_rel = _safe_rel(tech) if tech and tech.exists() else ""
     inv_rel = _safe_rel(inv) if inv and inv.exists() else ""
     base_rel = _safe_rel(base) if base and base.exists() else ""
+    extraction_rel = _safe_rel(extraction_path) if extraction is not None and extraction_path else ""
 
-    blockers = _extract_blockers(tech) if tech and tech.exists() else []
+    blockers = _extraction_blockers(extraction) if extraction is not None else None
+    if blockers is None:
+        blockers = _extract_blockers(tech) if tech and tech.exists() else []
 
     objective = (args.objective or "").strip() or "(sin objetivo provisto)"
 
@@ -133,6 +193,8 @@ def main(argv: list[str]) -> int:
         lines.append(f"- Inventario: `{inv_rel}`")
     else:
         lines.append("- Inventario: (no encontrado) generar con `.agent/scripts/p0.sh extract`")
+    if extraction_rel:
+        lines.append(f"- Extracción (JSON): `{extraction_rel}`")
     if base_rel:
         lines.append(f"- Baseline: `{base_rel}`")
     else:
@@ -179,6 +241,9 @@ def main(argv: list[str]) -> int:
     lines.append("")
 
     _write(out_path, "\n".join(lines).rstrip() + "\n")
+    from closure_index import record
+
+    record("mega_plan", out_path.resolve())
     print(_safe_rel(out_path))
     return 0
 
@@ -6,6 +6,7 @@ set -euo pipefail
 # Examples:
 #   .agent/scripts/p0.sh bootstrap
 #   .agent/scripts/p0.sh route "merge dependabot prs"
+#   .agent/scripts/p0.sh route-serve
 #   .agent/scripts/p0.sh baseline
 #   .agent/scripts/p0.sh extract --with-gates --with-supabase
 #   .agent/scripts/p0.sh gates all
@@ -13,6 +14,7 @@ set -euo pipefail
 #   .agent/scripts/p0.sh session-start "Objetivo"
 #   .agent/scripts/p0.sh session-end
 #   .agent/scripts/p0.sh dependabot --merge --comment
+#   P0_IMPORT_PROFILE=1 .agent/scripts/p0.sh startup-budget
 
 ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
 cd "$ROOT_DIR"
@@ -41,7 +43,8 @@ Protocol Zero CLI
 
 Commands:
   bootstrap                 Sync skills + install curated + lint + UI metadata
-  route <text>              Select skill + chain for a request
+  route <text>              Select skill + chain for a request (uses route-serve daemon if running)
+  route-serve               Run the routing daemon (warm config, Unix socket)
   baseline                  Capture safe baseline into docs/closure
   extract [args]            Generate TECHNICAL_ANALYSIS + INVENTORY reports (pass args to extract_reports.py)
   mega-plan [args]          Generate MEGA_PLAN template (pass args to mega_plan_template.py)
@@ -51,6 +54,8 @@ Commands:
   session-start <objective> Start session (baseline + briefing + evidence)
   session-end               End session and archive
   dependabot [args]         One-PR Dependabot autopilot. Pass args to dependabot_autopilot.sh
+  startup-budget [args]     Fail if a .agent/scripts entry point exceeds its cold-import budget
+                            (P0_IMPORT_PROFILE=1 writes test-reports/importtime/<script>.log)
 
 EOF
 }
@@ -62,8 +67,26 @@ case "$cmd" in
     .agent/scripts/bootstrap.sh
     ;;
   route)
+    ROUTE_SOCKET="${P0_ROUTE_SOCKET:-.agent/cache/skill_orchestrator.sock}"
+    USE_DAEMON=0
+    if [ -S "$ROUTE_SOCKET" ]; then
+      USE_DAEMON=1
+      # --batch/--serve/--connect pick their own mode (argparse rejects them with --connect).
+      for arg in "$@"; do
+        case "$arg" in
+          --batch|--batch=*|--serve|--connect) USE_DAEMON=0 ;;
+        esac
+      done
+    fi
+    if [ "$USE_DAEMON" -eq 1 ]; then
+      # Thin client; it routes in-process itself when no daemon answers.
+      exec .agent/scripts/skill_orchestrator.py --connect --socket "$ROUTE_SOCKET" "$@"
+    fi
     .agent/scripts/skill_orchestrator.py "$@"
     ;;
+  route-serve)
+    .agent/scripts/skill_orchestrator.py --serve "$@"
+    ;;
   baseline)
     .agent/scripts/baseline_capture.sh
     ;;
@@ -91,6 +114,9 @@ case "$cmd" in
   dependabot)
     .agent/scripts/dependabot_autopilot.sh "$@"
     ;;
+  startup-budget)
+    .agent/scripts/startup_budget.py "$@"
+    ;;
   help|-h|--help)
     usage
     ;;
@@ -0,0 +1,95 @@
+"""
+Filesystem helpers shared by the Protocol Zero scripts.
+
+- `cache_dir()`: where derived, rebuildable state lives (default `.agent/cache/`,
+  override with `P0_CACHE_DIR`). Nothing in there is a source of truth.
+- `atomic_write_bytes()` / `atomic_write_text()`: temp file + rename so readers
+  never observe a half-written file.
+- `file_lock()`: advisory inter-process lock (flock) for work that concurrent
+  runs must not duplicate or interleave.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = REPO_ROOT / ".agent" / "cache"
+
+
+def cache_dir() -> Path:
+    override = os.environ.get("P0_CACHE_DIR")
+    return Path(override) if override else DEFAULT_CACHE_DIR
+
+
+def cache_disabled() -> bool:
+    return os.environ.get("P0_NO_CACHE") == "1"
+
+
+_UMASK: int | None = None
+
+
+def new_file_mode() -> int:
+    """Permissions `open()` would give a new file here: 0666 minus the process umask."""
+    global _UMASK
+    if _UMASK is None:
+        _UMASK = os.umask(0o022)  # Only readable by setting it; restored right away.
+        os.umask(_UMASK)
+    return 0o666 & ~_UMASK
+
+
+def atomic_write_bytes(path: Path, data: bytes, *, mode: int | None = None) -> None:
+    """
+    `mode` sets the file's permissions (otherwise mkstemp's 0600); pass
+    `new_file_mode()` for files meant to look like ones written with `open()`.
+    """
+    import tempfile
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=os.fspath(path.parent))
+    try:
+        if mode is not None:
+            os.chmod(tmp, mode)
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write_text(path: Path, text: str, *, mode: int | None = None) -> None:
+    atomic_write_bytes(path, text.encode("utf-8"), mode=mode)
+
+
+def lock_path(name: str) -> Path:
+    return cache_dir() / "locks" / f"{name}.lock"
+
+
+@contextmanager
+def file_lock(path: Path, *, shared: bool = False) -> Iterator[None]:
+    """
+    Hold an advisory `flock` on `path` (created if missing) for the with-block,
+    blocking until it is granted. Separate `file_lock` calls conflict even
+    within one process. No-op where fcntl is unavailable (Windows).
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(os.fspath(path), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # Closing the descriptor releases the lock.
@@ -10,8 +10,11 @@ mkdir -p test-reports
 TS="$(date +%Y%m%d-%H%M%S)"
 LOG_FILE="${QUALITY_GATES_LOG:-test-reports/quality-gates_${TS}.log}"
 
+: >> "$LOG_FILE"
 exec > >(tee -a "$LOG_FILE") 2>&1
 echo "Logging: $LOG_FILE"
+# Index the log for "latest quality log" lookups (best-effort).
+.agent/scripts/closure_index.py record quality_log "$LOG_FILE" >/dev/null 2>&1 || true
 
 SCOPE="${1:-all}"
 
@@ -0,0 +1,142 @@
+"""
+Repository file enumeration shared by the Protocol Zero scripts.
+
+`list_files()` asks git for the file list (`git ls-files -z`, optionally plus
+untracked files that are not ignored) so vendored trees are never walked. Outside
+a git checkout, or when git fails, it falls back to an `os.scandir` walk that
+prunes PRUNE_DIRS before descending into them.
+
+Paths are returned repo-relative, POSIX-style, de-duplicated and sorted.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PRUNE_DIRS = frozenset({"node_modules", "dist", ".git"})
+
+
+def _rel_roots(roots: list[Path]) -> list[str] | None:
+    out: list[str] = []
+    for root in roots:
+        try:
+            rel = root.resolve().relative_to(REPO_ROOT)
+        except ValueError:
+            return None  # Outside the repo: git can't answer for it.
+        out.append(rel.as_posix())
+    return out
+
+
+def git_files(roots: list[Path] | None = None, *, untracked: bool = False) -> list[str] | None:
+    """Files git knows about under `roots` (whole repo if None); None if git is unavailable."""
+    cmd = ["ls-files", "-z", "--cached"]
+    if untracked:
+        cmd += ["--others", "--exclude-standard"]
+    if roots is not None:
+        rel = _rel_roots(roots)
+        if rel is None:
+            return None
+        if not rel:
+            return []
+        cmd += ["--", *rel]
+    return _git_z(cmd)
+
+
+def _git_z(args: list[str]) -> list[str] | None:
+    import subprocess
+
+    try:
+        proc = subprocess.run(
+            ["git", *args],
+            cwd=os.fspath(REPO_ROOT),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if proc.returncode != 0:
+        return None
+    return [p for p in proc.stdout.decode("utf-8", errors="surrogateescape").split("\0") if p]
+
+
+def clean_blob_ids() -> dict[str, str] | None:
+    """
+    `{path: blob sha}` from `git ls-files -s` for tracked files whose working
+    copy matches the index (files listed by `git ls-files -m` are left out, so
+    a sha always describes the bytes on disk). None if git is unavailable.
+    """
+    staged = _git_z(["ls-files", "-s", "-z"])
+    modified = _git_z(["ls-files", "-m", "-z"])
+    if staged is None or modified is None:
+        return None
+    dirty = set(modified)
+    out: dict[str, str] = {}
+    for entry in staged:
+        # "<mode> <sha> <stage>\t<path>"
+        meta, _, path = entry.partition("\t")
+        fields = meta.split()
+        if len(fields) == 3 and fields[2] == "0" and path not in dirty:
+            out[path] = fields[1]
+    return out
+
+
+def walk_files(roots: list[Path] | None = None, *, prune: frozenset[str] = PRUNE_DIRS) -> list[str]:
+    """Pruning `os.scandir` walk; directories named in `prune` are never entered."""
+    out: list[str] = []
+    stack = [os.fspath(r) for r in (roots if roots is not None else [REPO_ROOT])]
+    base = os.fspath(REPO_ROOT)
+    while stack:
+        current = stack.pop()
+        try:
+            it = os.scandir(current)
+        except NotADirectoryError:
+            if os.path.isfile(current):
+                out.append(Path(os.path.relpath(current, base)).as_posix())
+            continue
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        if entry.name not in prune:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        out.append(Path(os.path.relpath(entry.path, base)).as_posix())
+                except OSError:
+                    continue
+    return out
+
+
+def list_files(
+    roots: list[Path] | None = None,
+    *,
+    exts: set[str] | None = None,
+    untracked: bool = True,
+    prune: frozenset[str] = PRUNE_DIRS,
+) -> list[str]:
+    """
+    Existing files under `roots` (whole repo if None), filtered by lowercase
+    suffix when `exts` is given. Any path with a component in `prune` is
+    dropped whichever backend answered.
+    """
+    names = git_files(roots, untracked=untracked)
+    from_git = names is not None
+    if names is None:
+        names = walk_files(roots, prune=prune)
+
+    out: set[str] = set()
+    for name in names:
+        if exts is not None and os.path.splitext(name)[1].lower() not in exts:
+            continue
+        if prune and not prune.isdisjoint(name.split("/")):
+            continue
+        # The index can list deleted files and submodule directories.
+        if from_git and not os.path.isfile(os.path.join(REPO_ROOT, name)):
+            continue
+        out.add(name)
+    return sorted(out)
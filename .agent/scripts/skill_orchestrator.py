@@ -6,91 +6,161 @@ Selects the best-fitting skill (and its auto-chain) for a given user request,
 using `.agent/skills/project_config.yaml` as the source of truth.
 
 This script is intentionally read-only by default: it prints a selection report.
+
+`--serve` keeps the config and the skills catalog warm in a long-lived process
+that answers route queries over a Unix domain socket (JSON in, JSON out);
+`--connect` is the matching thin client used by `p0.sh route`; when no daemon
+answers it routes in-process with the text it already read.
+
+`--batch` replays JSON Lines prompts (e.g. historical logs) through the same
+matcher and streams one JSON selection per line, optionally across processes.
 """
 
 from __future__ import annotations
 
-import argparse
-import json
 import os
-import re
 import sys
-import unicodedata
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
-
-import yaml
+from typing import Any, NamedTuple
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 CONFIG_PATH = REPO_ROOT / ".agent" / "skills" / "project_config.yaml"
 SESSIONS_CURRENT = REPO_ROOT / ".agent" / "sessions" / "current"
 SESSION_ACTIVE = SESSIONS_CURRENT / "SESSION_ACTIVE"
+DEFAULT_SOCKET_PATH = REPO_ROOT / ".agent" / "cache" / "skill_orchestrator.sock"
+# `_connect` result when no daemon answers; main() then routes in-process.
+EXIT_DAEMON_UNAVAILABLE = 3
 
 
-def _normalize(text: str) -> str:
-    # Lowercase + strip accents for robust ES/EN keyword matching.
-    text = text.strip().lower()
-    text = unicodedata.normalize("NFKD", text)
-    text = "".join(ch for ch in text if not unicodedata.combining(ch))
-    return " ".join(text.split())
+_ALIAS_BOUNDARY = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
 
 
-def _normalize_phrase(text: str) -> str:
-    # Normalize punctuation to spaces for robust token-boundary matching.
-    base = _normalize(text)
-    base = "".join(ch if ch.isalnum() else " " for ch in base)
-    return " ".join(base.split())
+class _Automaton:
+    """
+    Aho-Corasick automaton over a fixed set of patterns.
 
+    `scan()` walks the text once and yields `(start, pattern)` for every
+    occurrence, overlapping ones included.
+    """
 
-def _split_skill_name_tokens(skill_name: str) -> list[str]:
-    # Convert "CodeCraft" -> ["code", "craft"], "APISync" -> ["api", "sync"].
-    token_pattern = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
-    tokens: list[str] = []
-    for chunk in re.split(r"[^A-Za-z0-9]+", skill_name):
-        if not chunk:
-            continue
-        parts = token_pattern.findall(chunk)
-        if parts:
-            tokens.extend(p.lower() for p in parts if p)
-        else:
-            tokens.append(chunk.lower())
-    return [t for t in tokens if t]
-
-
-def _skill_aliases(skill_name: str) -> list[str]:
-    aliases: set[str] = set()
-    norm_skill = _normalize_phrase(skill_name)
-    if norm_skill:
-        aliases.add(norm_skill)
-        aliases.add(norm_skill.replace(" ", ""))
-
-    tokens = _split_skill_name_tokens(skill_name)
-    if len(tokens) > 1:
-        aliases.add(" ".join(tokens))
-        aliases.add("".join(tokens))
-        aliases.add("-".join(tokens))
-        aliases.add("_".join(tokens))
-
-    # Keep only meaningful aliases to avoid accidental matches.
-    clean = []
-    for alias in aliases:
-        a = _normalize_phrase(alias)
-        if len(a) >= 3:
-            clean.append(a)
-    return sorted(set(clean), key=lambda x: (-len(x), x))
+    def __init__(self, patterns: list[str]) -> None:
+        from config_snapshot import dedupe_keep_order
+
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[str]] = [[]]
+        for pattern in dedupe_keep_order([p for p in patterns if p]):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(pattern)
+
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fallback = goto[f].get(ch, 0)
+                fail[nxt] = fallback if fallback != nxt else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def scan(self, text: str):
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern in out[state]:
+                yield i - len(pattern) + 1, pattern
+
+
+class _SkillSpec(NamedTuple):
+    skill: str
+    keywords: list[tuple[str, str]]
+    intent: str | None
+    aliases: list[str]
+
+
+class _SkillMatcher:
+    """
+    Keyword + alias matcher compiled once per loaded config.
+
+    Keyword hits are plain substrings of the normalized text; alias hits must sit
+    on `[a-z0-9]` boundaries of the phrase-normalized text. Each text is scanned
+    exactly once regardless of how many skills/keywords the config defines.
+    """
+
+    def __init__(self, routing: dict[str, Any]) -> None:
+        specs = [_SkillSpec(skill, keywords, intent, aliases) for skill, keywords, intent, aliases in routing["triggers"]]
+        self.specs = specs
+        self.default_skill: str = routing["default_skill"]
+        self.chains: dict[str, tuple[list[str], list[str]]] = routing["chains"]
+        self._keywords = _Automaton([n for s in specs for _, n in s.keywords])
+        self._aliases = _Automaton([a for s in specs for a in s.aliases])
+
+    def keyword_hits(self, norm_text: str) -> set[str]:
+        return {pattern for _, pattern in self._keywords.scan(norm_text)}
+
+    def alias_hits(self, norm_phrase_text: str) -> dict[str, int]:
+        # First boundary-respecting position per alias (same as a leftmost re.search).
+        first: dict[str, int] = {}
+        n = len(norm_phrase_text)
+        for start, alias in self._aliases.scan(norm_phrase_text):
+            if alias in first:
+                continue
+            end = start + len(alias)
+            if start > 0 and norm_phrase_text[start - 1] in _ALIAS_BOUNDARY:
+                continue
+            if end < n and norm_phrase_text[end] in _ALIAS_BOUNDARY:
+                continue
+            first[alias] = start
+        return first
+
+
+_MATCHER_CACHE: dict[int, tuple[Any, _SkillMatcher]] = {}
+_MATCHER_CACHE_MAX = 8
 
 
-def _first_alias_hit(text: str, aliases: list[str]) -> tuple[int, str] | None:
+def _register_matcher(config: dict[str, Any], routing: dict[str, Any]) -> _SkillMatcher:
+    matcher = _SkillMatcher(routing)
+    if len(_MATCHER_CACHE) >= _MATCHER_CACHE_MAX:
+        # Long-lived processes reload the config; don't pin every old copy.
+        _MATCHER_CACHE.clear()
+    _MATCHER_CACHE[id(config)] = (config, matcher)
+    return matcher
+
+
+def _matcher_for(config: dict[str, Any]) -> _SkillMatcher:
+    # Keyed by identity: a config dict loaded once is compiled once.
+    cached = _MATCHER_CACHE.get(id(config))
+    if cached is not None and cached[0] is config:
+        return cached[1]
+    from config_snapshot import routing_data
+
+    return _register_matcher(config, routing_data(config))
+
+
+def _first_alias_hit(hits: dict[str, int], aliases: list[str]) -> tuple[int, str] | None:
     best: tuple[int, int, str] | None = None
     for alias in aliases:
-        if not alias:
-            continue
-        m = re.search(rf"(?<![a-z0-9]){re.escape(alias)}(?![a-z0-9])", text)
-        if not m:
+        pos = hits.get(alias)
+        if pos is None:
             continue
-        candidate = (m.start(), -len(alias), alias)
+        candidate = (pos, -len(alias), alias)
         if best is None or candidate < best:
             best = candidate
     if best is None:
@@ -98,17 +168,6 @@ def _first_alias_hit(text: str, aliases: list[str]) -> tuple[int, str] | None:
     return best[0], best[2]
 
 
-def _dedupe_keep_order(items: list[str]) -> list[str]:
-    seen: set[str] = set()
-    out: list[str] = []
-    for item in items:
-        if item in seen:
-            continue
-        seen.add(item)
-        out.append(item)
-    return out
-
-
 def _read_text_arg(text_arg: str | None) -> str:
     if text_arg is not None and text_arg.strip():
         return text_arg
@@ -120,11 +179,12 @@ def _read_text_arg(text_arg: str | None) -> str:
 
 
 def _load_yaml(path: Path) -> dict[str, Any]:
-    with path.open("r", encoding="utf-8") as fh:
-        data = yaml.safe_load(fh)
-    if not isinstance(data, dict):
-        raise ValueError(f"Invalid YAML root object in {path}")
-    return data
+    # Served from the config snapshot; also pre-compiles the matcher for it.
+    from config_snapshot import load_snapshot
+
+    snapshot = load_snapshot(path)
+    _register_matcher(snapshot.config, snapshot.routing)
+    return snapshot.config
 
 
 def _detect_role() -> str:
@@ -135,31 +195,6 @@ def _skill_md_path(skill_name: str) -> Path:
     return REPO_ROOT / ".agent" / "skills" / skill_name / "SKILL.md"
 
 
-def _parse_frontmatter(skill_md: Path) -> dict[str, Any]:
-    """
-    Parse YAML frontmatter between the first two '---' lines.
-    Returns {} if not present.
-    """
-    try:
-        raw = skill_md.read_text(encoding="utf-8")
-    except FileNotFoundError:
-        return {}
-    lines = raw.splitlines()
-    if not lines or lines[0].strip() != "---":
-        return {}
-    try:
-        end_idx = next(i for i in range(1, len(lines)) if lines[i].strip() == "---")
-    except StopIteration:
-        return {}
-    block = "\n".join(lines[1:end_idx])
-    try:
-        meta = yaml.safe_load(block) or {}
-    except Exception:
-        # Invalid YAML frontmatter should not break orchestration.
-        return {}
-    return meta if isinstance(meta, dict) else {}
-
-
 def _impact_max(impact_field: Any) -> int | None:
     """
     Impact can be:
@@ -191,8 +226,7 @@ def _impact_max(impact_field: Any) -> int | None:
     return None
 
 
-@dataclass(frozen=True)
-class Selection:
+class Selection(NamedTuple):
     role: str
     selected_skill: str
     defaulted: bool
@@ -211,40 +245,31 @@ class Selection:
 
 
 def select_skill(config: dict[str, Any], user_text: str, *, top_n: int = 3) -> Selection:
-    orchestrator = config.get("skill_orchestrator") or {}
-    trigger_patterns = orchestrator.get("trigger_patterns") or {}
-    default_skill = orchestrator.get("default_skill") or "RealityCheck"
+    from config_snapshot import dedupe_keep_order, normalize, normalize_phrase
+    from skills_catalog import get as skill_info
 
-    norm_text = _normalize(user_text)
-    norm_phrase_text = _normalize_phrase(user_text)
+    matcher = _matcher_for(config)
+    keyword_hits = matcher.keyword_hits(normalize(user_text))
+    alias_hits = matcher.alias_hits(normalize_phrase(user_text))
     scored: list[dict[str, Any]] = []
-    for skill_name, spec in (trigger_patterns.items() if isinstance(trigger_patterns, dict) else []):
-        if not isinstance(spec, dict):
-            continue
-        keywords = spec.get("keywords") or []
-        if not isinstance(keywords, list):
-            continue
+    for spec in matcher.specs:
         matches = []
         total_len = 0
-        for kw in keywords:
-            if not isinstance(kw, str) or not kw.strip():
-                continue
-            n_kw = _normalize(kw)
-            if n_kw and n_kw in norm_text:
+        for kw, n_kw in spec.keywords:
+            if n_kw in keyword_hits:
                 matches.append(kw)
                 total_len += len(n_kw)
-        intent = spec.get("intent") if isinstance(spec.get("intent"), str) else None
-        alias_hit = _first_alias_hit(norm_phrase_text, _skill_aliases(skill_name))
+        alias_hit = _first_alias_hit(alias_hits, spec.aliases)
         explicit_alias = alias_hit[1] if alias_hit else None
         explicit_pos = alias_hit[0] if alias_hit else sys.maxsize
         if matches or explicit_alias:
             scored.append(
                 {
-                    "skill": skill_name,
+                    "skill": spec.skill,
                     "match_count": len(matches),
                     "match_len": total_len,
                     "matched_keywords": matches,
-                    "intent": intent,
+                    "intent": spec.intent,
                     "explicit_alias": explicit_alias,
                     "explicit_pos": explicit_pos,
                 }
@@ -269,26 +294,17 @@ def select_skill(config: dict[str, Any], user_text: str, *, top_n: int = 3) -> S
         selection_mode = "explicit-skill-mention" if explicit_alias else "keyword"
         defaulted = False
     else:
-        skill = default_skill
+        skill = matcher.default_skill
         matches = []
         intent = None
         explicit_alias = None
         selection_mode = "default"
         defaulted = True
 
-    graph = config.get("skill_graph") or {}
-    chains = graph.get("chains") or {}
-    chain_spec = chains.get(skill) if isinstance(chains, dict) else None
-    chain_pre_check: list[str] = []
-    chain_on_complete: list[str] = []
-    if isinstance(chain_spec, dict):
-        pre = chain_spec.get("pre_check") or []
-        on = chain_spec.get("on_complete") or []
-        if isinstance(pre, list):
-            chain_pre_check = _dedupe_keep_order([x for x in pre if isinstance(x, str)])
-        if isinstance(on, list):
-            chain_on_complete = _dedupe_keep_order([x for x in on if isinstance(x, str)])
-    chain_full = _dedupe_keep_order(chain_pre_check + [skill] + chain_on_complete)
+    chain_pre_check, chain_on_complete = matcher.chains.get(skill, ([], []))
+    chain_pre_check = list(chain_pre_check)
+    chain_on_complete = list(chain_on_complete)
+    chain_full = dedupe_keep_order(chain_pre_check + [skill] + chain_on_complete)
 
     candidates: list[dict[str, Any]] = []
     for item in scored_sorted[: max(0, top_n)]:
@@ -304,9 +320,10 @@ def select_skill(config: dict[str, Any], user_text: str, *, top_n: int = 3) -> S
         )
 
     skill_md = _skill_md_path(skill)
-    meta = _parse_frontmatter(skill_md)
-    impact_max = _impact_max(meta.get("impact"))
-    skill_role = meta.get("role") if isinstance(meta.get("role"), str) else None
+    # Served from the skills catalog (re-parsed only when SKILL.md changes).
+    info = skill_info(skill)
+    impact_max = _impact_max(info.impact if info else None)
+    skill_role = info.role if info and isinstance(info.role, str) else None
 
     return Selection(
         role=_detect_role(),
@@ -393,18 +410,298 @@ def _to_markdown(sel: Selection) -> str:
     return "\n".join(lines)
 
 
+def _selection_payload(sel: Selection) -> dict[str, Any]:
+    return {
+        "role": sel.role,
+        "selected_skill": sel.selected_skill,
+        "defaulted": sel.defaulted,
+        "selection_mode": sel.selection_mode,
+        "explicit_alias": sel.explicit_alias,
+        "matched_keywords": sel.matched_keywords,
+        "intent": sel.intent,
+        "impact_max": sel.impact_max,
+        "skill_role": sel.skill_role,
+        "chain": {
+            "pre_check": sel.chain_pre_check,
+            "on_complete": sel.chain_on_complete,
+            "full": sel.chain_full,
+        },
+        "paths": {
+            "skill_md": sel.skill_md,
+            "config": sel.config_path,
+        },
+        "candidates": sel.candidates,
+    }
+
+
+def _selection_from_payload(payload: dict[str, Any]) -> Selection:
+    chain = payload.get("chain") or {}
+    paths = payload.get("paths") or {}
+    return Selection(
+        role=payload["role"],
+        selected_skill=payload["selected_skill"],
+        defaulted=payload["defaulted"],
+        selection_mode=payload["selection_mode"],
+        explicit_alias=payload.get("explicit_alias"),
+        matched_keywords=payload.get("matched_keywords") or [],
+        intent=payload.get("intent"),
+        chain_pre_check=chain.get("pre_check") or [],
+        chain_on_complete=chain.get("on_complete") or [],
+        chain_full=chain.get("full") or [],
+        skill_md=paths.get("skill_md", ""),
+        config_path=paths.get("config", ""),
+        impact_max=payload.get("impact_max"),
+        skill_role=payload.get("skill_role"),
+        candidates=payload.get("candidates") or [],
+    )
+
+
+def _print_selection(payload: dict[str, Any], fmt: str) -> None:
+    if fmt == "json":
+        import json
+
+        print(json.dumps(payload, ensure_ascii=True, indent=2))
+    else:
+        print(_to_markdown(_selection_from_payload(payload)))
+
+
+class _WarmConfig:
+    """Config kept in memory; reloaded when the YAML's mtime changes."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._mtime_ns: int | None = None
+        self._config: dict[str, Any] = {}
+
+    def get(self) -> dict[str, Any]:
+        mtime_ns = self.path.stat().st_mtime_ns
+        if mtime_ns != self._mtime_ns:
+            self._config = _load_yaml(self.path)
+            self._mtime_ns = mtime_ns
+        return self._config
+
+
+def _serve(socket_path: Path) -> int:
+    import json
+    import signal
+    import socket
+    import socketserver
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: --serve requires Unix domain sockets.", file=sys.stderr)
+        return 2
+
+    warm = _WarmConfig(CONFIG_PATH)
+    try:
+        warm.get()
+    except Exception as exc:
+        print(f"Error: failed to load config: {exc}", file=sys.stderr)
+        return 2
+
+    if socket_path.exists() or socket_path.is_symlink():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(os.fspath(socket_path))
+        except OSError:
+            socket_path.unlink()  # Stale socket from a daemon that died.
+        else:
+            print(f"Error: a daemon is already listening on {socket_path}", file=sys.stderr)
+            return 2
+        finally:
+            probe.close()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            try:
+                request = json.loads(self.rfile.readline() or b"{}")
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+                text = request.get("text")
+                if not isinstance(text, str) or not text.strip():
+                    raise ValueError("missing request text")
+                top = request.get("top", 3)
+                top_n = max(0, top) if isinstance(top, int) else 3
+                response = _selection_payload(select_skill(warm.get(), text, top_n=top_n))
+            except Exception as exc:
+                response = {"error": str(exc)}
+            self.wfile.write(json.dumps(response, ensure_ascii=True).encode("utf-8") + b"\n")
+
+    def _stop(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+    server = socketserver.UnixStreamServer(os.fspath(socket_path), Handler)
+    print(f"Listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            socket_path.unlink()
+        except FileNotFoundError:
+            pass
+    return 0
+
+
+def _connect(socket_path: Path, text: str, *, top_n: int, fmt: str) -> int:
+    import json
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        return EXIT_DAEMON_UNAVAILABLE
+    request = json.dumps({"text": text, "top": top_n}, ensure_ascii=True).encode("utf-8") + b"\n"
+    chunks: list[bytes] = []
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(10)
+            sock.connect(os.fspath(socket_path))
+            sock.sendall(request)
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        payload = json.loads(b"".join(chunks))
+    except (OSError, ValueError):
+        return EXIT_DAEMON_UNAVAILABLE
+    if not isinstance(payload, dict):
+        return EXIT_DAEMON_UNAVAILABLE
+    if "error" in payload:
+        print(f"Error: {payload['error']}", file=sys.stderr)
+        return 2
+    _print_selection(payload, fmt)
+    return 0
+
+
+_BATCH_CONFIG: dict[str, Any] | None = None
+
+
+def _batch_worker_init() -> None:
+    global _BATCH_CONFIG
+    _BATCH_CONFIG = _load_yaml(CONFIG_PATH)
+
+
+def _route_batch_chunk(chunk: list[tuple[int, str]], top_n: int) -> list[str]:
+    """Route one chunk of `(line_no, raw_line)`; returns one JSON line per prompt."""
+    import json
+
+    config = _BATCH_CONFIG if _BATCH_CONFIG is not None else {}
+    out: list[str] = []
+    for line_no, raw in chunk:
+        try:
+            item = json.loads(raw)
+            text = item.get("text") if isinstance(item, dict) else item
+            if not isinstance(text, str):
+                raise ValueError("expected a JSON string or an object with a 'text' string")
+            payload = _selection_payload(select_skill(config, text, top_n=top_n))
+        except Exception as exc:
+            payload = {"error": str(exc), "line": line_no}
+        out.append(json.dumps(payload, ensure_ascii=True))
+    return out
+
+
+def _iter_batch_chunks(fh: Any, chunk_size: int):
+    chunk: list[tuple[int, str]] = []
+    for line_no, raw in enumerate(fh, start=1):
+        if not raw.strip():
+            continue
+        chunk.append((line_no, raw))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _run_batch(source: str, *, top_n: int, workers: int, chunk_size: int = 256) -> int:
+    from collections import deque
+
+    fh = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    write = sys.stdout.write
+    try:
+        chunks = _iter_batch_chunks(fh, chunk_size)
+        if workers <= 1:
+            _batch_worker_init()
+            for chunk in chunks:
+                for line in _route_batch_chunk(chunk, top_n):
+                    write(line + "\n")
+            return 0
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Bounded window of in-flight chunks: constant memory, output in input order.
+        with ProcessPoolExecutor(max_workers=workers, initializer=_batch_worker_init) as pool:
+            pending: deque[Any] = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_route_batch_chunk, chunk, top_n))
+                if len(pending) >= workers * 4:
+                    for line in pending.popleft().result():
+                        write(line + "\n")
+            while pending:
+                for line in pending.popleft().result():
+                    write(line + "\n")
+        return 0
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
 def main(argv: list[str]) -> int:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Protocol Zero skill orchestrator")
     parser.add_argument("text", nargs="?", help="User request text. If omitted, read stdin.")
     parser.add_argument("--format", choices=["markdown", "json"], default="markdown")
     parser.add_argument("--top", type=int, default=3, help="How many candidate skills to show (default: 3)")
+    parser.add_argument(
+        "--socket",
+        default=os.environ.get("P0_ROUTE_SOCKET") or os.fspath(DEFAULT_SOCKET_PATH),
+        help="Unix socket used by --serve/--connect (default: $P0_ROUTE_SOCKET or .agent/cache/skill_orchestrator.sock).",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--serve", action="store_true", help="Run as a routing daemon with a warm config.")
+    mode.add_argument(
+        "--connect",
+        action="store_true",
+        help="Route via a running daemon; route in-process if none answers.",
+    )
+    mode.add_argument(
+        "--batch",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="Route JSON Lines prompts (strings or {\"text\": ...}) from FILE or stdin; one JSON selection per line.",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for --batch (default: 1).")
     args = parser.parse_args(argv)
 
+    if args.serve:
+        return _serve(Path(args.socket))
+
+    if args.batch is not None:
+        if not CONFIG_PATH.exists():
+            print(f"Error: missing config at {CONFIG_PATH}", file=sys.stderr)
+            return 2
+        try:
+            return _run_batch(args.batch, top_n=max(0, args.top), workers=args.workers)
+        except Exception as exc:
+            print(f"Error: batch failed: {exc}", file=sys.stderr)
+            return 2
+
     text = _read_text_arg(args.text)
     if not text:
         print("Error: missing request text (arg or stdin).", file=sys.stderr)
         return 2
 
+    if args.connect:
+        rc = _connect(Path(args.socket), text, top_n=max(0, args.top), fmt=args.format)
+        if rc != EXIT_DAEMON_UNAVAILABLE:
+            return rc
+        # No daemon: stdin is already consumed, so route `text` here rather than in the caller.
+
     if not CONFIG_PATH.exists():
         print(f"Error: missing config at {CONFIG_PATH}", file=sys.stderr)
         return 2
@@ -416,31 +713,7 @@ def main(argv: list[str]) -> int:
         return 2
 
     sel = select_skill(config, text, top_n=max(0, args.top))
-    if args.format == "json":
-        payload = {
-            "role": sel.role,
-            "selected_skill": sel.selected_skill,
-            "defaulted": sel.defaulted,
-            "selection_mode": sel.selection_mode,
-            "explicit_alias": sel.explicit_alias,
-            "matched_keywords": sel.matched_keywords,
-            "intent": sel.intent,
-            "impact_max": sel.impact_max,
-            "skill_role": sel.skill_role,
-            "chain": {
-                "pre_check": sel.chain_pre_check,
-                "on_complete": sel.chain_on_complete,
-                "full": sel.chain_full,
-            },
-            "paths": {
-                "skill_md": sel.skill_md,
-                "config": sel.config_path,
-            },
-            "candidates": sel.candidates,
-        }
-        print(json.dumps(payload, ensure_ascii=True, indent=2))
-    else:
-        print(_to_markdown(sel))
+    _print_selection(_selection_payload(sel), args.format)
     return 0
 
 
@@ -0,0 +1,230 @@
+"""
+Catalog of the `.agent/skills/<Skill>/SKILL.md` files (frontmatter + shape).
+
+`load()` returns one `SkillInfo` per skill directory: the frontmatter fields the
+scripts use (name, description, role, impact), the list of frontmatter keys,
+the line count, which SECTION_MARKERS the body contains and the SHA-256 of the
+file (a stable content key for per-skill result caches). The catalog is
+persisted as a pickle under the P0 cache dir; each entry is keyed by its
+SKILL.md (mtime_ns, size), so a warm run only stats the files and re-reads the
+ones that changed (on a thread pool when several did). Warm runs never import
+yaml.
+
+Frontmatter is the block between a leading `---` line and the next `---` line.
+It is located by reading the head of the file in small chunks (never splitting
+the whole document) and parsed with libyaml's CSafeLoader when available. A
+missing, unterminated or invalid block yields `frontmatter=False`.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import stat
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import p0_fs
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SKILLS_ROOT = REPO_ROOT / ".agent" / "skills"
+# Bump whenever parsing or the SkillInfo layout changes (invalidates the cache).
+CATALOG_VERSION = 2
+# Body substrings whose presence is recorded per skill (lint_skills checks them).
+SECTION_MARKERS = ("## Guardrails", "## Activacion")
+HEAD_CHUNK = 4096
+# Frontmatter blocks that don't close within this many bytes are treated as missing.
+HEAD_MAX = 64 * 1024
+
+
+class SkillInfo(NamedTuple):
+    skill: str  # directory name
+    path: str  # repo-relative SKILL.md
+    frontmatter: bool  # a non-empty YAML mapping was found
+    name: Any
+    description: Any
+    role: Any
+    impact: Any
+    keys: tuple[str, ...]  # frontmatter keys, in file order
+    lines: int
+    sections: tuple[str, ...]  # SECTION_MARKERS present in the file
+    sha256: str
+    mtime_ns: int
+    size: int
+
+
+def _split_head(fh: Any) -> tuple[str | None, bytes]:
+    """
+    Read `fh` until the frontmatter block closes. Returns (block text or None,
+    bytes consumed so far); the caller reads the rest if it needs it.
+    """
+    buf = b""
+    while True:
+        chunk = fh.read(HEAD_CHUNK)
+        buf += chunk
+        eof = not chunk
+        lines = buf.decode("utf-8", errors="replace").splitlines(keepends=True)
+        if not eof and lines:
+            lines.pop()  # May be incomplete (or a split multibyte char / CRLF).
+        if lines:
+            if lines[0].strip() != "---":
+                return None, buf
+            for i in range(1, len(lines)):
+                if lines[i].strip() == "---":
+                    return "".join(lines[1:i]), buf
+        if eof or len(buf) > HEAD_MAX:
+            return None, buf
+
+
+def _parse_block(block: str | None) -> dict[str, Any]:
+    if block is None:
+        return {}
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        meta = yaml.load(block, Loader=loader) or {}
+    except Exception:
+        return {}  # Invalid frontmatter is reported, not raised.
+    return meta if isinstance(meta, dict) else {}
+
+
+def _scan_skill(skill_dir: Path, st: os.stat_result) -> SkillInfo:
+    import hashlib
+
+    skill_md = skill_dir / "SKILL.md"
+    with open(skill_md, "rb") as fh:
+        block, head = _split_head(fh)
+        data = head + fh.read()
+    meta = _parse_block(block)
+    text = data.decode("utf-8", errors="replace")
+    return SkillInfo(
+        skill=skill_dir.name,
+        path=skill_md.relative_to(REPO_ROOT).as_posix() if skill_md.is_relative_to(REPO_ROOT) else os.fspath(skill_md),
+        frontmatter=bool(meta),
+        name=meta.get("name"),
+        description=meta.get("description"),
+        role=meta.get("role"),
+        impact=meta.get("impact"),
+        keys=tuple(str(k) for k in meta),
+        lines=len(text.splitlines()),
+        sections=tuple(m for m in SECTION_MARKERS if m in text),
+        sha256=hashlib.sha256(data).hexdigest(),
+        mtime_ns=st.st_mtime_ns,
+        size=st.st_size,
+    )
+
+
+def _index_path(root: Path) -> Path:
+    import hashlib
+
+    tag = hashlib.sha1(os.fspath(root.resolve()).encode("utf-8")).hexdigest()[:12]
+    return p0_fs.cache_dir() / f"skills_catalog.{tag}.pickle"
+
+
+def _index_key() -> tuple[Any, ...]:
+    return (CATALOG_VERSION, SECTION_MARKERS, HEAD_MAX)
+
+
+# root -> {skill: SkillInfo}; lets long-lived processes skip the pickle.
+_MEMO: dict[Path, dict[str, SkillInfo]] = {}
+
+
+def _cached(root: Path) -> dict[str, SkillInfo]:
+    memo = _MEMO.get(root)
+    if memo is not None:
+        return memo
+    if p0_fs.cache_disabled():
+        return {}
+    try:
+        payload = pickle.loads(_index_path(root).read_bytes())
+        if isinstance(payload, dict) and payload.get("key") == _index_key():
+            # Stored as plain tuples so the pickle never references this module.
+            memo = {t[0]: SkillInfo(*t) for t in payload["skills"]}
+            _MEMO[root] = memo
+            return memo
+    except Exception:
+        pass  # Missing/corrupt/foreign index: rebuilt by the caller.
+    return {}
+
+
+def _store(root: Path, skills: dict[str, SkillInfo]) -> None:
+    _MEMO[root] = skills
+    if p0_fs.cache_disabled():
+        return
+    try:
+        payload = {"key": _index_key(), "skills": [tuple(info) for info in skills.values()]}
+        p0_fs.atomic_write_bytes(_index_path(root), pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass  # Read-only checkout: stay uncached.
+
+
+def _fresh(info: SkillInfo | None, st: os.stat_result) -> bool:
+    return info is not None and info.mtime_ns == st.st_mtime_ns and info.size == st.st_size
+
+
+def _scan_or_none(skill_dir: Path, st: os.stat_result) -> SkillInfo | None:
+    try:
+        return _scan_skill(skill_dir, st)
+    except OSError:
+        return None
+
+
+def load(root: Path = SKILLS_ROOT, *, jobs: int | None = None) -> dict[str, SkillInfo]:
+    """
+    `{skill dir name: SkillInfo}` for every non-hidden directory under `root`
+    that has a SKILL.md, ordered by lowercase name. Stale entries are re-read
+    on up to `jobs` threads (default: the executor's default).
+    """
+    cached = _cached(root)
+    found: list[tuple[str, os.stat_result]] = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                try:
+                    st = os.stat(os.path.join(entry.path, "SKILL.md"))
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    found.append((entry.name, st))
+    except OSError:
+        return {}
+
+    found.sort(key=lambda x: x[0].lower())
+    stale = [(name, st) for name, st in found if not _fresh(cached.get(name), st)]
+    scanned: dict[str, SkillInfo | None] = {}
+    if len(stale) > 1 and jobs != 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            infos = pool.map(lambda item: _scan_or_none(root / item[0], item[1]), stale)
+            scanned = dict(zip((name for name, _ in stale), infos))
+    else:
+        scanned = {name: _scan_or_none(root / name, st) for name, st in stale}
+
+    out: dict[str, SkillInfo] = {}
+    for name, _ in found:
+        info = scanned[name] if name in scanned else cached[name]
+        if info is not None:
+            out[name] = info
+    if stale or len(out) != len(cached):
+        _store(root, out)
+    else:
+        _MEMO[root] = out
+    return out
+
+
+def get(skill: str, root: Path = SKILLS_ROOT) -> SkillInfo | None:
+    """One skill's entry (None if it has no SKILL.md); only that file is checked."""
+    skill_md = root / skill / "SKILL.md"
+    try:
+        st = skill_md.stat()
+    except OSError:
+        return None
+    info = _cached(root).get(skill)
+    if _fresh(info, st):
+        return info
+    return load(root).get(skill)
@@ -0,0 +1,134 @@
+"""
+Single-pass, in-process multi-pattern source scanner (the ripgrep subset the
+extraction reports need).
+
+Each `ScanRule` names a regex, the repo paths it covers, an optional suffix
+filter (case-sensitive, like `rg --glob '*.ts'`), excluded path prefixes, and
+whether it reports matching lines (`rg -n`: `path:line:text`) or filenames only
+(`rg -l`). `scan()` enumerates the union of all rule roots once through
+`repo_files` (git-aware, so ignored files never show up), reads each file once
+on a thread pool and applies every rule that covers it.
+
+rg defaults that are kept: hidden files/directories are skipped, files with a
+NUL byte are treated as binary and skipped, matching is case-sensitive and a
+line is reported once however many matches it has. Unlike rg, output is sorted
+by path (then line), so it is stable from run to run.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+# Bump whenever matching or output semantics change (cache keys include it).
+SCANNER_VERSION = 1
+
+
+class ScanRule(NamedTuple):
+    name: str
+    pattern: str
+    roots: tuple[str, ...]
+    exts: frozenset[str] | None = None
+    exclude: tuple[str, ...] = ()
+    files_only: bool = False
+    # Substrings every match contains (any one of them); files with none of
+    # them are skipped without running the regex, like rg's literal prefilter.
+    literals: tuple[str, ...] = ()
+
+
+def _under(path: str, prefixes: tuple[str, ...]) -> bool:
+    return any(path == p or path.startswith(p + "/") for p in prefixes)
+
+
+def _hidden(path: str) -> bool:
+    return any(part.startswith(".") for part in path.split("/"))
+
+
+def _match_lines(rel: str, data: bytes, rx: re.Pattern[bytes]) -> list[str]:
+    out: list[str] = []
+    line_end = -1
+    counted = 0
+    lineno = 1
+    for m in rx.finditer(data):
+        if m.start() <= line_end:
+            continue  # Already reported this line.
+        start = data.rfind(b"\n", 0, m.start()) + 1
+        line_end = data.find(b"\n", m.start())
+        if line_end < 0:
+            line_end = len(data)
+        lineno += data.count(b"\n", counted, start)
+        counted = start
+        out.append(f"{rel}:{lineno}:{data[start:line_end].decode('utf-8', errors='replace')}")
+    return out
+
+
+def _scan_file(rel: str, rules: list[tuple[ScanRule, re.Pattern[bytes]]]) -> dict[str, list[str]]:
+    try:
+        data = (REPO_ROOT / rel).read_bytes()
+    except OSError:
+        return {}
+    if b"\0" in data:
+        return {}
+    hits: dict[str, list[str]] = {}
+    for rule, rx in rules:
+        if rule.literals and not any(lit.encode("utf-8") in data for lit in rule.literals):
+            continue
+        if rule.files_only:
+            if rx.search(data):
+                hits[rule.name] = [rel]
+        else:
+            lines = _match_lines(rel, data, rx)
+            if lines:
+                hits[rule.name] = lines
+    return hits
+
+
+def fingerprint(rules: list[ScanRule]) -> str:
+    """Stable identity of a rule set, for result caches."""
+    import hashlib
+
+    h = hashlib.sha256(f"scanner={SCANNER_VERSION}\n".encode("utf-8"))
+    for rule in rules:
+        h.update(repr((rule.name, rule.pattern, rule.roots, sorted(rule.exts or ()), rule.exclude, rule.files_only, rule.literals)).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def scan(rules: list[ScanRule], *, jobs: int | None = None) -> dict[str, list[str]]:
+    """
+    `{rule name: output lines}` for every rule (empty list when nothing
+    matched). Files are enumerated and read once, whatever the number of rules.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from repo_files import list_files
+
+    compiled = [(rule, re.compile(rule.pattern.encode("utf-8"))) for rule in rules]
+    roots = sorted({root for rule in rules for root in rule.roots})
+    files = list_files([REPO_ROOT / r for r in roots if (REPO_ROOT / r).exists()])
+
+    work: list[tuple[str, list[tuple[ScanRule, re.Pattern[bytes]]]]] = []
+    for rel in files:
+        if _hidden(rel):
+            continue
+        ext = os.path.splitext(rel)[1]
+        applicable = [
+            (rule, rx)
+            for rule, rx in compiled
+            if _under(rel, rule.roots)
+            and not _under(rel, rule.exclude)
+            and (rule.exts is None or ext in rule.exts)
+        ]
+        if applicable:
+            work.append((rel, applicable))
+
+    out: dict[str, list[str]] = {rule.name: [] for rule in rules}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # map() keeps input (sorted path) order.
+        for hits in pool.map(lambda item: _scan_file(*item), work):
+            for name, lines in hits.items():
+                out[name].extend(lines)
+    return out
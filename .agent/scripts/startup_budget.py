@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Cold-start import budget for the `.agent/scripts` entry points.
+
+Each entry point (any script with a `__main__` guard) is imported in a fresh
+interpreter with `-X importtime`; its cumulative import time is compared with
+the budget (default 60 ms, override with `--budget-ms` or
+`P0_STARTUP_BUDGET_MS`). Exits 1 if any script is over budget.
+
+With `P0_IMPORT_PROFILE=1` (or `--profile`) the raw `-X importtime` output of
+each script is written to `test-reports/importtime/<script>.log`.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROFILE_DIR = REPO_ROOT / "test-reports" / "importtime"
+DEFAULT_BUDGET_MS = 60.0
+
+
+def _entry_points() -> list[Path]:
+    out: list[Path] = []
+    for p in sorted(SCRIPTS_DIR.glob("*.py"), key=lambda x: x.name.lower()):
+        try:
+            text = p.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        if 'if __name__ == "__main__":' in text:
+            out.append(p)
+    return out
+
+
+def _import_time_us(script: Path) -> tuple[int | None, str]:
+    """Return (cumulative import time in us, raw importtime output) for one cold import."""
+    import subprocess
+
+    module = script.stem
+    code = f"import sys; sys.path.insert(0, {os.fspath(script.parent)!r}); import {module}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=os.fspath(REPO_ROOT),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    raw = proc.stderr or ""
+    if proc.returncode != 0:
+        return None, raw
+    for line in reversed(raw.splitlines()):
+        # "import time: <self us> | <cumulative us> | <name>" (top level: one space before the name).
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2] == f" {module}":
+            return int(parts[1].strip()), raw
+    return None, raw
+
+
+def main(argv: list[str]) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check cold-start import time of .agent/scripts entry points")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.environ.get("P0_STARTUP_BUDGET_MS") or DEFAULT_BUDGET_MS),
+        help=f"Per-script import budget in ms (default: $P0_STARTUP_BUDGET_MS or {DEFAULT_BUDGET_MS:g}).",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Cold imports per script; the fastest counts (default: 3).")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=os.environ.get("P0_IMPORT_PROFILE") == "1",
+        help="Write raw -X importtime output to test-reports/importtime/ (default: on if P0_IMPORT_PROFILE=1).",
+    )
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args(argv)
+
+    results: list[dict[str, object]] = []
+    for script in _entry_points():
+        best_us: int | None = None
+        best_raw = ""
+        for _ in range(max(1, args.runs)):
+            us, raw = _import_time_us(script)
+            if us is not None and (best_us is None or us < best_us):
+                best_us, best_raw = us, raw
+            elif best_us is None:
+                best_raw = raw
+        if args.profile:
+            PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            (PROFILE_DIR / f"{script.stem}.log").write_text(best_raw, encoding="utf-8")
+        ms = best_us / 1000.0 if best_us is not None else None
+        status = "ERROR" if ms is None else ("OK" if ms <= args.budget_ms else "FAIL")
+        results.append({"script": script.name, "import_ms": ms, "status": status})
+
+    failed = [r for r in results if r["status"] != "OK"]
+    if args.format == "json":
+        import json
+
+        print(json.dumps({"budget_ms": args.budget_ms, "results": results}, ensure_ascii=True, indent=2))
+    else:
+        width = max((len(str(r["script"])) for r in results), default=0)
+        for r in results:
+            ms = r["import_ms"]
+            timing = f"{ms:7.1f} ms" if isinstance(ms, float) else "  import failed"
+            print(f"{r['status']:<5} {str(r['script']):<{width}} {timing}")
+        if args.profile:
+            print(f"Profiles: {os.fspath(PROFILE_DIR.relative_to(REPO_ROOT))}/")
+        if failed:
+            print(f"FAIL: {len(failed)} script(s) over the {args.budget_ms:g} ms import budget", file=sys.stderr)
+        else:
+            print(f"OK: all entry points import within {args.budget_ms:g} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -8,21 +8,35 @@ Default mode creates symlinks:
 
 This is idempotent and non-destructive:
 - If the destination exists and already points to the right target, it's left as-is.
-- If the destination exists and is different, it's skipped (unless --force for symlinks).
+- If the destination exists and is different, it's skipped (unless --force; see copy mode below).
+
+`--mode copy` (for filesystems without symlinks) keeps each copy in sync
+incrementally, rsync-style. A `.p0-sync.json` manifest in the copied skill
+records path, size, mtime and SHA-256 of every file. A file is transferred only
+when its size/mtime (then, if needed, its hash) changed, as a reflink when the
+filesystem supports it, else a plain copy (each via temp file + rename). Never a
+hardlink: the copy is writable, and an in-place edit or chmod would silently
+change the tracked file. Files and directories deleted upstream are removed.
+Directories without a manifest are not ours: they are skipped unless --force
+adopts them, which deletes everything in them that is not in the source.
+Skills are synced on a thread pool.
 """
 
 from __future__ import annotations
 
-import argparse
 import os
-import shutil
+import stat
 import sys
-from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, NamedTuple
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 PROJECT_SKILLS_ROOT = REPO_ROOT / ".agent" / "skills"
+SYNC_MANIFEST = ".p0-sync.json"
+MANIFEST_VERSION = 1
+# Linux FICLONE ioctl (btrfs, XFS, bcachefs...): copy-on-write clone of a file.
+_FICLONE = 0x40049409
 
 
 def _codex_home() -> Path:
@@ -44,9 +58,9 @@ def _rel(path: Path) -> str:
         return os.fspath(path)
 
 
-@dataclass(frozen=True)
-class Result:
+class Result(NamedTuple):
     created: list[str]
+    updated: list[str]
     ok: list[str]
     skipped: list[str]
 
@@ -55,59 +69,248 @@ def _ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def _link_or_copy(src: Path, dest: Path, *, mode: str, force: bool) -> str:
-    if dest.exists() or dest.is_symlink():
-        # Handle already-correct symlink.
-        if dest.is_symlink():
+def _sha256(path: str) -> str:
+    import hashlib
+
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _source_tree(src: Path) -> tuple[dict[str, os.stat_result], set[str]]:
+    """(files, directories) under `src`, as shutil.copytree sees them (symlinks followed)."""
+    out: dict[str, os.stat_result] = {}
+    dirs: set[str] = set()
+    for dirpath, dirnames, filenames in os.walk(src, followlinks=True):
+        for name in dirnames:
+            dirs.add(Path(os.path.relpath(os.path.join(dirpath, name), src)).as_posix())
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                out[Path(os.path.relpath(path, src)).as_posix()] = st
+    out.pop(SYNC_MANIFEST, None)
+    return out, dirs
+
+
+def _load_manifest(dest: Path, src: Path) -> dict[str, Any] | None:
+    import json
+
+    try:
+        data = json.loads((dest / SYNC_MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != MANIFEST_VERSION
+        or data.get("source") != os.fspath(src.resolve())
+        or not isinstance(data.get("files"), dict)
+    ):
+        return None
+    return data["files"]
+
+
+def _reflink(src: str, tmp: str) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+    import shutil
+
+    with open(src, "rb") as s, open(tmp, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        except OSError:
+            return False
+    shutil.copystat(src, tmp)
+    return True
+
+
+# Destination roots where a reflink failed once; not retried for every file.
+_NO_REFLINK: set[str] = set()
+
+
+def _transfer(src: str, dest: str, dest_root: str) -> None:
+    """Replace `dest` with `src`'s content: reflink, else copy."""
+    import shutil
+
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    if os.path.isdir(dest) and not os.path.islink(dest):
+        shutil.rmtree(dest)
+    tmp = os.path.join(os.path.dirname(dest), f".{os.path.basename(dest)}.p0-sync.tmp")
+    try:
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+        cloned = False
+        if dest_root not in _NO_REFLINK:
             try:
-                target = dest.resolve()
-            except FileNotFoundError:
-                target = None
-            if target is not None and target == src.resolve():
-                return "ok"
-            if force:
-                dest.unlink()
-            else:
-                return "skipped"
+                cloned = _reflink(src, tmp)
+            except OSError:
+                pass
+            if not cloned:
+                _NO_REFLINK.add(dest_root)
+        if not cloned:
+            if os.path.lexists(tmp):
+                os.unlink(tmp)
+            shutil.copy2(src, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _same_content(src: str, src_st: os.stat_result, dest: str, prev: Any) -> tuple[bool, str | None]:
+    """(dest already holds src's bytes?, src sha256 if it had to be computed)."""
+    try:
+        dst = os.lstat(dest)
+    except OSError:
+        return False, None
+    if not stat.S_ISREG(dst.st_mode):
+        return False, None
+    if (dst.st_dev, dst.st_ino) == (src_st.st_dev, src_st.st_ino):
+        return False, None  # Hardlinked by an older sync: break the link.
+    if dst.st_size != src_st.st_size:
+        return False, None
+    if (
+        isinstance(prev, dict)
+        and prev.get("size") == src_st.st_size
+        and prev.get("mtime_ns") == src_st.st_mtime_ns
+        and dst.st_mtime_ns == src_st.st_mtime_ns
+    ):
+        return True, None
+    # Same size but touched (or never synced by us): compare content.
+    sha = _sha256(src)
+    return sha == _sha256(dest), sha
+
+
+def _sync_copy(src: Path, dest: Path, files: dict[str, Any] | None) -> tuple[int, int]:
+    """Make `dest` mirror `src`; returns (files transferred, files removed)."""
+    import json
+    import shutil
+
+    import p0_fs
+
+    prev_files = files or {}
+    manifest: dict[str, Any] = {}
+    copied = 0
+    dest_root = os.fspath(dest.parent)
+    src_files, src_dirs = _source_tree(src)
+    for rel in sorted(src_dirs):
+        path = os.path.join(dest, rel)
+        if os.path.islink(path) or (os.path.lexists(path) and not os.path.isdir(path)):
+            os.unlink(path)
+        os.makedirs(path, exist_ok=True)
+    for rel, st in sorted(src_files.items()):
+        src_path = os.path.join(src, rel)
+        dest_path = os.path.join(dest, rel)
+        prev = prev_files.get(rel)
+        same, sha = _same_content(src_path, st, dest_path, prev)
+        if same:
+            if os.lstat(dest_path).st_mtime_ns != st.st_mtime_ns:
+                shutil.copystat(src_path, dest_path)  # Keep the quick check cheap next time.
         else:
-            return "skipped"
+            _transfer(src_path, dest_path, dest_root)
+            copied += 1
+        if sha is None:
+            unchanged = isinstance(prev, dict) and prev.get("size") == st.st_size and prev.get("mtime_ns") == st.st_mtime_ns
+            sha = prev["sha256"] if unchanged and isinstance(prev.get("sha256"), str) else _sha256(src_path)
+        manifest[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha}
+
+    removed = 0
+    for dirpath, dirnames, filenames in os.walk(dest, topdown=False):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            rel = Path(os.path.relpath(path, dest)).as_posix()
+            if rel != SYNC_MANIFEST and rel not in manifest:
+                os.unlink(path)
+                removed += 1
+        for name in dirnames:
+            path = os.path.join(dirpath, name)
+            if os.path.islink(path):
+                os.unlink(path)
+                removed += 1
+            elif Path(os.path.relpath(path, dest)).as_posix() not in src_dirs:
+                os.rmdir(path)  # Emptied above (bottom-up walk).
+
+    if copied or removed or manifest != prev_files or files is None:
+        payload = {"version": MANIFEST_VERSION, "source": os.fspath(src.resolve()), "files": manifest}
+        text = json.dumps(payload, ensure_ascii=True, indent=2) + "\n"
+        p0_fs.atomic_write_text(dest / SYNC_MANIFEST, text, mode=p0_fs.new_file_mode())
+    return copied, removed
+
+
+def _link_or_copy(src: Path, dest: Path, *, mode: str, force: bool) -> tuple[str, str]:
+    """(status, detail) where status is created/updated/ok/skipped."""
+    if dest.is_symlink():
+        # Handle already-correct symlink.
+        try:
+            target = dest.resolve()
+        except (FileNotFoundError, RuntimeError):
+            target = None
+        if target is not None and target == src.resolve():
+            return "ok", ""
+        if not force:
+            return "skipped", ""
+        dest.unlink()
+    elif dest.exists():
+        if mode != "copy" or not dest.is_dir():
+            return "skipped", ""
+        files = _load_manifest(dest, src)
+        if files is None and not force:
+            return "skipped", "not a synced copy; --force adopts it"
+        copied, removed = _sync_copy(src, dest, files)
+        if not copied and not removed:
+            return "ok", ""
+        return "updated", f"{copied} copied, {removed} removed"
 
     if mode == "copy":
-        shutil.copytree(src, dest)
-    else:
-        dest.symlink_to(src, target_is_directory=True)
-    return "created"
+        dest.mkdir()
+        copied, _ = _sync_copy(src, dest, None)
+        return "created", f"{copied} files"
+    dest.symlink_to(src, target_is_directory=True)
+    return "created", ""
 
 
-def sync(*, mode: str, force: bool) -> Result:
+def sync(*, mode: str, force: bool, jobs: int | None = None) -> Result:
+    from concurrent.futures import ThreadPoolExecutor
+
     if not PROJECT_SKILLS_ROOT.is_dir():
         raise RuntimeError(f"Missing skills root: {PROJECT_SKILLS_ROOT}")
 
-    _ensure_dir(_dest_root())
-
-    created: list[str] = []
-    ok: list[str] = []
-    skipped: list[str] = []
-
-    for child in sorted(PROJECT_SKILLS_ROOT.iterdir(), key=lambda p: p.name.lower()):
-        if child.name.startswith("."):
-            continue
-        if not _is_skill_dir(child):
-            continue
-        dest = _dest_root() / child.name
-        status = _link_or_copy(child, dest, mode=mode, force=force)
-        msg = f"{child.name}: {status} ({_rel(child)} -> {dest})"
-        if status == "created":
-            created.append(msg)
-        elif status == "ok":
-            ok.append(msg)
-        else:
-            skipped.append(msg)
+    dest_root = _dest_root()
+    _ensure_dir(dest_root)
 
-    return Result(created=created, ok=ok, skipped=skipped)
+    children = [
+        child
+        for child in sorted(PROJECT_SKILLS_ROOT.iterdir(), key=lambda p: p.name.lower())
+        if not child.name.startswith(".") and _is_skill_dir(child)
+    ]
+
+    def one(child: Path) -> tuple[str, str]:
+        try:
+            return _link_or_copy(child, dest_root / child.name, mode=mode, force=force)
+        except OSError as exc:
+            return "skipped", f"error: {exc}"
+
+    result = Result(created=[], updated=[], ok=[], skipped=[])
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # map() keeps the sorted skill order.
+        for child, (status, detail) in zip(children, pool.map(one, children)):
+            msg = f"{child.name}: {status} ({_rel(child)} -> {dest_root / child.name})"
+            if detail:
+                msg += f" [{detail}]"
+            getattr(result, status).append(msg)
+    return result
 
 
 def main(argv: list[str]) -> int:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Sync repo skills into $CODEX_HOME/skills")
     parser.add_argument(
         "--mode",
@@ -118,18 +321,25 @@ def main(argv: list[str]) -> int:
     parser.add_argument(
         "--force",
         action="store_true",
-        help="Replace existing destination symlinks that point elsewhere (never deletes real dirs).",
+        help=(
+            "Replace existing destination symlinks that point elsewhere; in copy mode, also adopt "
+            "directories without a sync manifest, deleting the files and subdirectories in them that "
+            "are not in the source."
+        ),
     )
+    parser.add_argument("--jobs", type=int, default=None, help="Skills synced in parallel (default: auto).")
     args = parser.parse_args(argv)
 
     try:
-        res = sync(mode=args.mode, force=args.force)
+        res = sync(mode=args.mode, force=args.force, jobs=args.jobs)
     except Exception as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return 2
 
     for line in res.created:
         print(line)
+    for line in res.updated:
+        print(line)
     for line in res.ok:
         print(line)
     for line in res.skipped:
@@ -137,7 +347,7 @@ def main(argv: list[str]) -> int:
 
     if res.skipped:
         print(
-            f"Skipped {len(res.skipped)} skill(s). Use --force only for symlinks if needed.",
+            f"Skipped {len(res.skipped)} skill(s). Use --force only if the destination is safe to replace.",
             file=sys.stderr,
         )
     return 0
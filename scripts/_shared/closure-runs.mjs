@@ -0,0 +1,54 @@
+import { promises as fs } from 'node:fs';
+import path from 'node:path';
+
+/**
+ * Closure reports are referenced as `{ run, name, rel }`: `rel` is relative to
+ * docs/closure and `run` is the per-run directory under docs/closure/runs/
+ * (null for files in the closure root).
+ */
+export function rootRef(name) {
+  return { run: null, name, rel: name };
+}
+
+/** Every file under docs/closure/runs/<run>/ (extract_reports writes one dir per run). */
+export async function listRunFiles(closureDir) {
+  const runsDir = path.join(closureDir, 'runs');
+  let runs;
+  try {
+    runs = await fs.readdir(runsDir, { withFileTypes: true });
+  } catch {
+    return [];
+  }
+
+  const files = [];
+  for (const run of runs) {
+    if (!run.isDirectory() || run.name.startsWith('.')) continue;
+    const entries = await fs.readdir(path.join(runsDir, run.name), { withFileTypes: true });
+    for (const entry of entries) {
+      if (entry.isFile()) {
+        files.push({ run: run.name, name: entry.name, rel: `runs/${run.name}/${entry.name}` });
+      }
+    }
+  }
+  return files.sort((a, b) => a.rel.localeCompare(b.rel));
+}
+
+/** Newest ref by file name; on equal names a run copy wins over the root one. */
+export function latestByPrefix(refs, prefix) {
+  const candidates = refs
+    .filter((f) => f.name.startsWith(prefix))
+    .sort((a, b) => (a.name === b.name ? Number(a.run !== null) - Number(b.run !== null) : a.name < b.name ? -1 : 1));
+  return candidates.length > 0 ? candidates[candidates.length - 1] : null;
+}
+
+/**
+ * Run dirs that no longer hold an active report (`activeRels`). The newest run
+ * is always kept, even when it only produced JSON.
+ */
+export function supersededRuns(runFiles, activeRels) {
+  const runs = [...new Set(runFiles.map((f) => f.run))].sort();
+  const newest = runs.at(-1);
+  return runs.filter(
+    (run) => run !== newest && !runFiles.some((f) => f.run === run && activeRels.has(f.rel)),
+  );
+}
@@ -3,6 +3,7 @@ import { promises as fs } from 'node:fs';
 import path from 'node:path';
 import { fileURLToPath } from 'node:url';
 import { error as logError } from './_shared/cli-log.mjs';
+import { latestByPrefix, listRunFiles, rootRef, supersededRuns } from './_shared/closure-runs.mjs';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -32,11 +33,6 @@ function isMarkdown(fileName) {
   return fileName.endsWith('.md');
 }
 
-function latestByPrefix(files, prefix) {
-  const candidates = files.filter((f) => f.startsWith(prefix)).sort();
-  return candidates.length > 0 ? candidates[candidates.length - 1] : null;
-}
-
 function isDeprecatedCandidate(fileName) {
   if (fileName === 'CONTEXT_PROMPT_CLAUDE_CODE_OCR_NUEVOS_2026-02-28.md') return true;
   if (fileName === 'PROMPT_CLAUDE_CODE_GO_INCONDICIONAL_2026-02-27.md') return true;
@@ -78,6 +74,27 @@ async function ensureArchiveTrackingRules(fileNames) {
   }
 }
 
+async function exists(filePath) {
+  try {
+    await fs.access(filePath);
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+// Run files are archived flat like root ones; a name already taken in the
+// archive (two runs in the same second) gets the run id appended.
+async function archiveName(file, taken) {
+  if (!file.run) return file.name;
+  let name = file.name;
+  if (taken.has(name) || await exists(path.join(archiveDir, name))) {
+    const ext = path.extname(name);
+    name = `${name.slice(0, -ext.length || undefined)}_${file.run.split('_').at(-1)}${ext}`;
+  }
+  return name;
+}
+
 async function listMarkdownFiles(dirPath) {
   const entries = await fs.readdir(dirPath, { withFileTypes: true });
   const files = [];
@@ -100,32 +117,48 @@ async function main() {
     .filter(isMarkdown)
     .filter((f) => !f.startsWith(HYGIENE_REPORT_PREFIX))
     .sort();
+  const runFiles = await listRunFiles(closureDir);
+  const refs = [
+    ...rootMarkdownFiles.map(rootRef),
+    ...runFiles.filter((f) => isMarkdown(f.name)),
+  ];
 
   const active = new Set(STATIC_ACTIVE);
   for (const prefix of AUTOGEN_PREFIXES) {
-    const latest = latestByPrefix(rootMarkdownFiles, prefix);
+    const latest = latestByPrefix(refs, prefix);
     if (latest) {
-      active.add(latest);
+      active.add(latest.rel);
     }
   }
 
   const deprecated = new Set(rootMarkdownFiles.filter((f) => isDeprecatedCandidate(f)));
-  const historical = rootMarkdownFiles.filter(
-    (f) => !active.has(f) && !deprecated.has(f),
-  );
+  const staleRuns = supersededRuns(runFiles, active);
+  const historical = [
+    ...rootMarkdownFiles.filter((f) => !active.has(f) && !deprecated.has(f)).map(rootRef),
+    ...runFiles.filter((f) => staleRuns.includes(f.run)),
+  ];
 
   if (historical.length === 0) {
     console.log('No historical closure docs to archive.');
     return;
   }
 
-  await ensureArchiveTrackingRules(historical);
+  const moves = [];
+  const taken = new Set();
+  for (const file of historical) {
+    const name = await archiveName(file, taken);
+    taken.add(name);
+    moves.push({ from: file.rel, to: name });
+  }
+
+  await ensureArchiveTrackingRules(moves.map((m) => m.to).filter(isMarkdown));
   await fs.mkdir(archiveDir, { recursive: true });
 
-  for (const fileName of historical) {
-    const src = path.join(closureDir, fileName);
-    const dest = path.join(archiveDir, fileName);
-    await fs.rename(src, dest);
+  for (const { from, to } of moves) {
+    await fs.rename(path.join(closureDir, from), path.join(archiveDir, to));
+  }
+  for (const run of staleRuns) {
+    await fs.rmdir(path.join(closureDir, 'runs', run));
   }
 
   const markdownFiles = [
@@ -147,9 +180,9 @@ async function main() {
     }
 
     let updated = content;
-    for (const fileName of historical) {
-      const oldPath = `docs/closure/${fileName}`;
-      const newPath = `docs/closure/archive/historical/${fileName}`;
+    for (const { from, to } of moves) {
+      const oldPath = `docs/closure/${from}`;
+      const newPath = `docs/closure/archive/historical/${to}`;
       const regex = new RegExp(escapeRegExp(oldPath), 'g');
       updated = updated.replace(regex, newPath);
     }
@@ -160,7 +193,7 @@ async function main() {
     }
   }
 
-  console.log(`Archived ${historical.length} files to docs/closure/archive/historical`);
+  console.log(`Archived ${moves.length} files to docs/closure/archive/historical`);
   console.log(`Rewritten references in ${modifiedFiles} markdown files`);
 }
 
@@ -3,6 +3,7 @@ import { promises as fs } from 'node:fs';
 import path from 'node:path';
 import { fileURLToPath } from 'node:url';
 import { error as logError, printErrorLines } from './_shared/cli-log.mjs';
+import { latestByPrefix, listRunFiles, rootRef, supersededRuns } from './_shared/closure-runs.mjs';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -32,32 +33,35 @@ const DEPRECATED_ALLOWED = new Set([
 
 const HYGIENE_PREFIX = 'CLOSURE_HYGIENE_REPORT_';
 
-function latestByPrefix(files, prefix) {
-  const candidates = files.filter((f) => f.startsWith(prefix)).sort();
-  return candidates.length > 0 ? candidates[candidates.length - 1] : null;
-}
-
 async function main() {
   const entries = await fs.readdir(closureDir);
   const rootMarkdown = entries.filter((f) => f.endsWith('.md')).sort();
+  const runFiles = await listRunFiles(closureDir);
+  const refs = [
+    ...rootMarkdown.map(rootRef),
+    ...runFiles.filter((f) => f.name.endsWith('.md')),
+  ];
 
   const allowed = new Set(STATIC_ACTIVE);
   for (const prefix of AUTOGEN_PREFIXES) {
-    const latest = latestByPrefix(rootMarkdown, prefix);
-    if (latest) allowed.add(latest);
+    const latest = latestByPrefix(refs, prefix);
+    if (latest) allowed.add(latest.rel);
   }
   for (const deprecated of DEPRECATED_ALLOWED) {
     allowed.add(deprecated);
   }
 
-  const unexpected = rootMarkdown.filter(
-    (f) => !allowed.has(f) && !f.startsWith(HYGIENE_PREFIX),
-  );
+  const unexpected = [
+    ...rootMarkdown
+      .filter((f) => !allowed.has(f) && !f.startsWith(HYGIENE_PREFIX))
+      .map((fileName) => `docs/closure/${fileName}`),
+    ...supersededRuns(runFiles, allowed).map((run) => `docs/closure/runs/${run}/`),
+  ];
 
   if (unexpected.length > 0) {
     printErrorLines(
-      'Closure root policy failed. Unexpected files in docs/closure root:',
-      unexpected.map((fileName) => `docs/closure/${fileName}`),
+      'Closure root policy failed. Unexpected files in docs/closure root (or superseded runs):',
+      unexpected,
     );
     process.exit(1);
   }
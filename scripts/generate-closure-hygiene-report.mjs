@@ -3,6 +3,7 @@ import { promises as fs } from 'node:fs';
 import path from 'node:path';
 import { fileURLToPath } from 'node:url';
 import { error as logError } from './_shared/cli-log.mjs';
+import { latestByPrefix, listRunFiles, rootRef, supersededRuns } from './_shared/closure-runs.mjs';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -31,11 +32,6 @@ function isMarkdown(fileName) {
   return fileName.endsWith('.md');
 }
 
-function latestByPrefix(files, prefix) {
-  const candidates = files.filter((f) => f.startsWith(prefix)).sort();
-  return candidates.length > 0 ? candidates[candidates.length - 1] : null;
-}
-
 function todayUtc() {
   return new Date().toISOString().slice(0, 10);
 }
@@ -56,6 +52,9 @@ async function main() {
     .filter(isMarkdown)
     .filter((f) => !f.startsWith(HYGIENE_REPORT_PREFIX))
     .sort();
+  const runFiles = await listRunFiles(closureDir);
+  const runMarkdownFiles = runFiles.filter((f) => isMarkdown(f.name));
+  const refs = [...rootMarkdownFiles.map(rootRef), ...runMarkdownFiles];
 
   let archivedHistoricalFiles = [];
   try {
@@ -68,21 +67,26 @@ async function main() {
   const active = new Set(STATIC_ACTIVE);
   const autogenLatest = [];
   for (const prefix of AUTOGEN_PREFIXES) {
-    const latest = latestByPrefix(rootMarkdownFiles, prefix);
+    const latest = latestByPrefix(refs, prefix);
     if (latest) {
-      active.add(latest);
-      autogenLatest.push(latest);
+      active.add(latest.rel);
+      autogenLatest.push(latest.rel);
     }
   }
+  const staleRuns = new Set(supersededRuns(runFiles, active));
 
   const deprecated = rootMarkdownFiles.filter((f) => isDeprecatedCandidate(f));
-  const activeFiles = rootMarkdownFiles.filter((f) => active.has(f));
+  const activeFiles = [
+    ...rootMarkdownFiles.filter((f) => active.has(f)),
+    ...runMarkdownFiles.filter((f) => !staleRuns.has(f.run)).map((f) => f.rel),
+  ];
   const historicalInRoot = rootMarkdownFiles.filter(
     (f) => !active.has(f) && !deprecated.includes(f),
   );
   const historical = [
     ...archivedHistoricalFiles.map((f) => `archive/historical/${f}`),
     ...historicalInRoot,
+    ...runMarkdownFiles.filter((f) => staleRuns.has(f.run)).map((f) => f.rel),
   ];
 
   const reportFile = `CLOSURE_HYGIENE_REPORT_${todayUtc()}.md`;
@@ -94,6 +98,7 @@ async function main() {
 
 ## Resumen
 - Total documentos Markdown en root: ${rootMarkdownFiles.length}
+- Total documentos Markdown en runs: ${runMarkdownFiles.length}
 - Total historicos archivados: ${archivedHistoricalFiles.length}
 - Activos: ${activeFiles.length}
 - Historicos: ${historical.length}
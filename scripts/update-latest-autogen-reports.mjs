@@ -3,6 +3,7 @@ import { promises as fs } from 'node:fs';
 import path from 'node:path';
 import { fileURLToPath } from 'node:url';
 import { error as logError } from './_shared/cli-log.mjs';
+import { listRunFiles } from './_shared/closure-runs.mjs';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -28,6 +29,7 @@ function extractDateToken(fileName) {
 }
 
 function locationRank(location) {
+  if (location === 'run') return 2;
   return location === 'root' ? 1 : 0;
 }
 
@@ -51,7 +53,7 @@ function newestGroup(items) {
       .filter((f) => extractDateToken(f.name) === latestDay)
       .sort(compareFileRef)
     : [];
-  const sameDayHistory = sameDay.filter((f) => f.name !== latest.name || f.location !== latest.location);
+  const sameDayHistory = sameDay.filter((f) => toDocPath(f) !== toDocPath(latest));
   return { latest, sameDayHistory };
 }
 
@@ -59,6 +61,9 @@ function toDocPath(file) {
   if (file.location === 'archive') {
     return `docs/closure/archive/historical/${file.name}`;
   }
+  if (file.location === 'run') {
+    return `docs/closure/runs/${file.run}/${file.name}`;
+  }
   return `docs/closure/${file.name}`;
 }
 
@@ -121,8 +126,12 @@ async function main() {
     archiveFiles = [];
   }
 
+  const runFiles = (await listRunFiles(closureDir))
+    .filter((f) => isMarkdown(f.name))
+    .map(({ run, name }) => ({ name, location: 'run', run }));
+
   const groups = REPORT_PREFIXES.map(({ key, label }) => {
-    const files = [...rootFiles, ...archiveFiles].filter((f) => f.name.startsWith(`${key}_`));
+    const files = [...rootFiles, ...runFiles, ...archiveFiles].filter((f) => f.name.startsWith(`${key}_`));
     const { latest, sameDayHistory } = newestGroup(files);
     return { key, label, latest, sameDayHistory };
   });